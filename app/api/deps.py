@@ -1,32 +1,80 @@
-from typing import Annotated, Optional
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from typing import Annotated, Any, Dict, Optional, Tuple
 from fastapi import Depends, HTTPException, status, Header, Request
-from jose import jwt, JWTError
-from sqlalchemy import select
+import structlog
+from sqlalchemy import select, inspect
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.security import verify_jwt
-from app.db.session import get_db
+from app.core.timing import span
+from app.db.session import get_db, get_read_db, get_sessionmaker
 from app.db.models import User
 
-# Existing strict auth
-auth_scheme = HTTPBearer(auto_error=False)
+# clerk_user_id -> (user id, claims fingerprint, detached snapshot of the row)
+ClaimsFingerprint = Tuple[Optional[str], Optional[str], Optional[str]]
+_USER_CACHE: TTLCache[Tuple[int, ClaimsFingerprint, User]] = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
 
-async def get_bearer_token(authorization: Annotated[Optional[str], Header()] = None) -> str:
+def _detached_copy(user: User) -> User:
+    """Column-only copy of `user` that no session owns, safe to share between requests."""
+    values = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+    copy = User(**values)
+    make_transient_to_detached(copy)
+    return copy
+
+def user_cache_stats() -> dict:
+    return _USER_CACHE.stats()
+
+def _parse_bearer(authorization: Optional[str]) -> Optional[str]:
     if not authorization or not authorization.startswith("Bearer "):
+        return None
+    return authorization.split(" ", 1)[1].strip() or None
+
+async def get_bearer_token(authorization: Annotated[Optional[str], Header()] = None) -> str:
+    token = _parse_bearer(authorization)
+    if not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing bearer token")
-    return authorization.split(" ", 1)[1].strip()
+    return token
 
-async def get_current_user(
-    db: AsyncSession = Depends(get_db),
-    token: str = Depends(get_bearer_token),
-) -> User:
-    try:
-        claims = await verify_jwt(token)
-    except Exception as e:
-        print("[auth] JWT error:", repr(e))
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+def _claims_differ(user: User, email: Optional[str], first_name: Optional[str], last_name: Optional[str]) -> bool:
+    return bool(
+        (email and email != user.email)
+        or (first_name and first_name != user.first_name)
+        or (last_name and last_name != user.last_name)
+    )
 
+async def _write_user(clerk_user_id: str, email: Optional[str], first_name: Optional[str], last_name: Optional[str]) -> User:
+    """Create the user, or bring its profile in line with the claims, on a short-lived write session."""
+    SessionLocal = get_sessionmaker()
+    async with SessionLocal() as db:
+        # Re-read under the write lock: another request may have created the row meanwhile
+        result = await db.execute(select(User).where(User.clerk_user_id == clerk_user_id))
+        user = result.scalar_one_or_none()
+        if not user:
+            user = User(clerk_user_id=clerk_user_id, email=email, first_name=first_name, last_name=last_name)
+            db.add(user)
+            await db.commit()
+            await db.refresh(user)
+            print(f"[users] created id={user.id} clerk_user_id={user.clerk_user_id}")
+        elif _claims_differ(user, email, first_name, last_name):
+            # keep data fresh; claims that are missing never blank out a stored value
+            user.email = email or user.email
+            user.first_name = first_name or user.first_name
+            user.last_name = last_name or user.last_name
+            await db.commit()
+            await db.refresh(user)
+            print(f"[users] updated id={user.id}")
+        return user
+
+async def _upsert_user(db: AsyncSession, claims: Dict[str, Any]) -> User:
+    """
+    Resolve the caller's User. `db` is a read session: the lookup runs there, and a
+    write session is opened only to insert a new user or store changed claims.
+    """
     # Clerk standard claims
     clerk_user_id = claims.get("sub")
     primary_email = claims.get("primary_email") or (claims.get("email_addresses") or [None])[0]
@@ -36,56 +84,95 @@ async def get_current_user(
     if not clerk_user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token (no sub)")
 
-    # Upsert by clerk_user_id
+    # Known user with unchanged claims: attach the cached row, no query
+    fingerprint: ClaimsFingerprint = (primary_email, first_name, last_name)
+    cached = _USER_CACHE.get(clerk_user_id)
+    if cached is not None and cached[1] == fingerprint:
+        return await db.merge(cached[2], load=False)
+
     result = await db.execute(select(User).where(User.clerk_user_id == clerk_user_id))
     user = result.scalar_one_or_none()
+    if user is None or _claims_differ(user, primary_email, first_name, last_name):
+        written = await _write_user(clerk_user_id, primary_email, first_name, last_name)
+        user = await db.merge(_detached_copy(written), load=False)
 
-    if not user:
-        user = User(
-            clerk_user_id=clerk_user_id,
-            email=primary_email,
-            first_name=first_name,
-            last_name=last_name,
-        )
-        db.add(user)
-        await db.commit()
-        await db.refresh(user)
-        print(f"[users] created id={user.id} clerk_user_id={user.clerk_user_id}")
-    else:
-        # keep data fresh (no-op if unchanged)
-        changed = False
-        if primary_email and primary_email != user.email:
-            user.email = primary_email; changed = True
-        if first_name and first_name != user.first_name:
-            user.first_name = first_name; changed = True
-        if last_name and last_name != user.last_name:
-            user.last_name = last_name; changed = True
-        if changed:
-            await db.commit()
-            await db.refresh(user)
-            print(f"[users] updated id={user.id}")
-
+    _USER_CACHE.set(clerk_user_id, (user.id, fingerprint, _detached_copy(user)))
     return user
 
+
+class AuthContext:
+    """
+    Per-request auth state, kept on `request.state.auth`.
+
+    The token is verified at most once and the user resolved at most once per
+    request; route dependencies, the error middleware and logging all read the
+    memoized result instead of decoding the JWT again.
+    """
+
+    def __init__(self, token: Optional[str]):
+        self.token = token
+        self.user: Optional[User] = None
+        self._claims: Optional[Dict[str, Any]] = None
+        self._error: Optional[Exception] = None
+        self._user_error: Optional[Exception] = None
+
+    async def get_claims(self) -> Dict[str, Any]:
+        if self._claims is None and self._error is None:
+            try:
+                with span("auth"):
+                    self._claims = await verify_jwt(self.token)
+            except Exception as e:
+                self._error = e
+        if self._error is not None:
+            raise self._error
+        return self._claims
+
+    async def get_user(self, db: AsyncSession) -> User:
+        if self.user is None and self._user_error is None:
+            claims = await self.get_claims()
+            try:
+                with span("user"):
+                    self.user = await _upsert_user(db, claims)
+            except Exception as e:
+                self._user_error = e
+            else:
+                structlog.contextvars.bind_contextvars(user_id=self.user.id)
+        if self._user_error is not None:
+            raise self._user_error
+        return self.user
+
+
+def get_auth_context(request: Request) -> AuthContext:
+    auth = getattr(request.state, "auth", None)
+    if auth is None:
+        auth = AuthContext(_parse_bearer(request.headers.get("authorization")))
+        request.state.auth = auth
+    return auth
+
+async def get_current_user(
+    db: AsyncSession = Depends(get_read_db),
+    auth: AuthContext = Depends(get_auth_context),
+) -> User:
+    if not auth.token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing bearer token")
+    try:
+        await auth.get_claims()
+    except Exception as e:
+        print("[auth] JWT error:", repr(e))
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+    return await auth.get_user(db)
+
 # ✅ New optional auth
 async def get_current_user_optional(
-        creds: HTTPAuthorizationCredentials = Depends(auth_scheme),
-        db: AsyncSession = Depends(get_db),
+        request: Request,
+        db: AsyncSession = Depends(get_read_db),
 ) -> User | None:
     """Return a User if valid auth provided, else None."""
-    if not creds:
+    auth = get_auth_context(request)
+    if not auth.token:
         return None
-
     try:
-        payload = jwt.decode(
-            creds.credentials,
-            settings.clerk_jwks_public_key,
-            algorithms=["RS256"],
-            issuer=settings.JWT_ISSUER,
-        )
-        clerk_user_id = payload["sub"]
-    except JWTError:
+        return await auth.get_user(db)
+    except Exception:
         return None
-
-    user = await db.get(User, {"clerk_user_id": clerk_user_id})
-    return user
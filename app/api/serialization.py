@@ -0,0 +1,46 @@
+"""
+Fast path for list endpoints.
+
+The default path loads ORM objects, validates each one against `response_model`
+(from_attributes), converts the result with jsonable_encoder and encodes it with
+the stdlib json module. Rows we selected ourselves need none of that: here plain
+Core rows go straight to JSON bytes through pydantic-core. A TypedDict mirroring
+the response model keeps field selection, order and value formatting identical
+to what `response_model` would produce.
+
+Routes keep `response_model` for the OpenAPI schema; FastAPI passes a returned
+Response through untouched.
+"""
+from functools import lru_cache
+from typing import Any, Iterable, List, Mapping, Optional, Type
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from typing_extensions import TypedDict
+
+
+def columns(model: Type[BaseModel], entity) -> List[Any]:
+    """The mapped columns of `entity` that `model` serializes, in field order."""
+    return [getattr(entity, name) for name in model.model_fields]
+
+
+@lru_cache(maxsize=None)
+def _rows_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    # Built once per model: schema generation costs far more than an encode
+    row = TypedDict(f"{model.__name__}Row", {name: f.annotation for name, f in model.model_fields.items()})
+    return TypeAdapter(List[row])
+
+
+def dump_rows(model: Type[BaseModel], rows: Iterable[Mapping[str, Any]]) -> bytes:
+    # Keys in model field order, which is the order response_model would emit
+    names = tuple(model.model_fields)
+    return _rows_adapter(model).dump_json([{name: row[name] for name in names} for row in rows])
+
+
+def rows_response(
+        model: Type[BaseModel],
+        rows: Iterable[Mapping[str, Any]],
+        headers: Optional[Mapping[str, str]] = None,
+        status_code: int = 200,
+) -> Response:
+    """JSON array of `model` built from `rows` (e.g. `result.mappings()`), without re-validating them."""
+    return Response(dump_rows(model, rows), status_code=status_code, media_type="application/json", headers=headers)
@@ -2,22 +2,24 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.api.deps import get_current_user
-from app.db.session import get_db
+from app.api.serialization import columns, rows_response
+from app.db.session import get_db, get_read_db
 from app.db.models import AccountHolder, User, Account
 from app.schemas.account_holder import AccountHolderCreate, AccountHolderRead
+from app.core.timing import TimedRoute
 
-router = APIRouter(prefix="/api/v1/account-holders", tags=["account-holders"])
+router = APIRouter(prefix="/api/v1/account-holders", tags=["account-holders"], route_class=TimedRoute)
 
 
 @router.get("", response_model=list[AccountHolderRead])
 async def list_account_holders(
-        db: AsyncSession = Depends(get_db),
+        db: AsyncSession = Depends(get_read_db),
         user: User = Depends(get_current_user),
 ):
     result = await db.execute(
-        select(AccountHolder).join(Account).where(Account.user_id == user.id)
+        select(*columns(AccountHolderRead, AccountHolder)).join(Account).where(Account.user_id == user.id)
     )
-    return result.scalars().all()
+    return rows_response(AccountHolderRead, result.mappings())
 
 
 @router.post("", response_model=AccountHolderRead, status_code=201)
@@ -48,7 +50,7 @@ async def create_account_holder(
 @router.get("/{account_id}/holders", response_model=list[AccountHolderRead])
 async def list_holders(
         account_id: int,
-        db: AsyncSession = Depends(get_db),
+        db: AsyncSession = Depends(get_read_db),
         user: User = Depends(get_current_user),
 ):
     # Ensure user owns account
@@ -2,15 +2,16 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import get_current_user
-from app.db.session import get_db
-from app.db.models import Account, User, AccountHolder
-from app.schemas.account import AccountCreate, AccountRead
+from app.db.session import get_db, get_read_db
+from app.db.models import Account, AccountBalance, User, AccountHolder
+from app.schemas.account import AccountBalanceRead, AccountCreate, AccountRead
+from app.core.timing import TimedRoute
 
-router = APIRouter(prefix="/api/v1/accounts", tags=["accounts"])
+router = APIRouter(prefix="/api/v1/accounts", tags=["accounts"], route_class=TimedRoute)
 
 @router.get("", response_model=list[AccountRead])
 async def list_accounts(
-        db: AsyncSession = Depends(get_db),
+        db: AsyncSession = Depends(get_read_db),
         user: User = Depends(get_current_user),
 ):
     res = await db.execute(select(Account).where(Account.user_id == user.id).order_by(Account.id.asc()))
@@ -42,7 +43,7 @@ async def create_account(
 @router.get("/{account_id}", response_model=AccountRead)
 async def get_account_by_id(
         account_id: int,
-        db: AsyncSession = Depends(get_db),
+        db: AsyncSession = Depends(get_read_db),
         user: User = Depends(get_current_user),
 ):
     res = await db.execute(
@@ -51,4 +52,21 @@ async def get_account_by_id(
     account = res.scalar_one_or_none()
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
-    return account
\ No newline at end of file
+    return account
+
+@router.get("/{account_id}/balance", response_model=AccountBalanceRead)
+async def get_account_balance(
+        account_id: int,
+        db: AsyncSession = Depends(get_read_db),
+        user: User = Depends(get_current_user),
+):
+    # Single PK lookup on the materialized balance; no ledger scan
+    res = await db.execute(
+        select(Account.id, AccountBalance.balance, AccountBalance.updated_at)
+        .outerjoin(AccountBalance, AccountBalance.account_id == Account.id)
+        .where(Account.id == account_id, Account.user_id == user.id)
+    )
+    row = res.first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Account not found")
+    return AccountBalanceRead(account_id=row.id, balance=row.balance or 0, updated_at=row.updated_at)
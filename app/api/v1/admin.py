@@ -1,15 +1,68 @@
 from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
 from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from pathlib import Path
 import os
 
-from app.db.session import get_db, get_engine
+from app.db.session import SQLITE_PRAGMAS, get_db, get_read_engine, pool_status, sqlite_pragmas
 from app.db.models import User
 from app.schemas.user import UserRead
 from app.core.config import settings
+from app.core.metrics import CONTENT_TYPE, registry
+from app.core.security import jwks_manager, jwt_verifier, token_cache_stats
+from app.api.deps import user_cache_stats
+from app.api.serialization import columns, rows_response
+from app.db.writer import writer
+from app.middleware.error_buffer import error_buffer
+from app.core.timing import TimedRoute
 
-router = APIRouter(prefix="/api/v1/admin", tags=["admin"])
+router = APIRouter(prefix="/api/v1/admin", tags=["admin"], route_class=TimedRoute)
+
+
+@registry.collector
+def _app_state():
+    """Point-in-time values of the in-process caches, DB pools and background writers."""
+    caches = {"jwt": token_cache_stats(), "user": user_cache_stats()}
+    yield "cache_entries", "gauge", "Entries held by in-process caches.", [
+        ({"cache": name}, stats["size"]) for name, stats in caches.items()
+    ]
+    yield "cache_hits_total", "counter", "In-process cache hits.", [
+        ({"cache": name}, stats["hits"]) for name, stats in caches.items()
+    ]
+    yield "cache_misses_total", "counter", "In-process cache misses.", [
+        ({"cache": name}, stats["misses"]) for name, stats in caches.items()
+    ]
+    yield "jwks_fetches_total", "counter", "JWKS documents fetched from Clerk.", [({}, jwks_manager.fetches)]
+    yield "jwt_verify_batches_total", "counter", "Flushes of queued signature checks.", [({}, jwt_verifier.batches)]
+    yield "jwt_verify_jobs_total", "counter", "Signature-check jobs sent to the verifier pool.", [({}, jwt_verifier.jobs)]
+
+    pools = pool_status()
+    for stat, mtype, doc in (
+        ("size", "gauge", "Configured connections per pool."),
+        ("checkedout", "gauge", "Connections currently in use per pool."),
+        ("overflow", "gauge", "Overflow connections per pool."),
+    ):
+        samples = [({"pool": name}, p[stat]) for name, p in pools.items() if stat in p]
+        if samples:
+            yield f"db_pool_{stat}", mtype, doc, samples
+
+    yield "db_group_commit_batches_total", "counter", "Commits made by the group-commit writer.", [({}, writer.batches)]
+    yield "db_group_commit_units_total", "counter", "Write units committed by the group-commit writer.", [
+        ({}, writer.units)
+    ]
+
+    stats = error_buffer.stats()
+    yield "error_log_queue_depth", "gauge", "Error occurrences waiting to be written.", [({}, stats["queued"])]
+    yield "error_log_entries_total", "counter", "Error occurrences by outcome.", [
+        ({"outcome": outcome}, stats[outcome]) for outcome in ("submitted", "written", "dropped", "failed")
+    ]
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text exposition of request and runtime metrics."""
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
 
 @router.get("/dbinfo")
 async def dbinfo():
@@ -29,10 +82,17 @@ async def dbinfo():
 
     # List tables via pragma (SQLite) or generic reflection fallback
     tables = []
+    pragmas = None
     try:
-        async with get_engine.begin() as conn:
+        # Read pool: a diagnostics call never waits behind, or holds up, the single writer
+        async with get_read_engine().connect() as conn:
             res = await conn.execute(text("SELECT name FROM sqlite_master WHERE type='table'"))
             tables = [r[0] for r in res.fetchall()]
+            # What a read connection actually runs with, not just what was configured
+            pragmas = {
+                name: (await conn.exec_driver_sql(f"PRAGMA {name}")).scalar()
+                for name in SQLITE_PRAGMAS
+            }
     except Exception as e:
         tables = [f"(error listing tables: {e!r})"]
 
@@ -42,9 +102,13 @@ async def dbinfo():
         "exists": exists,
         "size_bytes": size,
         "tables": tables,
+        "sqlite_profile": settings.SQLITE_PROFILE if url.startswith("sqlite") else None,
+        "configured_pragmas": sqlite_pragmas() if url.startswith("sqlite") else None,
+        "pragmas": pragmas,
+        "pools": pool_status(),
     }
 
 @router.get("/users", response_model=list[UserRead])
 async def list_users(db: AsyncSession = Depends(get_db)):
-    res = await db.execute(select(User).order_by(User.id.asc()))
-    return res.scalars().all()
+    res = await db.execute(select(*columns(UserRead, User)).order_by(User.id.asc()))
+    return rows_response(UserRead, res.mappings())
@@ -2,23 +2,26 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.api.deps import get_current_user
-from app.db.session import get_db
+from app.api.serialization import columns, rows_response
+from app.db.session import get_db, get_read_db
+from app.db.writer import run_write
 from app.db.models import Card, User, Account
 from app.schemas.card import CardCreate, CardRead
+from app.core.timing import TimedRoute
 import random
 
-router = APIRouter(prefix="/api/v1/cards", tags=["cards"])
+router = APIRouter(prefix="/api/v1/cards", tags=["cards"], route_class=TimedRoute)
 
 
 @router.get("", response_model=list[CardRead])
 async def list_cards(
-        db: AsyncSession = Depends(get_db),
+        db: AsyncSession = Depends(get_read_db),
         user: User = Depends(get_current_user),
 ):
     result = await db.execute(
-        select(Card).join(Account).where(Account.user_id == user.id)
+        select(*columns(CardRead, Card)).join(Account).where(Account.user_id == user.id)
     )
-    return result.scalars().all()
+    return rows_response(CardRead, result.mappings())
 
 
 @router.post("", response_model=CardRead, status_code=201)
@@ -34,19 +37,20 @@ async def create_card(
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
 
-    card = Card(
-        account_id=payload.account_id,
-        card_number_last4=payload.card_number_last4,
-        card_type=payload.card_type,
-        expiration_month=payload.expiration_month,
-        expiration_year=payload.expiration_year,
-        status=payload.status,
-    )
-    db.add(card)
-    await db.flush()
-    await db.commit()
-    await db.refresh(card)
-    return card
+    async def _insert(session: AsyncSession) -> Card:
+        card = Card(
+            account_id=payload.account_id,
+            card_number_last4=payload.card_number_last4,
+            card_type=payload.card_type,
+            expiration_month=payload.expiration_month,
+            expiration_year=payload.expiration_year,
+            status=payload.status,
+        )
+        session.add(card)
+        await session.flush()
+        return card
+
+    return await run_write(db, _insert)
 
 @router.post("/ship/{account_id}", response_model=CardRead)
 async def ship_card(
@@ -1,17 +1,69 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.db.session import get_db
-from app.db.models import ApplicationLogger
+from sqlalchemy import select, tuple_
+from app.api.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.api.serialization import columns, rows_response
+from app.core.config import settings
+from app.db.session import get_read_db
+from app.db.models import ErrorGroup
 from app.api.deps import get_current_user
-from app.schemas.error_log import ErrorLogRead
+from app.schemas.error_log import ErrorGroupRead, ErrorGroupSummary
+from app.core.timing import TimedRoute
 
-router = APIRouter(prefix="/api/v1/errors", tags=["errors"])
+router = APIRouter(prefix="/api/v1/errors", tags=["errors"], route_class=TimedRoute)
 
-@router.get("", response_model=list[ErrorLogRead])
+# Everything except the traceback, which is the bulk of each row
+SUMMARY_COLUMNS = columns(ErrorGroupSummary, ErrorGroup)
+FULL_COLUMNS = columns(ErrorGroupRead, ErrorGroup)
+
+@router.get("", response_model=list[ErrorGroupRead] | list[ErrorGroupSummary])
 async def list_errors(
-        db: AsyncSession = Depends(get_db),
+        limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+        cursor: str | None = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"),
+        since: datetime | None = Query(None, description="Only errors last seen at or after this time"),
+        until: datetime | None = Query(None, description="Only errors first seen at or before this time"),
+        error_code: int | None = Query(None),
+        location: str | None = Query(None, description='Route, e.g. "GET /api/v1/accounts/{account_id}"'),
+        summary: bool = Query(False, description="Leave out the traceback"),
+        db: AsyncSession = Depends(get_read_db),
+        user=Depends(get_current_user),  # TODO: restrict to admin role
+):
+    # One row per distinct error, most recently seen first; keyset on (last_seen, id)
+    model = ErrorGroupSummary if summary else ErrorGroupRead
+    stmt = select(*(SUMMARY_COLUMNS if summary else FULL_COLUMNS))
+    if cursor:
+        position = decode_cursor(cursor)
+        try:
+            after = (datetime.fromisoformat(position["last_seen"]), int(position["id"]))
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        stmt = stmt.where(tuple_(ErrorGroup.last_seen, ErrorGroup.id) < after)
+    if since is not None:
+        stmt = stmt.where(ErrorGroup.last_seen >= since)
+    if until is not None:
+        stmt = stmt.where(ErrorGroup.first_seen <= until)
+    if error_code is not None:
+        stmt = stmt.where(ErrorGroup.error_code == error_code)
+    if location is not None:
+        stmt = stmt.where(ErrorGroup.location == location)
+
+    res = await db.execute(stmt.order_by(ErrorGroup.last_seen.desc(), ErrorGroup.id.desc()).limit(limit + 1))
+    groups = res.mappings().all()
+    headers = {}
+    if len(groups) > limit:
+        groups = groups[:limit]
+        last = groups[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor({"last_seen": last["last_seen"].isoformat(), "id": last["id"]})
+    return rows_response(model, groups, headers)
+
+@router.get("/{group_id}", response_model=ErrorGroupRead)
+async def get_error(
+        group_id: int,
+        db: AsyncSession = Depends(get_read_db),
         user=Depends(get_current_user),  # TODO: restrict to admin role
 ):
-    res = await db.execute(select(ApplicationLogger).order_by(ApplicationLogger.created_at.desc()))
-    return res.scalars().all()
+    group = await db.get(ErrorGroup, group_id)
+    if not group:
+        raise HTTPException(status_code=404, detail="Error group not found")
+    return group
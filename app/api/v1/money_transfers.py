@@ -1,14 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from app.api.deps import get_current_user
+from app.core.config import settings
+from app.db.balances import apply_balance_deltas
 from app.db.session import get_db
+from app.db.writer import run_write
 from app.db.models import Account, Transaction, User
-from app.schemas.money_transfer import MoneyTransferCreate
+from app.schemas.money_transfer import (
+    MoneyTransferBatchCreate,
+    MoneyTransferBatchRead,
+    MoneyTransferCreate,
+    MoneyTransferLegRead,
+)
 from app.schemas.transaction import TransactionRead
+from app.core.timing import TimedRoute
+from datetime import datetime
 from uuid import uuid4
 
-router = APIRouter(prefix="/api/v1/money-transfers", tags=["money_transfers"])
+router = APIRouter(prefix="/api/v1/money-transfers", tags=["money_transfers"], route_class=TimedRoute)
 
 @router.post("")
 async def create_money_transfer(
@@ -31,31 +41,102 @@ async def create_money_transfer(
         raise HTTPException(status_code=404, detail="Recipient account not found")
 
     transfer_id = str(uuid4())
+    sender_id, recipient_id = sender.id, recipient.id
 
-    # Debit from sender
-    debit = Transaction(
-        account_id=sender.id,
-        amount=payload.amount,
-        type="DEBIT",
-        description=payload.description or f"Transfer to {recipient.id}",
-        transfer_id=transfer_id,
-    )
-    db.add(debit)
+    async def _insert(session: AsyncSession) -> None:
+        # Debit from sender
+        debit = Transaction(
+            account_id=sender_id,
+            amount=payload.amount,
+            type="DEBIT",
+            description=payload.description or f"Transfer to {recipient_id}",
+            transfer_id=transfer_id,
+        )
+        session.add(debit)
 
+        # Credit to recipient
+        credit = Transaction(
+            account_id=recipient_id,
+            amount=payload.amount,
+            type="CREDIT",
+            description=payload.description or f"Transfer from {sender_id}",
+            transfer_id=transfer_id,
+        )
+        session.add(credit)
 
-    # Credit to recipient
-    credit = Transaction(
-        account_id=recipient.id,
-        amount=payload.amount,
-        type="CREDIT",
-        description=payload.description or f"Transfer from {sender.id}",
-        transfer_id=transfer_id,
-    )
-    db.add(credit)
+        # Same transaction as the ledger rows
+        await apply_balance_deltas(session, [(sender_id, -payload.amount), (recipient_id, payload.amount)])
 
-    await db.commit()
+    await run_write(db, _insert)
     return {"transfer_id": transfer_id, "status": "success"}
 
+@router.post("/batch", response_model=MoneyTransferBatchRead)
+async def create_money_transfer_batch(
+        payload: MoneyTransferBatchCreate,
+        db: AsyncSession = Depends(get_db),
+        user: User = Depends(get_current_user),
+):
+    """All-or-nothing fan-out: every debit/credit pair lands in one transaction or none do."""
+    if len(payload.transfers) > settings.MONEY_TRANSFER_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large (max {settings.MONEY_TRANSFER_BATCH_MAX_SIZE} transfers)",
+        )
+
+    legs = []
+    for i, leg in enumerate(payload.transfers):
+        sender_id = leg.sender_account_id or payload.sender_account_id
+        if sender_id is None:
+            raise HTTPException(status_code=422, detail=f"Transfer {i}: sender_account_id is required")
+        legs.append((i, sender_id, leg))
+
+    # Resolve every sender and recipient in one query
+    referenced = {sender_id for _, sender_id, _ in legs} | {leg.recipient_account_id for _, _, leg in legs}
+    res = await db.execute(select(Account.id, Account.user_id).where(Account.id.in_(referenced)))
+    owners = dict(res.all())
+
+    for i, sender_id, leg in legs:
+        if owners.get(sender_id) != user.id:
+            raise HTTPException(status_code=404, detail=f"Transfer {i}: Sender account not found")
+        if leg.recipient_account_id not in owners:
+            raise HTTPException(status_code=404, detail=f"Transfer {i}: Recipient account not found")
+
+    # Shared metadata: one timestamp and the batch description for every leg
+    created_at = datetime.utcnow()
+    rows = []
+    results = []
+    deltas = []
+    for i, sender_id, leg in legs:
+        transfer_id = str(uuid4())
+        description = leg.description or payload.description
+        rows.append({
+            "account_id": sender_id, "amount": leg.amount, "type": "DEBIT", "transfer_id": transfer_id,
+            "description": description or f"Transfer to {leg.recipient_account_id}", "created_at": created_at,
+        })
+        rows.append({
+            "account_id": leg.recipient_account_id, "amount": leg.amount, "type": "CREDIT", "transfer_id": transfer_id,
+            "description": description or f"Transfer from {sender_id}", "created_at": created_at,
+        })
+        deltas += [(sender_id, -leg.amount), (leg.recipient_account_id, leg.amount)]
+        results.append(MoneyTransferLegRead(
+            index=i,
+            transfer_id=transfer_id,
+            sender_account_id=sender_id,
+            recipient_account_id=leg.recipient_account_id,
+            amount=leg.amount,
+        ))
+
+    await db.execute(insert(Transaction.__table__), rows)
+    await apply_balance_deltas(db, deltas)
+    await db.commit()
+
+    return MoneyTransferBatchRead(
+        status="success",
+        created_at=created_at,
+        total_amount=sum(leg.amount for _, _, leg in legs),
+        transfers=results,
+    )
+
 @router.get("/{transfer_id}", response_model=list[TransactionRead])
 async def get_transfer(
         transfer_id: str,
@@ -1,61 +1,158 @@
-from fastapi import APIRouter, Depends, HTTPException
+import csv
+import io
+import json
+from typing import AsyncIterator
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
-from datetime import datetime, time
+from sqlalchemy import select, and_, func
+from datetime import date, datetime, time
 from app.api.deps import get_current_user
-from app.db.session import get_db
+from app.core.config import settings
+from app.db.balances import opening_balances, signed_amount_expr
+from app.db.session import get_read_db, get_read_sessionmaker
 from app.db.models import Account, Transaction, User
 from app.schemas.statement import StatementRequest, StatementResponse, StatementTransaction
+from app.core.timing import TimedRoute
 
-router = APIRouter(prefix="/api/v1/statements", tags=["statements"])
+router = APIRouter(prefix="/api/v1/statements", tags=["statements"], route_class=TimedRoute)
 
 @router.post("", response_model=list[StatementResponse])
 async def generate_statements(
         payload: StatementRequest,
-        db: AsyncSession = Depends(get_db),
+        db: AsyncSession = Depends(get_read_db),
         user: User = Depends(get_current_user),
 ):
-    accounts = await db.execute(select(Account).where(Account.user_id == user.id))
-    accounts = accounts.scalars().all()
+    accounts = await db.execute(select(Account.id).where(Account.user_id == user.id).order_by(Account.id.asc()))
+    account_ids = list(accounts.scalars().all())
 
-    if not accounts:
+    if not account_ids:
         raise HTTPException(status_code=404, detail="No accounts found for user")
 
     start_dt = datetime.combine(payload.start_date, time.min)   # 00:00:00
     end_dt   = datetime.combine(payload.end_date,   time.max)   # 23:59:59.999999
 
-    results = []
-    for acc in accounts:
-        txs = await db.execute(
-            select(Transaction).where(
-                and_(
-                    Transaction.account_id == acc.id,
-                    Transaction.created_at >= start_dt,
-                    Transaction.created_at <= end_dt
-                )
-            ).order_by(Transaction.created_at.asc())
+    # One query for every account: rows ordered by account then time, with the
+    # per-account window total computed by the database alongside each row
+    txs = await db.execute(
+        select(
+            Transaction.id,
+            Transaction.account_id,
+            Transaction.description,
+            Transaction.amount,
+            Transaction.type,
+            Transaction.created_at,
+            func.sum(signed_amount_expr).over(partition_by=Transaction.account_id).label("window_total"),
+        ).where(
+            and_(
+                Transaction.account_id.in_(account_ids),
+                Transaction.created_at >= start_dt,
+                Transaction.created_at <= end_dt
+            )
+        ).order_by(Transaction.account_id.asc(), Transaction.created_at.asc(), Transaction.id.asc())
+    )
+
+    balances = {account_id: 0 for account_id in account_ids}
+    lines: dict[int, list[StatementTransaction]] = {account_id: [] for account_id in account_ids}
+    for tx in txs:
+        balances[tx.account_id] = tx.window_total
+        lines[tx.account_id].append(
+            StatementTransaction(
+                id=tx.id,
+                account_id=tx.account_id,
+                description=tx.description,
+                amount=tx.amount,   # keep positive
+                type=tx.type.upper(),
+                created_at=tx.created_at,
+            )
         )
-        txs = txs.scalars().all()
 
-        balance = sum(
-            tx.amount if tx.type.upper() == "CREDIT" else -tx.amount
-            for tx in txs
+    # Last daily checkpoint + the few rows after it; never the full history
+    openings = await opening_balances(db, account_ids, start_dt)
+
+    return [
+        StatementResponse(
+            account_id=account_id,
+            balance=balances[account_id],
+            opening_balance=openings[account_id],
+            closing_balance=openings[account_id] + balances[account_id],
+            transactions=lines[account_id],
         )
+        for account_id in account_ids
+    ]
+
+
+EXPORT_COLUMNS = ("id", "account_id", "created_at", "type", "amount", "description", "transfer_id")
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+def _encode_csv(rows) -> str:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        writer.writerow([v.isoformat() if isinstance(v, datetime) else v for v in row])
+    return buf.getvalue()
 
-        results.append(
-            StatementResponse(
-                account_id=str(acc.id),
-                balance=balance,
-                transactions=[
-                    StatementTransaction(
-                        id= tx.id,
-                        account_id=tx.account_id,
-                        description=tx.description,
-                        amount=tx.amount,   # keep positive
-                        type=tx.type.upper(),
-                        created_at=tx.created_at.isoformat(),
-                    ) for tx in txs
-                ]
+def _encode_ndjson(rows) -> str:
+    return "".join(
+        json.dumps(
+            {k: (v.isoformat() if isinstance(v, datetime) else v) for k, v in zip(EXPORT_COLUMNS, row)},
+            separators=(",", ":"),
+        ) + "\n"
+        for row in rows
+    )
+
+async def _stream_export(account_ids: list[int], start_dt: datetime, end_dt: datetime, fmt: str) -> AsyncIterator[str]:
+    # The status line and headers are sent before this generator is first iterated,
+    # for both formats. Only CSV has body bytes to send before the query runs: its
+    # header row. NDJSON has no header, and a blank leading line is not valid NDJSON,
+    # so its body starts with the first partition of rows.
+    if fmt == "csv":
+        yield _encode_csv([EXPORT_COLUMNS])
+    encode = _encode_csv if fmt == "csv" else _encode_ndjson
+
+    # The request's session is closed once the endpoint returns, so the stream
+    # owns its own session for as long as the body is being sent
+    SessionLocal = get_read_sessionmaker()
+    async with SessionLocal() as db:
+        result = await db.stream(
+            select(*(getattr(Transaction, c) for c in EXPORT_COLUMNS))
+            .where(
+                Transaction.account_id.in_(account_ids),
+                Transaction.created_at >= start_dt,
+                Transaction.created_at <= end_dt,
             )
+            .order_by(Transaction.account_id.asc(), Transaction.created_at.asc(), Transaction.id.asc())
+            .execution_options(yield_per=settings.EXPORT_CHUNK_SIZE)
         )
-    return results
+        async for chunk in result.partitions():
+            yield encode(chunk)
+
+@router.get("/export")
+async def export_transactions(
+        start_date: date = Query(...),
+        end_date: date = Query(...),
+        account_id: int | None = Query(None, description="Defaults to all of the user's accounts"),
+        fmt: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+        db: AsyncSession = Depends(get_read_db),
+        user: User = Depends(get_current_user),
+):
+    """
+    Stream every transaction in the range as CSV or NDJSON; memory use does not grow with the range.
+    Headers go out at once; CSV also sends its header row before the query runs, while an
+    NDJSON body starts with the first batch of rows.
+    """
+    stmt = select(Account.id).where(Account.user_id == user.id)
+    if account_id is not None:
+        stmt = stmt.where(Account.id == account_id)
+    account_ids = list((await db.execute(stmt.order_by(Account.id.asc()))).scalars().all())
+    if not account_ids:
+        raise HTTPException(status_code=404, detail="Account not found")
+
+    start_dt = datetime.combine(start_date, time.min)
+    end_dt = datetime.combine(end_date, time.max)
+    filename = f"transactions_{start_date}_{end_date}.{fmt}"
+    return StreamingResponse(
+        _stream_export(account_ids, start_dt, end_dt, fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,25 +1,72 @@
+from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import get_current_user
-from app.db.session import get_db
+from app.api.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.api.serialization import columns, rows_response
+from app.core.config import settings
+from app.db.balances import apply_balance_deltas, signed_amount
+from app.db.session import get_db, get_read_db
+from app.db.writer import run_write
+from app.core.timing import TimedRoute
 from app.db.models import Account, Transaction, User
-from app.schemas.transaction import TransactionRead, TransactionCreate
+from app.schemas.transaction import (
+    TransactionBatchCreate,
+    TransactionBatchItemResult,
+    TransactionBatchResult,
+    TransactionCreate,
+    TransactionRead,
+)
 
-router = APIRouter(prefix="/api/v1/transactions", tags=["transactions"])
+router = APIRouter(prefix="/api/v1/transactions", tags=["transactions"], route_class=TimedRoute)
 
 @router.get("", response_model=list[TransactionRead])
 async def list_transactions(
         account_id: int = Query(...),
-        db: AsyncSession = Depends(get_db),
+        limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+        cursor: str | None = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"),
+        start: datetime | None = Query(None, description="Only transactions created at or after this time"),
+        end: datetime | None = Query(None, description="Only transactions created at or before this time"),
+        tx_type: str | None = Query(None, alias="type", pattern="^(DEBIT|CREDIT)$"),
+        min_amount: int | None = Query(None, ge=0),
+        max_amount: int | None = Query(None, ge=0),
+        description_prefix: str | None = Query(None, min_length=1, max_length=255),
+        db: AsyncSession = Depends(get_read_db),
         user: User = Depends(get_current_user),
 ):
     # ensure account belongs to user
     owns = await db.scalar(select(Account.id).where(Account.id == account_id, Account.user_id == user.id))
     if not owns:
         raise HTTPException(status_code=404, detail="Account not found")
-    res = await db.execute(select(Transaction).where(Transaction.account_id == account_id).order_by(Transaction.id.desc()))
-    return res.scalars().all()
+
+    # Newest first, keyset on id: page N costs the same as page 1
+    stmt = select(*columns(TransactionRead, Transaction)).where(Transaction.account_id == account_id)
+    if cursor:
+        after_id = decode_cursor(cursor).get("id")
+        if not isinstance(after_id, int):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        stmt = stmt.where(Transaction.id < after_id)
+    if start is not None:
+        stmt = stmt.where(Transaction.created_at >= start)
+    if end is not None:
+        stmt = stmt.where(Transaction.created_at <= end)
+    if tx_type is not None:
+        stmt = stmt.where(Transaction.type == tx_type)
+    if min_amount is not None:
+        stmt = stmt.where(Transaction.amount >= min_amount)
+    if max_amount is not None:
+        stmt = stmt.where(Transaction.amount <= max_amount)
+    if description_prefix is not None:
+        stmt = stmt.where(Transaction.description.startswith(description_prefix, autoescape=True))
+
+    res = await db.execute(stmt.order_by(Transaction.id.desc()).limit(limit + 1))
+    rows = res.mappings().all()
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor({"id": rows[-1]["id"]})
+    return rows_response(TransactionRead, rows, headers)
 
 @router.post("", response_model=TransactionRead, status_code=201)
 async def create_transaction(
@@ -32,14 +79,65 @@ async def create_transaction(
     if not owns:
         raise HTTPException(status_code=404, detail="Account not found")
 
-    tx = Transaction(
-        account_id=payload.account_id,
-        amount=payload.amount,   # stored in cents
-        type=payload.type,
-        description=payload.description,
-    )
-    db.add(tx)
-    await db.flush()
-    await db.commit()
-    await db.refresh(tx)
-    return tx
\ No newline at end of file
+    async def _insert(session: AsyncSession) -> Transaction:
+        tx = Transaction(
+            account_id=payload.account_id,
+            amount=payload.amount,   # stored in cents
+            type=payload.type,
+            description=payload.description,
+        )
+        session.add(tx)
+        await apply_balance_deltas(session, [(payload.account_id, signed_amount(payload.type, payload.amount))])
+        await session.flush()
+        return tx
+
+    return await run_write(db, _insert)
+
+@router.post("/batch", response_model=TransactionBatchResult, status_code=201)
+async def create_transactions_batch(
+        payload: TransactionBatchCreate,
+        db: AsyncSession = Depends(get_db),
+        user: User = Depends(get_current_user),
+):
+    if len(payload.items) > settings.TRANSACTION_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large (max {settings.TRANSACTION_BATCH_MAX_SIZE} items)",
+        )
+
+    # Ownership check for every referenced account in one query
+    referenced = {item.account_id for item in payload.items}
+    res = await db.execute(select(Account.id).where(Account.id.in_(referenced), Account.user_id == user.id))
+    owned = set(res.scalars().all())
+
+    results = [TransactionBatchItemResult(index=i) for i in range(len(payload.items))]
+    accepted = []
+    for i, item in enumerate(payload.items):
+        if item.account_id in owned:
+            accepted.append(i)
+        else:
+            results[i].error = "Account not found"
+
+    if accepted:
+        # One multi-row INSERT .. RETURNING, ids come back in parameter order
+        rows = [
+            {
+                "account_id": payload.items[i].account_id,
+                "amount": payload.items[i].amount,
+                "type": payload.items[i].type,
+                "description": payload.items[i].description,
+            }
+            for i in accepted
+        ]
+        res = await db.execute(
+            insert(Transaction.__table__).returning(Transaction.__table__.c.id, sort_by_parameter_order=True),
+            rows,
+        )
+        for i, new_id in zip(accepted, res.scalars().all()):
+            results[i].id = new_id
+        await apply_balance_deltas(
+            db, [(payload.items[i].account_id, signed_amount(payload.items[i].type, payload.items[i].amount)) for i in accepted]
+        )
+        await db.commit()
+
+    return TransactionBatchResult(inserted=len(accepted), failed=len(results) - len(accepted), results=results)
@@ -2,10 +2,12 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.api.deps import get_db, get_current_user
+from app.api.serialization import columns, rows_response
 from app.schemas.user import UserRead
 from app.db.models import User
+from app.core.timing import TimedRoute
 
-router = APIRouter(prefix="/api/v1/users", tags=["users"])
+router = APIRouter(prefix="/api/v1/users", tags=["users"], route_class=TimedRoute)
 
 @router.get("/me", response_model=UserRead)
 async def read_me(user: User = Depends(get_current_user)):
@@ -13,9 +15,8 @@ async def read_me(user: User = Depends(get_current_user)):
 
 @router.get("", response_model=list[UserRead])
 async def list_users(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(User))
-    users = result.scalars().all()
-    return users
+    result = await db.execute(select(*columns(UserRead, User)))
+    return rows_response(UserRead, result.mappings())
 
 
 @router.get("/{user_id}", response_model=UserRead)
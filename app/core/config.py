@@ -9,11 +9,85 @@ load_dotenv(find_dotenv())
 class Settings(BaseSettings):
     # DB & server
     DATABASE_URL: str = "sqlite+aiosqlite:///./data/banksy.db"
+    # SQLite PRAGMAs applied to every new connection. SQLITE_PROFILE picks a preset
+    # ("driver" = SQLite defaults, "safe" = WAL + synchronous=FULL, "fast" = WAL +
+    # synchronous=NORMAL with a bigger cache and mmap); any SQLITE_* value set here
+    # overrides the preset.
+    SQLITE_PROFILE: str = "fast"
+    SQLITE_JOURNAL_MODE: str | None = None
+    SQLITE_SYNCHRONOUS: str | None = None
+    SQLITE_CACHE_SIZE: int | None = None  # pages, or KiB when negative
+    SQLITE_MMAP_SIZE: int | None = None  # bytes
+    SQLITE_TEMP_STORE: str | None = None
+    SQLITE_BUSY_TIMEOUT_MS: int | None = None
+    SQLITE_FOREIGN_KEYS: bool | None = None
+    # Connection pools: writes go through DB_WRITE_POOL_SIZE connections (1 = a
+    # single SQLite writer), GET routes through a separate read-only pool. An
+    # in-memory SQLite database uses one engine for both.
+    DB_WRITE_POOL_SIZE: int = 1
+    DB_READ_POOL_SIZE: int = 4
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+    # Statements slower than this are logged (normalized SQL, no parameters)
+    DB_SLOW_QUERY_MS: float = 100
 
     # Clerk / JWT
     CLERK_JWKS_URL: str = Field(..., description="Clerk JWKS endpoint")
     JWT_AUDIENCE: str | None = None
     JWT_ISSUER: str | None = None
+    # JWKS refresh: keys are refetched in the background `REFRESH_MARGIN` seconds
+    # before they expire; an unknown kid forces at most one refetch per interval
+    JWKS_TTL_SECONDS: int = 600
+    JWKS_REFRESH_MARGIN_SECONDS: int = 60
+    JWKS_MIN_FORCED_REFRESH_SECONDS: int = 30
+    # A failed refetch is retried after RETRY_BACKOFF seconds, doubling up to the max.
+    # Keys more than MAX_STALE seconds past their TTL are no longer trusted.
+    JWKS_RETRY_BACKOFF_SECONDS: float = 1
+    JWKS_RETRY_BACKOFF_MAX_SECONDS: float = 60
+    JWKS_MAX_STALE_SECONDS: int = 3600
+    # Where RSA signature checks run: "inline" (on the event loop), "thread" or "process".
+    # Inline is fastest per verify (benchmarks/jwt_offload.py: p50 ~0.09ms vs ~2.2ms on a
+    # thread); a pool only pays off when a burst of verifications would stall the loop.
+    # Verifications queued within the batch window are split across the pool's workers.
+    JWT_VERIFY_EXECUTOR: str = "inline"
+    JWT_VERIFY_WORKERS: int = 4
+    JWT_VERIFY_BATCH_WINDOW_MS: float = 0
+    JWT_VERIFY_MAX_BATCH: int = 64
+    # Verified-token cache (0 disables it)
+    JWT_CACHE_MAX_SIZE: int = 10_000
+    # clerk_user_id -> users row cache used by get_current_user (0 disables it)
+    USER_CACHE_MAX_SIZE: int = 10_000
+    USER_CACHE_TTL_SECONDS: int = 300
+
+    # Group commit: write endpoints hand their inserts to one writer task that
+    # commits up to MAX_BATCH units (or whatever arrived within MAX_DELAY_MS) at once
+    DB_GROUP_COMMIT: bool = False
+    DB_GROUP_COMMIT_MAX_BATCH: int = 64
+    DB_GROUP_COMMIT_MAX_DELAY_MS: float = 2.0
+
+    # Unhandled-exception logs are queued in memory and bulk-inserted by a background
+    # task. When the queue is full ERROR_LOG_OVERFLOW decides what is lost:
+    # "drop_newest", "drop_oldest", or "sample" (past half full, keep only
+    # ERROR_LOG_SAMPLE_RATE of new entries; drop the rest once full)
+    ERROR_LOG_QUEUE_SIZE: int = 10_000
+    ERROR_LOG_BATCH_SIZE: int = 500
+    ERROR_LOG_FLUSH_INTERVAL_MS: float = 250
+    ERROR_LOG_OVERFLOW: str = "drop_newest"
+    ERROR_LOG_SAMPLE_RATE: float = 0.1
+
+    # Fraction of requests that get a Server-Timing header and a "server_timing" log event
+    SERVER_TIMING_SAMPLE_RATE: float = 0.01
+
+    # Keyset pagination for list endpoints
+    PAGE_SIZE_DEFAULT: int = 50
+    PAGE_SIZE_MAX: int = 500
+
+    # Max items accepted by POST /transactions/batch
+    TRANSACTION_BATCH_MAX_SIZE: int = 5000
+    # Max legs accepted by POST /money-transfers/batch
+    MONEY_TRANSFER_BATCH_MAX_SIZE: int = 5000
+
+    # Rows fetched per round trip by streaming exports
+    EXPORT_CHUNK_SIZE: int = 1000
 
     # CORS (comma-separated list)
     CORS_ORIGINS: str = "http://localhost:3000"
@@ -0,0 +1,38 @@
+import hashlib
+import traceback
+from pathlib import Path
+from typing import List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _normalize_path(filename: str) -> str:
+    # Package- or project-relative, so the same bug hashes the same on every host
+    for marker in ("site-packages/", "dist-packages/"):
+        if marker in filename:
+            return filename.split(marker, 1)[1]
+    try:
+        return Path(filename).resolve().relative_to(PROJECT_ROOT).as_posix()
+    except ValueError:
+        return Path(filename).name
+
+
+def normalized_frames(exc: BaseException) -> List[str]:
+    """`path:function` for every frame of the traceback; line numbers are left out
+    so unrelated edits to a file don't split an existing group."""
+    return [f"{_normalize_path(frame.filename)}:{frame.name}" for frame in traceback.extract_tb(exc.__traceback__)]
+
+
+def exception_type(exc: BaseException) -> str:
+    cls = type(exc)
+    return cls.__qualname__ if cls.__module__ == "builtins" else f"{cls.__module__}.{cls.__qualname__}"
+
+
+def fingerprint_exception(exc: BaseException, route: Optional[str] = None) -> str:
+    """
+    Stable id for "the same error": exception type + normalized frames + route
+    template. The exception message is deliberately not part of it, since it
+    usually embeds ids and values that differ on every occurrence.
+    """
+    parts = [exception_type(exc), route or "", *normalized_frames(exc)]
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
@@ -1,55 +1,320 @@
+import asyncio
+import copy
+import functools
+import hashlib
 import time
-from typing import Any, Dict, Optional
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 import httpx
-from jose import jwt
-from jose.utils import base64url_decode
+from jose import jwk, jwt
+from jose.backends.base import Key
+from app.core.cache import TTLCache
 from app.core.config import settings
 
-# Simple JWKS cache
-_JWKS_CACHE: dict[str, Any] = {"exp": 0, "jwks": None}
-_JWKS_TTL_SECONDS = 600
+# Verified claims, keyed by sha256(token); each entry lives until the token's own `exp`.
+# Entries are read-only views over a private deep copy, and every hit gets its own deep
+# copy, so no caller can change the claims (nested lists and dicts included) another request sees
+_TOKEN_CACHE: TTLCache[Mapping[str, Any]] = TTLCache(maxsize=settings.JWT_CACHE_MAX_SIZE)
 
-async def _fetch_jwks() -> Dict[str, Any]:
-    async with httpx.AsyncClient(timeout=10) as client:
-        r = await client.get(settings.CLERK_JWKS_URL)
+
+class JWKSManager:
+    """
+    Keeps the signing keys warm.
+
+    - One refetch at a time: concurrent callers share the in-flight request.
+    - Stale-while-revalidate: once inside the refresh margin the current keys
+      keep being served while a background task refetches them.
+    - Keys are parsed once and indexed by kid.
+    - An unknown kid forces at most one refetch per `min_forced_interval`.
+    - A failed refetch backs off exponentially (`backoff_base` doubling up to
+      `backoff_max`) before the next attempt.
+    - Keys more than `max_stale` past their TTL are not served: callers wait
+      for a refetch, and fail closed if there is none.
+    """
+
+    def __init__(
+            self,
+            url: str,
+            ttl: float = 600,
+            refresh_margin: float = 60,
+            min_forced_interval: float = 30,
+            timeout: float = 10,
+            backoff_base: float = 1,
+            backoff_max: float = 60,
+            max_stale: float = 3600,
+    ):
+        self.url = url
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.min_forced_interval = min_forced_interval
+        self.timeout = timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_stale = max_stale
+        self.fetches = 0
+        self._jwks: Optional[Dict[str, Any]] = None
+        self._keys: Dict[str, Tuple[str, Key]] = {}
+        self._expires_at = 0.0
+        self._last_forced = 0.0
+        self._failures = 0
+        self._retry_at = 0.0
+        self._inflight: Optional[asyncio.Task] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def _fetch(self) -> Dict[str, Any]:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        r = await self._client.get(self.url)
         r.raise_for_status()
         return r.json()
 
+    def _install(self, jwks: Dict[str, Any]) -> None:
+        keys: Dict[str, Tuple[str, Key]] = {}
+        for k in jwks.get("keys", []):
+            kid = k.get("kid")
+            if not kid:
+                continue
+            alg = k.get("alg", "RS256")
+            try:
+                keys[kid] = (alg, jwk.construct(k, alg))
+            except Exception as e:
+                print(f"[jwks] skipping key kid={kid}:", repr(e))
+        if jwks != self._jwks:
+            # Keys rotated: anything verified against the old set must be re-checked
+            _TOKEN_CACHE.clear()
+        self._jwks = jwks
+        self._keys = keys
+        self._expires_at = time.time() + self.ttl
+
+    async def _refresh(self) -> None:
+        self.fetches += 1
+        try:
+            jwks = await self._fetch()
+        except Exception:
+            self._failures += 1
+            backoff = min(self.backoff_base * 2 ** (self._failures - 1), self.backoff_max)
+            self._retry_at = time.time() + backoff
+            raise
+        self._failures = 0
+        self._retry_at = 0.0
+        self._install(jwks)
+
+    def _can_refresh(self, now: float) -> bool:
+        # A refetch already in flight can always be joined; a new one waits out the backoff
+        return (self._inflight is not None and not self._inflight.done()) or now >= self._retry_at
+
+    def refresh(self) -> asyncio.Task:
+        """Start a refetch, or join the one already in flight."""
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.ensure_future(self._refresh())
+            self._inflight.add_done_callback(self._log_refresh_failure)
+        return self._inflight
+
+    @staticmethod
+    def _log_refresh_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            print("[jwks] refresh failed:", repr(task.exception()))
+
+    async def get_jwks(self) -> Dict[str, Any]:
+        now = time.time()
+        if self._jwks is None or now >= self._expires_at + self.max_stale:
+            # Cold start, or too stale to trust: wait for the (shared) fetch, or fail closed
+            if not self._can_refresh(now):
+                raise RuntimeError("JWKS unavailable: last refetch failed, retrying later")
+            await asyncio.shield(self.refresh())
+        elif now >= self._expires_at - self.refresh_margin and self._can_refresh(now):
+            # Serve what we have; revalidate behind the request
+            self.refresh()
+        return self._jwks
+
+    async def get_key(self, kid: str) -> Optional[Tuple[str, Key]]:
+        await self.get_jwks()
+        found = self._keys.get(kid)
+        if found is None:
+            now = time.time()
+            if now - self._last_forced >= self.min_forced_interval and self._can_refresh(now):
+                self._last_forced = now
+                await asyncio.shield(self.refresh())
+                found = self._keys.get(kid)
+        return found
+
+    async def aclose(self) -> None:
+        if self._inflight is not None and not self._inflight.done():
+            self._inflight.cancel()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+jwks_manager = JWKSManager(
+    settings.CLERK_JWKS_URL,
+    ttl=settings.JWKS_TTL_SECONDS,
+    refresh_margin=settings.JWKS_REFRESH_MARGIN_SECONDS,
+    min_forced_interval=settings.JWKS_MIN_FORCED_REFRESH_SECONDS,
+    backoff_base=settings.JWKS_RETRY_BACKOFF_SECONDS,
+    backoff_max=settings.JWKS_RETRY_BACKOFF_MAX_SECONDS,
+    max_stale=settings.JWKS_MAX_STALE_SECONDS,
+)
+
+def _decode(token: str, key: Any, alg: str, audience: Optional[str], issuer: Optional[str]) -> Dict[str, Any]:
+    return jwt.decode(
+        token,
+        key,
+        algorithms=[alg],
+        audience=audience,
+        issuer=issuer,
+        options={"verify_aud": bool(audience)},
+    )
+
+def _decode_batch(items: List[Tuple[str, Any, str, Optional[str], Optional[str]]]) -> List[Tuple[bool, Any]]:
+    # Runs inside the pool; must stay a module-level function so it pickles for processes
+    results: List[Tuple[bool, Any]] = []
+    for item in items:
+        try:
+            results.append((True, _decode(*item)))
+        except Exception as e:
+            results.append((False, e))
+    return results
+
+
+class JWTVerifier:
+    """
+    Runs signature checks off the event loop.
+
+    Verifications that arrive within `batch_window_ms` of each other (or in the
+    same loop iteration when the window is 0) are flushed together and split into
+    at most `workers` jobs, so a login burst is spread over the whole pool at one
+    hand-off per worker instead of one per token.
+    """
+
+    MODES = ("inline", "thread", "process")
+
+    def __init__(self, mode: str = "inline", workers: int = 4, batch_window_ms: float = 0, max_batch: int = 64):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown JWT verify executor {mode!r}; expected one of {self.MODES}")
+        self.mode = mode
+        self.workers = workers
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch = max_batch
+        self.batches = 0
+        self.jobs = 0
+        self._executor: Optional[Executor] = None
+        self._pending: List[Tuple[Tuple[str, Any, str, Optional[str], Optional[str]], asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.Handle] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="jwt-verify")
+        return self._executor
+
+    async def verify(self, token: str, key: Key, alg: str) -> Dict[str, Any]:
+        audience = settings.JWT_AUDIENCE or None
+        issuer = settings.JWT_ISSUER or None
+        if self.mode == "inline":
+            return _decode(token, key, alg, audience, issuer)
+
+        # Parsed key objects do not pickle; worker processes get the JWK dict instead
+        key_arg = key.to_dict() if self.mode == "process" else key
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append(((token, key_arg, alg, audience, issuer), fut))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            if self.batch_window > 0:
+                self._flush_handle = loop.call_later(self.batch_window, self._flush)
+            else:
+                self._flush_handle = loop.call_soon(self._flush)
+        return await fut
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        # Up to `workers` near-equal chunks (ceiling division), one job each
+        size = -(-len(batch) // max(self.workers, 1))
+        for i in range(0, len(batch), size):
+            chunk = batch[i:i + size]
+            self.jobs += 1
+            job = loop.run_in_executor(executor, _decode_batch, [item for item, _ in chunk])
+            job.add_done_callback(functools.partial(self._resolve, [fut for _, fut in chunk]))
+
+    @staticmethod
+    def _resolve(futures: List[asyncio.Future], job: asyncio.Future) -> None:
+        if job.cancelled():
+            for fut in futures:
+                fut.cancel()
+            return
+        if job.exception() is not None:
+            for fut in futures:
+                if not fut.done():
+                    fut.set_exception(job.exception())
+            return
+        for fut, (ok, value) in zip(futures, job.result()):
+            if fut.done():
+                continue
+            if ok:
+                fut.set_result(value)
+            else:
+                fut.set_exception(value)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+jwt_verifier = JWTVerifier(
+    settings.JWT_VERIFY_EXECUTOR,
+    workers=settings.JWT_VERIFY_WORKERS,
+    batch_window_ms=settings.JWT_VERIFY_BATCH_WINDOW_MS,
+    max_batch=settings.JWT_VERIFY_MAX_BATCH,
+)
+
 async def get_jwks() -> Dict[str, Any]:
-    now = time.time()
-    if _JWKS_CACHE["jwks"] is None or now >= _JWKS_CACHE["exp"]:
-        jwks = await _fetch_jwks()
-        _JWKS_CACHE["jwks"] = jwks
-        _JWKS_CACHE["exp"] = now + _JWKS_TTL_SECONDS
-    return _JWKS_CACHE["jwks"]
-
-def _find_key(jwks: Dict[str, Any], kid: str) -> Optional[Dict[str, Any]]:
-    for k in jwks.get("keys", []):
-        if k.get("kid") == kid:
-            return k
-    return None
+    return await jwks_manager.get_jwks()
+
+def _token_cache_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+def token_cache_stats() -> Dict[str, Any]:
+    return _TOKEN_CACHE.stats()
 
 async def verify_jwt(token: str) -> Dict[str, Any]:
+    # 0) repeat tokens skip header parsing, key lookup and the RSA check
+    cache_key = _token_cache_key(token)
+    cached = _TOKEN_CACHE.get(cache_key)
+    if cached is not None:
+        return copy.deepcopy(dict(cached))
+
     # 1) read header to find kid
     header = jwt.get_unverified_header(token)
     kid = header.get("kid")
     if not kid:
         raise ValueError("JWT header missing 'kid'")
 
-    # 2) fetch jwks, find key
-    jwks = await get_jwks()
-    key = _find_key(jwks, kid)
-    if not key:
+    # 2) look up the parsed key for this kid
+    found = await jwks_manager.get_key(kid)
+    if not found:
         raise ValueError("Signing key not found for kid")
+    alg, key = found
 
-    # 3) verify
-    options = {"verify_aud": bool(settings.JWT_AUDIENCE)}
-    claims = jwt.decode(
-        token,
-        key,
-        algorithms=[key.get("alg", "RS256")],
-        audience=settings.JWT_AUDIENCE if settings.JWT_AUDIENCE else None,
-        issuer=settings.JWT_ISSUER if settings.JWT_ISSUER else None,
-        options=options,
-    )
+    # 3) verify (off the event loop unless configured inline)
+    claims = await jwt_verifier.verify(token, key, alg)
+
+    # 4) remember it until it expires (tokens without `exp` are never cached)
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        _TOKEN_CACHE.set(cache_key, MappingProxyType(copy.deepcopy(claims)), expires_at=float(exp))
     return claims
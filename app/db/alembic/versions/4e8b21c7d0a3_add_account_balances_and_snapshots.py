@@ -0,0 +1,54 @@
+"""add account_balances and daily_balance_snapshots
+
+Revision ID: 4e8b21c7d0a3
+Revises: d64c687b843d
+Create Date: 2026-10-18 09:12:40.118203
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '4e8b21c7d0a3'
+down_revision = 'd64c687b843d'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table("account_balances"):
+        op.create_table(
+            "account_balances",
+            sa.Column("account_id", sa.Integer(), sa.ForeignKey("accounts.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("balance", sa.BigInteger(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+
+    # Existing accounts start from their ledger; rows already present are left alone
+    op.execute(
+        """
+        INSERT INTO account_balances (account_id, balance, updated_at)
+        SELECT a.id,
+               COALESCE((
+                   SELECT SUM(CASE WHEN UPPER(t.type) = 'CREDIT' THEN t.amount ELSE -t.amount END)
+                   FROM transactions t
+                   WHERE t.account_id = a.id
+               ), 0),
+               CURRENT_TIMESTAMP
+        FROM accounts a
+        WHERE NOT EXISTS (SELECT 1 FROM account_balances b WHERE b.account_id = a.id)
+        """
+    )
+
+    if not inspector.has_table("daily_balance_snapshots"):
+        op.create_table(
+            "daily_balance_snapshots",
+            sa.Column("account_id", sa.Integer(), sa.ForeignKey("accounts.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("day", sa.Date(), primary_key=True),
+            sa.Column("closing_balance", sa.BigInteger(), nullable=False),
+            sa.Column("covers_until", sa.DateTime(), nullable=False),
+        )
+
+def downgrade() -> None:
+    op.drop_table("daily_balance_snapshots")
+    op.drop_table("account_balances")
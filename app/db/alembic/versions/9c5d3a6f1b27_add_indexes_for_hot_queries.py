@@ -0,0 +1,39 @@
+"""add indexes for hot queries
+
+Revision ID: 9c5d3a6f1b27
+Revises: 4e8b21c7d0a3
+Create Date: 2026-10-18 09:31:05.552917
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '9c5d3a6f1b27'
+down_revision = '4e8b21c7d0a3'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Statements / checkpoints: WHERE account_id = ? AND created_at range
+    op.create_index(
+        "ix_transactions_account_id_created_at", "transactions", ["account_id", "created_at"], if_not_exists=True,
+    )
+    # Listing: WHERE account_id = ? ORDER BY id DESC; replaces the single-column index
+    op.create_index(
+        "ix_transactions_account_id_id_desc", "transactions", ["account_id", sa.text("id DESC")], if_not_exists=True,
+    )
+    op.drop_index("ix_transactions_account_id", table_name="transactions", if_exists=True)
+
+    op.create_index("ix_account_holders_account_id", "account_holders", ["account_id"], if_not_exists=True)
+    op.create_index("ix_account_holders_user_id", "account_holders", ["user_id"], if_not_exists=True)
+    op.create_index("ix_cards_account_id", "cards", ["account_id"], if_not_exists=True)
+    op.create_index("ix_application_logs_created_at", "application_logs", ["created_at"], if_not_exists=True)
+
+def downgrade() -> None:
+    op.drop_index("ix_application_logs_created_at", table_name="application_logs")
+    op.drop_index("ix_cards_account_id", table_name="cards")
+    op.drop_index("ix_account_holders_user_id", table_name="account_holders")
+    op.drop_index("ix_account_holders_account_id", table_name="account_holders")
+    op.create_index("ix_transactions_account_id", "transactions", ["account_id"])
+    op.drop_index("ix_transactions_account_id_id_desc", table_name="transactions")
+    op.drop_index("ix_transactions_account_id_created_at", table_name="transactions")
@@ -0,0 +1,49 @@
+"""add error_groups and error_group_buckets
+
+Revision ID: b81f4e2d6c95
+Revises: 9c5d3a6f1b27
+Create Date: 2026-10-18 14:02:17.904331
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b81f4e2d6c95'
+down_revision = '9c5d3a6f1b27'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table("error_groups"):
+        op.create_table(
+            "error_groups",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("fingerprint", sa.String(length=64), nullable=False),
+            sa.Column("exception_type", sa.String(length=255), nullable=False),
+            sa.Column("location", sa.String(length=255), nullable=True),
+            sa.Column("error_code", sa.Integer(), nullable=True),
+            sa.Column("message", sa.Text(), nullable=True),
+            sa.Column("traceback", sa.Text(), nullable=False),
+            sa.Column("count", sa.BigInteger(), nullable=False),
+            sa.Column("first_seen", sa.DateTime(), nullable=False),
+            sa.Column("last_seen", sa.DateTime(), nullable=False),
+            sa.Column("last_user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="SET NULL"), nullable=True),
+        )
+        op.create_index("ix_error_groups_fingerprint", "error_groups", ["fingerprint"], unique=True)
+        op.create_index("ix_error_groups_last_seen", "error_groups", ["last_seen"])
+
+    if not inspector.has_table("error_group_buckets"):
+        op.create_table(
+            "error_group_buckets",
+            sa.Column("group_id", sa.Integer(), sa.ForeignKey("error_groups.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("minute", sa.DateTime(), primary_key=True),
+            sa.Column("count", sa.BigInteger(), nullable=False),
+        )
+
+def downgrade() -> None:
+    op.drop_table("error_group_buckets")
+    op.drop_index("ix_error_groups_last_seen", table_name="error_groups")
+    op.drop_index("ix_error_groups_fingerprint", table_name="error_groups")
+    op.drop_table("error_groups")
@@ -13,8 +13,86 @@ down_revision = None
 branch_labels = None
 depends_on = None
 
+# Baseline schema. The revisions that follow it up to d64c687b843d were
+# autogenerated empty; everything they were meant to add is created here.
+
 def upgrade() -> None:
-    pass
+    # Databases created by the app's create_all() at startup already have these
+    if sa.inspect(op.get_bind()).has_table("users"):
+        return
+
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("clerk_user_id", sa.String(length=128), nullable=False),
+        sa.Column("email", sa.String(length=320), nullable=True),
+        sa.Column("first_name", sa.String(length=100), nullable=True),
+        sa.Column("last_name", sa.String(length=100), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_users_clerk_user_id", "users", ["clerk_user_id"], unique=True)
+
+    op.create_table(
+        "accounts",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("currency", sa.String(length=3), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_accounts_user_id", "accounts", ["user_id"])
+
+    op.create_table(
+        "transactions",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("account_id", sa.Integer(), sa.ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("amount", sa.Integer(), nullable=False),
+        sa.Column("type", sa.String(length=10), nullable=False),
+        sa.Column("description", sa.String(length=255), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("transfer_id", sa.String(), nullable=True),
+    )
+    op.create_index("ix_transactions_account_id", "transactions", ["account_id"])
+    op.create_index("ix_transactions_transfer_id", "transactions", ["transfer_id"])
+
+    op.create_table(
+        "account_holders",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("account_id", sa.Integer(), sa.ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("holder_type", sa.String(), nullable=False),
+    )
+    op.create_index("ix_account_holders_id", "account_holders", ["id"])
+
+    op.create_table(
+        "cards",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("account_id", sa.Integer(), sa.ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("card_number_last4", sa.String(length=4), nullable=False),
+        sa.Column("card_type", sa.String(), nullable=False),
+        sa.Column("expiration_month", sa.Integer(), nullable=False),
+        sa.Column("expiration_year", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(), nullable=True),
+    )
+    op.create_index("ix_cards_id", "cards", ["id"])
+
+    op.create_table(
+        "application_logs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("error_code", sa.Integer(), nullable=True),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("location", sa.String(length=255), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+    op.create_index("ix_application_logs_id", "application_logs", ["id"])
 
 def downgrade() -> None:
-    pass
+    op.drop_table("application_logs")
+    op.drop_table("cards")
+    op.drop_table("account_holders")
+    op.drop_table("transactions")
+    op.drop_table("accounts")
+    op.drop_table("users")
@@ -0,0 +1,27 @@
+"""error_groups listing indexes
+
+Revision ID: e2a7c9f40b18
+Revises: b81f4e2d6c95
+Create Date: 2026-10-18 15:47:52.310486
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e2a7c9f40b18'
+down_revision = 'b81f4e2d6c95'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Keyset pagination orders by (last_seen, id); the location filter keeps that order per route
+    op.create_index("ix_error_groups_last_seen_id", "error_groups", ["last_seen", "id"], if_not_exists=True)
+    op.create_index(
+        "ix_error_groups_location_last_seen", "error_groups", ["location", "last_seen"], if_not_exists=True,
+    )
+    op.drop_index("ix_error_groups_last_seen", table_name="error_groups", if_exists=True)
+
+def downgrade() -> None:
+    op.create_index("ix_error_groups_last_seen", "error_groups", ["last_seen"])
+    op.drop_index("ix_error_groups_location_last_seen", table_name="error_groups")
+    op.drop_index("ix_error_groups_last_seen_id", table_name="error_groups")
@@ -0,0 +1,295 @@
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import and_, case, delete, exists, func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from app.db.models import Account, AccountBalance, DailyBalanceSnapshot, Transaction
+
+# Ledger rows store positive amounts; CREDIT adds to the balance, everything else subtracts
+signed_amount_expr = case(
+    (func.upper(Transaction.type) == "CREDIT", Transaction.amount),
+    else_=-Transaction.amount,
+)
+
+
+def signed_amount(tx_type: str, amount: int) -> int:
+    return amount if tx_type.upper() == "CREDIT" else -amount
+
+
+def dialect_insert(db: AsyncSession):
+    # Both dialects we run on support INSERT .. ON CONFLICT DO UPDATE
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+async def _upsert_balances(db: AsyncSession, balances: Dict[int, int], additive: bool) -> None:
+    if not balances:
+        return
+    now = datetime.utcnow()
+    insert = dialect_insert(db)
+    # Sorted so concurrent writers lock rows in the same order
+    stmt = insert(AccountBalance).values([
+        {"account_id": account_id, "balance": balances[account_id], "updated_at": now}
+        for account_id in sorted(balances)
+    ])
+    new_balance = AccountBalance.balance + stmt.excluded.balance if additive else stmt.excluded.balance
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[AccountBalance.account_id],
+        set_={"balance": new_balance, "updated_at": stmt.excluded.updated_at},
+    )
+    await db.execute(stmt)
+
+
+async def apply_balance_deltas(db: AsyncSession, deltas: Iterable[Tuple[int, int]]) -> None:
+    """
+    Add (account_id, signed delta) pairs to the materialized balances.
+    Runs in the caller's transaction, so it commits or rolls back with the ledger rows.
+    """
+    totals: Dict[int, int] = {}
+    for account_id, delta in deltas:
+        totals[account_id] = totals.get(account_id, 0) + delta
+    await _upsert_balances(db, totals, additive=True)
+
+
+async def ledger_balances(db: AsyncSession, account_ids: Iterable[int]) -> Dict[int, int]:
+    """Balances recomputed from the transactions table for the given accounts."""
+    ids = list(account_ids)
+    if not ids:
+        return {}
+    res = await db.execute(
+        select(Transaction.account_id, func.sum(signed_amount_expr))
+        .where(Transaction.account_id.in_(ids))
+        .group_by(Transaction.account_id)
+    )
+    totals = {account_id: int(total or 0) for account_id, total in res.all()}
+    return {account_id: totals.get(account_id, 0) for account_id in ids}
+
+
+async def seed_missing_balances(conn: AsyncConnection) -> int:
+    """
+    Give every account without a materialized balance one computed from its ledger.
+    Tables made by create_all() on a database that already has transactions start
+    out empty; existing rows are left alone. Returns the number of rows written.
+    """
+    ledger = (
+        select(func.coalesce(func.sum(signed_amount_expr), 0))
+        .where(Transaction.account_id == Account.id)
+        .scalar_subquery()
+    )
+    missing = ~exists().where(AccountBalance.account_id == Account.id)
+    res = await conn.execute(
+        insert(AccountBalance).from_select(
+            ["account_id", "balance", "updated_at"],
+            select(Account.id, ledger, func.now()).where(missing),
+        )
+    )
+    return res.rowcount
+
+
+async def rebuild_balances(db: AsyncSession, chunk_size: int = 1000, fix: bool = True) -> Dict[str, int]:
+    """
+    Recompute every account's balance from the ledger, `chunk_size` accounts at a time,
+    and compare it with the stored value. With `fix`, mismatches are overwritten and
+    each chunk is committed on its own so memory and lock time stay bounded.
+    """
+    checked = mismatched = 0
+    last_id = 0
+    while True:
+        res = await db.execute(
+            select(Account.id).where(Account.id > last_id).order_by(Account.id.asc()).limit(chunk_size)
+        )
+        account_ids = list(res.scalars().all())
+        if not account_ids:
+            break
+        last_id = account_ids[-1]
+
+        expected = await ledger_balances(db, account_ids)
+        res = await db.execute(
+            select(AccountBalance.account_id, AccountBalance.balance)
+            .where(AccountBalance.account_id.in_(account_ids))
+        )
+        stored = dict(res.all())
+        wrong = {
+            account_id: balance
+            for account_id, balance in expected.items()
+            if stored.get(account_id, 0) != balance
+        }
+        checked += len(account_ids)
+        mismatched += len(wrong)
+        if fix and wrong:
+            await _upsert_balances(db, wrong, additive=False)
+            await db.commit()
+    return {"checked": checked, "mismatched": mismatched, "fixed": mismatched if fix else 0}
+
+
+# ---------------------------------------------------------------------------
+# Daily checkpoints
+# ---------------------------------------------------------------------------
+
+def _as_date(value) -> date:
+    # func.date() returns a string on SQLite and a date on Postgres
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+async def opening_balances(db: AsyncSession, account_ids: Iterable[int], at: datetime) -> Dict[int, int]:
+    """
+    Balance of each account just before `at`: the latest checkpoint that ends at or
+    before `at`, plus the ledger delta between that checkpoint and `at`. Only the
+    rows after the checkpoint are read, never the account's whole history.
+    """
+    ids = list(account_ids)
+    if not ids:
+        return {}
+
+    latest_day = (
+        select(DailyBalanceSnapshot.account_id, func.max(DailyBalanceSnapshot.day).label("day"))
+        .where(DailyBalanceSnapshot.account_id.in_(ids), DailyBalanceSnapshot.covers_until <= at)
+        .group_by(DailyBalanceSnapshot.account_id)
+        .subquery()
+    )
+    checkpoint = (
+        select(DailyBalanceSnapshot.account_id, DailyBalanceSnapshot.closing_balance, DailyBalanceSnapshot.covers_until)
+        .join(latest_day, and_(
+            DailyBalanceSnapshot.account_id == latest_day.c.account_id,
+            DailyBalanceSnapshot.day == latest_day.c.day,
+        ))
+        .cte("checkpoint")
+    )
+
+    res = await db.execute(select(checkpoint.c.account_id, checkpoint.c.closing_balance))
+    balances = {account_id: 0 for account_id in ids}
+    balances.update({account_id: int(closing) for account_id, closing in res.all()})
+
+    res = await db.execute(
+        select(Transaction.account_id, func.sum(signed_amount_expr))
+        .outerjoin(checkpoint, checkpoint.c.account_id == Transaction.account_id)
+        .where(
+            Transaction.account_id.in_(ids),
+            Transaction.created_at < at,
+            or_(checkpoint.c.covers_until.is_(None), Transaction.created_at >= checkpoint.c.covers_until),
+        )
+        .group_by(Transaction.account_id)
+    )
+    for account_id, delta in res.all():
+        balances[account_id] += int(delta or 0)
+    return balances
+
+
+# Rows per multi-VALUES statement; keeps us well under SQLite's bound-parameter limit
+_UPSERT_BATCH = 500
+
+
+async def _upsert_snapshots(db: AsyncSession, rows: List[dict]) -> None:
+    insert = dialect_insert(db)
+    for i in range(0, len(rows), _UPSERT_BATCH):
+        stmt = insert(DailyBalanceSnapshot).values(rows[i:i + _UPSERT_BATCH])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DailyBalanceSnapshot.account_id, DailyBalanceSnapshot.day],
+            set_={"closing_balance": stmt.excluded.closing_balance, "covers_until": stmt.excluded.covers_until},
+        )
+        await db.execute(stmt)
+
+
+async def rollup_day(db: AsyncSession, day: date, chunk_size: int = 1000) -> int:
+    """
+    Write the end-of-day checkpoint for `day` for every account with activity on it.
+    Idempotent; run it once the day is over (e.g. nightly for yesterday).
+    """
+    # A checkpoint covers its whole day, so rows posted after an early rollup would be lost
+    if day >= datetime.utcnow().date():
+        raise ValueError(f"cannot roll up {day}: only days before today (UTC) are complete")
+    day_start = datetime.combine(day, time.min)
+    day_end = day_start + timedelta(days=1)
+    in_day = and_(Transaction.created_at >= day_start, Transaction.created_at < day_end)
+
+    written = 0
+    last_id = 0
+    while True:
+        res = await db.execute(
+            select(Transaction.account_id)
+            .where(in_day, Transaction.account_id > last_id)
+            .group_by(Transaction.account_id)
+            .order_by(Transaction.account_id.asc())
+            .limit(chunk_size)
+        )
+        account_ids = list(res.scalars().all())
+        if not account_ids:
+            break
+        last_id = account_ids[-1]
+
+        # Opening at day_start already folds in any days that were never rolled up
+        openings = await opening_balances(db, account_ids, day_start)
+        res = await db.execute(
+            select(Transaction.account_id, func.sum(signed_amount_expr))
+            .where(in_day, Transaction.account_id.in_(account_ids))
+            .group_by(Transaction.account_id)
+        )
+        rows = [
+            {
+                "account_id": account_id,
+                "day": day,
+                "closing_balance": openings[account_id] + int(delta or 0),
+                "covers_until": day_end,
+            }
+            for account_id, delta in res.all()
+        ]
+        await _upsert_snapshots(db, rows)
+        await db.commit()
+        written += len(rows)
+    return written
+
+
+async def backfill_snapshots(db: AsyncSession, until: Optional[date] = None, chunk_size: int = 1000) -> int:
+    """
+    Rebuild every checkpoint for days before `until` (default: today) from the ledger.
+    Accounts are processed `chunk_size` at a time with one GROUP BY (account, day)
+    query per chunk and a running sum, committing after each chunk.
+    """
+    today = datetime.utcnow().date()
+    until = until or today
+    if until > today:
+        raise ValueError(f"cannot backfill until {until}: only days before today (UTC) are complete")
+    until_start = datetime.combine(until, time.min)
+    tx_day = func.date(Transaction.created_at)
+
+    written = 0
+    last_id = 0
+    while True:
+        res = await db.execute(
+            select(Account.id).where(Account.id > last_id).order_by(Account.id.asc()).limit(chunk_size)
+        )
+        account_ids = list(res.scalars().all())
+        if not account_ids:
+            break
+        last_id = account_ids[-1]
+
+        res = await db.execute(
+            select(Transaction.account_id, tx_day.label("day"), func.sum(signed_amount_expr))
+            .where(Transaction.account_id.in_(account_ids), Transaction.created_at < until_start)
+            .group_by(Transaction.account_id, tx_day)
+            .order_by(Transaction.account_id.asc(), tx_day.asc())
+        )
+        rows = []
+        running: Dict[int, int] = {}
+        for account_id, day, delta in res.all():
+            day = _as_date(day)
+            running[account_id] = running.get(account_id, 0) + int(delta or 0)
+            rows.append({
+                "account_id": account_id,
+                "day": day,
+                "closing_balance": running[account_id],
+                "covers_until": datetime.combine(day + timedelta(days=1), time.min),
+            })
+
+        await db.execute(
+            delete(DailyBalanceSnapshot).where(
+                DailyBalanceSnapshot.account_id.in_(account_ids),
+                DailyBalanceSnapshot.day < until,
+            )
+        )
+        await _upsert_snapshots(db, rows)
+        await db.commit()
+        written += len(rows)
+    return written
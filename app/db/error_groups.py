@@ -0,0 +1,92 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.balances import dialect_insert
+from app.db.models import ErrorGroup, ErrorGroupBucket
+
+# Rows per multi-VALUES statement; keeps us well under SQLite's bound-parameter limit
+_UPSERT_BATCH = 200
+
+
+def _minute(ts: datetime) -> datetime:
+    return ts.replace(second=0, microsecond=0)
+
+
+async def record_errors(db: AsyncSession, entries: Iterable[Dict[str, Any]]) -> int:
+    """
+    Fold error occurrences into their groups and per-minute buckets.
+
+    Each entry carries fingerprint, exception_type, location, error_code, message,
+    traceback, user_id and created_at. Entries are aggregated in memory first, so
+    a batch costs one upsert per distinct group and bucket, not one row per
+    occurrence. Runs in the caller's transaction. Returns the number of entries.
+    """
+    groups: Dict[str, Dict[str, Any]] = {}
+    buckets: Dict[Tuple[str, datetime], int] = {}
+    total = 0
+    for entry in entries:
+        total += 1
+        fp, ts = entry["fingerprint"], entry["created_at"]
+        group = groups.get(fp)
+        if group is None:
+            groups[fp] = {
+                "fingerprint": fp,
+                "exception_type": entry["exception_type"],
+                "location": entry.get("location"),
+                "error_code": entry.get("error_code"),
+                "message": entry.get("message"),
+                "traceback": entry["traceback"],
+                "count": 1,
+                "first_seen": ts,
+                "last_seen": ts,
+                "last_user_id": entry.get("user_id"),
+            }
+        else:
+            group["count"] += 1
+            group["first_seen"] = min(group["first_seen"], ts)
+            if ts >= group["last_seen"]:
+                group.update(
+                    last_seen=ts,
+                    message=entry.get("message"),
+                    error_code=entry.get("error_code"),
+                    last_user_id=entry.get("user_id"),
+                )
+        key = (fp, _minute(ts))
+        buckets[key] = buckets.get(key, 0) + 1
+    if not groups:
+        return 0
+
+    insert = dialect_insert(db)
+    rows = [groups[fp] for fp in sorted(groups)]
+    for i in range(0, len(rows), _UPSERT_BATCH):
+        stmt = insert(ErrorGroup).values(rows[i:i + _UPSERT_BATCH])
+        # The stored traceback and first_seen belong to the first occurrence and are kept
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ErrorGroup.fingerprint],
+            set_={
+                "count": ErrorGroup.count + stmt.excluded.count,
+                "last_seen": stmt.excluded.last_seen,
+                "message": stmt.excluded.message,
+                "error_code": stmt.excluded.error_code,
+                "last_user_id": stmt.excluded.last_user_id,
+            },
+        )
+        await db.execute(stmt)
+
+    res = await db.execute(
+        select(ErrorGroup.fingerprint, ErrorGroup.id).where(ErrorGroup.fingerprint.in_(list(groups)))
+    )
+    group_ids = dict(res.all())
+    bucket_rows: List[Dict[str, Any]] = [
+        {"group_id": group_ids[fp], "minute": minute, "count": count}
+        for (fp, minute), count in sorted(buckets.items())
+    ]
+    for i in range(0, len(bucket_rows), _UPSERT_BATCH):
+        stmt = insert(ErrorGroupBucket).values(bucket_rows[i:i + _UPSERT_BATCH])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ErrorGroupBucket.group_id, ErrorGroupBucket.minute],
+            set_={"count": ErrorGroupBucket.count + stmt.excluded.count},
+        )
+        await db.execute(stmt)
+    return total
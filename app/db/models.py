@@ -1,11 +1,14 @@
-from datetime import datetime
+from datetime import date, datetime
 from sqlalchemy.sql import func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from sqlalchemy import (
     Column,
     Integer,
+    BigInteger,
     String,
     ForeignKey,
+    Index,
+    Date,
     DateTime,
     Text
 )
@@ -23,10 +26,43 @@ class ApplicationLogger(Base):
     error_code = Column(Integer, nullable=True)
     message = Column(Text, nullable=False)
     location = Column(String(255), nullable=True)  # module/route/function name
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
 
     user = relationship("User", back_populates="logs")
 
+class ErrorGroup(Base):
+    """
+    One row per distinct error (see app.core.fingerprint). The traceback is stored
+    once, from the first occurrence; later occurrences only bump the counters.
+    """
+    __tablename__ = "error_groups"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    fingerprint: Mapped[str] = mapped_column(String(64), unique=True, index=True)
+    exception_type: Mapped[str] = mapped_column(String(255))
+    location: Mapped[str | None] = mapped_column(String(255), nullable=True)  # "METHOD /route/{template}"
+    error_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    message: Mapped[str | None] = mapped_column(Text, nullable=True)  # str(exc) of the latest occurrence
+    traceback: Mapped[str] = mapped_column(Text)
+    count: Mapped[int] = mapped_column(BigInteger, default=0)
+    first_seen: Mapped[datetime] = mapped_column(DateTime)
+    last_seen: Mapped[datetime] = mapped_column(DateTime)
+    last_user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+
+    __table_args__ = (
+        # GET /errors pages by (last_seen, id) desc, optionally within one route
+        Index("ix_error_groups_last_seen_id", "last_seen", "id"),
+        Index("ix_error_groups_location_last_seen", "location", "last_seen"),
+    )
+
+class ErrorGroupBucket(Base):
+    """Occurrences of an error group per minute."""
+    __tablename__ = "error_group_buckets"
+
+    group_id: Mapped[int] = mapped_column(ForeignKey("error_groups.id", ondelete="CASCADE"), primary_key=True)
+    minute: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, default=0)
+
 class User(Base):
     __tablename__ = "users"
 
@@ -61,8 +97,8 @@ class AccountHolder(Base):
     __tablename__ = "account_holders"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    account_id = Column(ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    account_id = Column(ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False, index=True)
     holder_type = Column(String, nullable=False)  # "Primary", "Joint", "Trust", etc.
 
     # Relationships
@@ -73,7 +109,7 @@ class Card(Base):
     __tablename__ = "cards"
 
     id = Column(Integer, primary_key=True, index=True)
-    account_id = Column(ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False)
+    account_id = Column(ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False, index=True)
     card_number_last4 = Column(String(4), nullable=False)
     card_type = Column(String, nullable=False)  # "Debit", "Credit", "Virtual"
     expiration_month = Column(Integer, nullable=False)
@@ -91,11 +127,37 @@ class Transaction(Base):
     __tablename__ = "transactions"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id", ondelete="CASCADE"), index=True)
+    # Indexed by the composite indexes below
+    account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id", ondelete="CASCADE"))
     amount: Mapped[int] = mapped_column(Integer)  # store in cents for precision
     type: Mapped[str] = mapped_column(String(10))  # "DEBIT" or "CREDIT"
     description: Mapped[str | None] = mapped_column(String(255), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     # NEW: link transactions belonging to the same transfer
     transfer_id = Column(String, index=True, nullable=True, default=lambda: str(uuid.uuid4()))
-    account: Mapped["Account"] = relationship(back_populates="transactions")
\ No newline at end of file
+    account: Mapped["Account"] = relationship(back_populates="transactions")
+
+# Statements and checkpoints read an account's rows by time; listings page an account by id
+Index("ix_transactions_account_id_created_at", Transaction.account_id, Transaction.created_at)
+Index("ix_transactions_account_id_id_desc", Transaction.account_id, Transaction.id.desc())
+
+class AccountBalance(Base):
+    """Running balance per account, kept in step with every ledger insert."""
+    __tablename__ = "account_balances"
+
+    account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id", ondelete="CASCADE"), primary_key=True)
+    balance: Mapped[int] = mapped_column(BigInteger, default=0)  # cents, CREDIT minus DEBIT
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class DailyBalanceSnapshot(Base):
+    """
+    End-of-day balance checkpoint, written only for days with activity.
+    `covers_until` is the exclusive end of the day, i.e. the first instant
+    whose transactions are *not* included in `closing_balance`.
+    """
+    __tablename__ = "daily_balance_snapshots"
+
+    account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id", ondelete="CASCADE"), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    closing_balance: Mapped[int] = mapped_column(BigInteger)
+    covers_until: Mapped[datetime] = mapped_column(DateTime)
@@ -0,0 +1,80 @@
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import registry
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time-Ms"
+
+
+@dataclass
+class QueryStats:
+    """SQL statements run on behalf of one request and the time spent in them."""
+    count: int = 0
+    seconds: float = 0.0
+
+
+# Set per request by MetricsMiddleware; None outside a request (scripts, background tasks)
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+db_queries = registry.counter("db_queries", "SQL statements executed, by leading keyword.", ("operation",))
+db_query_duration = registry.histogram(
+    "db_query_duration_seconds", "Cursor execute time per SQL statement.", ("operation",),
+)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    One line, literals replaced by `?` and IN lists folded to `(?, ...)`, so the
+    same query logs identically whatever its parameters or batch size.
+    """
+    sql = _STRING.sub("?", statement)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("(?, ...)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+def _operation(statement: str) -> str:
+    head = statement.lstrip()[:12].split(None, 1)
+    return head[0].upper() if head else "?"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - getattr(context, "_query_started", time.perf_counter())
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+    operation = _operation(statement)
+    db_queries.inc(operation)
+    db_query_duration.observe(elapsed, operation)
+    if elapsed * 1000 >= settings.DB_SLOW_QUERY_MS:
+        # Parameters are left out on purpose: they carry user data
+        logger.warning(
+            "slow_query",
+            duration_ms=round(elapsed * 1000, 2),
+            sql=normalize_sql(statement),
+            executemany=executemany,
+        )
+
+
+def install_query_instrumentation() -> None:
+    """Hook every Engine (app, tests, scripts) once; safe to call repeatedly."""
+    if not event.contains(Engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
@@ -1,26 +1,128 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from typing import Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.query_stats import install_query_instrumentation
+
+install_query_instrumentation()
 
 _engine = None
 _SessionLocal = None
+_read_engine = None
+_ReadSessionLocal = None
+
+# PRAGMA presets for SQLite connections, in the order they are applied
+SQLITE_PROFILES: Dict[str, Dict[str, object]] = {
+    "driver": {},
+    "safe": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "busy_timeout": 5000,
+        "foreign_keys": "ON",
+    },
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",     # WAL stays consistent; only the last commits can be lost on power failure
+        "cache_size": -64_000,       # ~64 MB
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+        "foreign_keys": "ON",
+    },
+}
+
+SQLITE_PRAGMAS = (
+    "journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store", "busy_timeout", "foreign_keys",
+    "query_only",  # set on the read pool's connections only
+)
+
+
+def sqlite_pragmas(profile: Optional[str] = None) -> Dict[str, object]:
+    """Effective PRAGMAs: the profile's preset with any SQLITE_* settings on top."""
+    profile = profile or settings.SQLITE_PROFILE
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLITE_PROFILE {profile!r} (expected one of {', '.join(SQLITE_PROFILES)})")
+    pragmas = dict(SQLITE_PROFILES[profile])
+    overrides = {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "foreign_keys": settings.SQLITE_FOREIGN_KEYS,
+    }
+    for name, value in overrides.items():
+        if value is None:
+            continue
+        pragmas[name] = ("ON" if value else "OFF") if isinstance(value, bool) else value
+    return {name: pragmas[name] for name in SQLITE_PRAGMAS if name in pragmas}
+
+
+def install_sqlite_pragmas(engine: AsyncEngine, pragmas: Dict[str, object]) -> None:
+    """Run `PRAGMA name=value` on every new DBAPI connection of `engine`."""
+    for name, value in pragmas.items():
+        if name not in SQLITE_PRAGMAS or not str(value).lstrip("-").isalnum():
+            raise ValueError(f"Invalid SQLite pragma {name}={value!r}")
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and (":memory:" in url or url.rstrip("/").endswith(":"))
+
+
+def _create_engine(pool_size: int, read_only: bool = False) -> AsyncEngine:
+    url = settings.DATABASE_URL
+    kwargs = {}
+    if not _is_memory_sqlite(url):
+        # Fixed-size pools: callers wait for a connection instead of piling onto the lock
+        kwargs = {"pool_size": pool_size, "max_overflow": 0, "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS}
+    engine = create_async_engine(
+        url,
+        future=True,
+        echo=False,   # set True for debugging
+        **kwargs,
+    )
+    if url.startswith("sqlite"):
+        pragmas = sqlite_pragmas()
+        if read_only:
+            pragmas["query_only"] = "ON"
+        install_sqlite_pragmas(engine, pragmas)
+    return engine
 
 
 def get_engine():
     """
-    Lazily initialize and return the SQLAlchemy engine.
+    Lazily initialize and return the SQLAlchemy engine used for writes.
     Uses the current settings.DATABASE_URL (so tests can override it).
     """
     global _engine
     if _engine is None:
-        _engine = create_async_engine(
-            settings.DATABASE_URL,
-            future=True,
-            echo=False,   # set True for debugging
-        )
+        _engine = _create_engine(settings.DB_WRITE_POOL_SIZE)
     return _engine
 
 
+def get_read_engine():
+    """
+    Lazily initialize and return the read-only engine. Under WAL its connections
+    read concurrently with each other and with the writer. An in-memory database
+    only exists on the write engine's connection, so it is shared.
+    """
+    global _read_engine
+    if _read_engine is None:
+        if _is_memory_sqlite(settings.DATABASE_URL):
+            return get_engine()
+        _read_engine = _create_engine(settings.DB_READ_POOL_SIZE, read_only=True)
+    return _read_engine
+
+
 def get_sessionmaker():
     """
     Lazily initialize and return the sessionmaker bound to the engine.
@@ -35,6 +137,42 @@ def get_sessionmaker():
     return _SessionLocal
 
 
+def get_read_sessionmaker():
+    """
+    Sessionmaker for the read pool; falls back to the write sessionmaker when
+    both pools are the same engine.
+    """
+    global _ReadSessionLocal
+    if _ReadSessionLocal is None:
+        engine = get_read_engine()
+        if engine is get_engine():
+            return get_sessionmaker()
+        _ReadSessionLocal = sessionmaker(
+            bind=engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+    return _ReadSessionLocal
+
+
+def _pool_stats(engine: AsyncEngine) -> Dict[str, object]:
+    pool = engine.sync_engine.pool
+    stats: Dict[str, object] = {"class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        if hasattr(pool, name):
+            stats[name] = getattr(pool, name)()
+    return stats
+
+
+def pool_status() -> Dict[str, Dict[str, object]]:
+    """Size and checkout counts of the write and read pools."""
+    write, read = get_engine(), get_read_engine()
+    return {
+        "write": _pool_stats(write),
+        "read": {"shared_with": "write"} if read is write else _pool_stats(read),
+    }
+
+
 # Default dependency for FastAPI
 async def get_db():
     """
@@ -43,3 +181,16 @@ async def get_db():
     SessionLocal = get_sessionmaker()
     async with SessionLocal() as session:
         yield session
+
+
+# Routes that write use the writer pool (get_db); read-only routes use get_read_db
+get_write_db = get_db
+
+
+async def get_read_db():
+    """
+    Yields a session on the read-only pool. Safe to override in tests.
+    """
+    SessionLocal = get_read_sessionmaker()
+    async with SessionLocal() as session:
+        yield session
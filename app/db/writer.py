@@ -0,0 +1,135 @@
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, TypeVar
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.session import get_sessionmaker
+
+T = TypeVar("T")
+
+# A write unit adds/updates rows on the session it is given and may flush,
+# but never commits; committing is the writer's job.
+WriteUnit = Callable[[AsyncSession], Awaitable[T]]
+
+_STOP = object()
+
+
+class GroupCommitWriter:
+    """
+    Single writer task for SQLite's single-writer lock.
+
+    Request handlers submit write units and await a future. The writer runs
+    every unit that arrives within `max_delay_ms` (up to `max_batch`) on one
+    session and commits them together, so concurrent writers share one
+    commit/fsync instead of queueing on the lock one by one. If the shared
+    commit fails, each unit is replayed in its own transaction so one bad
+    unit only fails its own caller.
+    """
+
+    def __init__(self, max_batch: int = 64, max_delay_ms: float = 2.0):
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self.batches = 0
+        self.units = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run(), name="group-commit-writer")
+
+    async def stop(self) -> None:
+        """Commit whatever is queued, then stop."""
+        if not self.running:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    async def submit(self, unit: WriteUnit[T]) -> T:
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((unit, fut))
+        return await fut
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._commit_batch(batch)
+
+    async def _commit_batch(self, batch: List[Tuple[WriteUnit[Any], asyncio.Future]]) -> None:
+        live = [(unit, fut) for unit, fut in batch if not fut.done()]
+        if not live:
+            return
+        self.batches += 1
+        self.units += len(live)
+        SessionLocal = get_sessionmaker()
+        results = []
+        try:
+            async with SessionLocal() as db:
+                for unit, _ in live:
+                    results.append(await unit(db))
+                await db.commit()
+        except Exception:
+            for unit, fut in live:
+                await self._commit_one(unit, fut)
+            return
+        for (_, fut), result in zip(live, results):
+            if not fut.done():
+                fut.set_result(result)
+
+    async def _commit_one(self, unit: WriteUnit[Any], fut: asyncio.Future) -> None:
+        SessionLocal = get_sessionmaker()
+        try:
+            async with SessionLocal() as db:
+                result = await unit(db)
+                await db.commit()
+        except Exception as e:
+            if not fut.done():
+                fut.set_exception(e)
+            return
+        if not fut.done():
+            fut.set_result(result)
+
+
+writer = GroupCommitWriter(
+    max_batch=settings.DB_GROUP_COMMIT_MAX_BATCH,
+    max_delay_ms=settings.DB_GROUP_COMMIT_MAX_DELAY_MS,
+)
+
+
+async def run_write(db: AsyncSession, unit: WriteUnit[T]) -> T:
+    """
+    Run `unit` and commit it. While the group-commit writer is running the unit
+    joins the next shared commit; otherwise it runs on the caller's session.
+    """
+    if writer.running:
+        # Hand the caller's connection back first: with a single-connection write
+        # pool the writer task would otherwise wait on it forever
+        await db.commit()
+        return await writer.submit(unit)
+    result = await unit(db)
+    await db.commit()
+    return result
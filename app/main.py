@@ -4,7 +4,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import text
 from app.db.session import get_engine
 from app.db.models import Base
+from app.db.balances import seed_missing_balances
 from app.core.config import settings
+from app.core.security import jwks_manager, jwt_verifier
+from app.db.writer import writer
 from app.api.v1.users import router as users_router
 from app.api.v1.admin import router as admin_router  # <-- will add this file below
 from app.api.v1.accounts import router as accounts_router
@@ -14,7 +17,13 @@ from app.api.v1.cards import router as cards_router
 from app.api.v1.money_transfers import router as money_transfers_router
 from app.api.v1.statements import router as statements_router
 from app.api.v1.errors import router as errors_router
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.db.query_stats import QUERY_COUNT_HEADER, QUERY_TIME_HEADER
 from app.middleware.error_logger import error_logger_middleware
+from app.middleware.error_buffer import error_buffer
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.timing import ServerTimingMiddleware
+from app.core.timing import SERVER_TIMING_HEADER, TimedRoute
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -23,6 +32,9 @@ async def lifespan(app: FastAPI):
     # Auto-create tables for dev/SQLite. For Postgres prod, use Alembic.
     async with get_engine().begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        seeded = await seed_missing_balances(conn)
+        if seeded:
+            print(f"[startup] Seeded {seeded} account balances from the ledger")
         try:
             # Log tables present (SQLite)
             res = await conn.execute(text("SELECT name FROM sqlite_master WHERE type='table'"))
@@ -31,17 +43,27 @@ async def lifespan(app: FastAPI):
             print("[startup] Tables:", tables)
         except Exception as e:
             print("[startup] Could not list tables:", repr(e))
+    if settings.DB_GROUP_COMMIT:
+        await writer.start()
+        print(f"[startup] Group commit on (batch<={writer.max_batch}, delay<={writer.max_delay * 1000:g}ms)")
+    await error_buffer.start()
     print("DB ready at", settings.DATABASE_URL)
     print("Banksy Backend available at http://127.0.0.1:8000 (mapped from 0.0.0.0 inside Docker), health check is available at http://127.0.0.1:8000/api/v1/health")
     yield
     # Shutdown code
     print("App shutting down...")
+    await error_buffer.stop()
+    print("[shutdown] Error logs:", error_buffer.stats())
+    await writer.stop()
+    await jwks_manager.aclose()
+    jwt_verifier.shutdown()
 
 app = FastAPI(
     title="Banksy API",
     openapi_url="/openapi.json",
     lifespan=lifespan,
 )
+app.router.route_class = TimedRoute
 
 # CORS (allow the frontend origin & auth header)
 app.add_middleware(
@@ -50,9 +72,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
     allow_headers=["Authorization", "Content-Type", "X-Requested-With"],
+    expose_headers=[NEXT_CURSOR_HEADER, QUERY_COUNT_HEADER, QUERY_TIME_HEADER, SERVER_TIMING_HEADER],
 )
 
 app.middleware("http")(error_logger_middleware)
+app.add_middleware(ServerTimingMiddleware)
+# Outermost, so it also times and counts the 500s the error logger produces
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(users_router)
 app.include_router(admin_router)
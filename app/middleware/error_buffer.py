@@ -0,0 +1,134 @@
+import asyncio
+import random
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+from app.core.config import settings
+from app.core.logging import logger
+from app.db.error_groups import record_errors
+from app.db.session import get_sessionmaker
+
+OVERFLOW_POLICIES = ("drop_newest", "drop_oldest", "sample")
+
+
+class ErrorLogBuffer:
+    """
+    Bounded in-memory queue of error occurrences, drained by a background task.
+
+    `submit` never waits on the database: the failing request only appends a dict.
+    The drain task folds up to `batch_size` occurrences at a time into their
+    error groups every `flush_interval_ms` (sooner once a full batch is waiting).
+    When the queue is full the overflow policy decides which entries are lost, so
+    an exception storm costs a bounded amount of memory and a few bulk upserts
+    per second.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10_000,
+        batch_size: int = 500,
+        flush_interval_ms: float = 250,
+        overflow: str = "drop_newest",
+        sample_rate: float = 0.1,
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow!r} (expected one of {', '.join(OVERFLOW_POLICIES)})")
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.overflow = overflow
+        self.sample_rate = sample_rate
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._buf: Deque[Dict[str, Any]] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def submit(self, entry: Dict[str, Any]) -> bool:
+        """Queue one occurrence; returns False if the overflow policy dropped it."""
+        self.submitted += 1
+        if self.overflow == "sample" and len(self._buf) >= self.maxsize // 2:
+            if random.random() >= self.sample_rate:
+                self.dropped += 1
+                return False
+        if len(self._buf) >= self.maxsize:
+            if self.overflow != "drop_oldest":
+                self.dropped += 1
+                return False
+            self._buf.popleft()
+            self.dropped += 1
+        self._buf.append(entry)
+        if self._wakeup is not None and len(self._buf) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": len(self._buf),
+            "maxsize": self.maxsize,
+            "overflow": self.overflow,
+            "submitted": self.submitted,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="error-log-buffer")
+
+    async def stop(self) -> None:
+        """Write everything still queued, then stop the drain task."""
+        if not self.running:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+    async def flush(self) -> None:
+        """Write everything queued so far."""
+        while self._buf:
+            batch: List[Dict[str, Any]] = [self._buf.popleft() for _ in range(min(self.batch_size, len(self._buf)))]
+            await self._write(batch)
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+        await self.flush()
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        SessionLocal = get_sessionmaker()
+        try:
+            async with SessionLocal() as db:
+                await record_errors(db, batch)
+                await db.commit()
+        except Exception as e:
+            # Never retry: a database that can't take error logs shouldn't get more of them
+            self.failed += len(batch)
+            logger.error("error_log_write_failed", entries=len(batch), error=repr(e))
+            return
+        self.written += len(batch)
+
+
+error_buffer = ErrorLogBuffer(
+    maxsize=settings.ERROR_LOG_QUEUE_SIZE,
+    batch_size=settings.ERROR_LOG_BATCH_SIZE,
+    flush_interval_ms=settings.ERROR_LOG_FLUSH_INTERVAL_MS,
+    overflow=settings.ERROR_LOG_OVERFLOW,
+    sample_rate=settings.ERROR_LOG_SAMPLE_RATE,
+)
@@ -1,9 +1,14 @@
+from datetime import datetime
 from fastapi import Request
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.fingerprint import exception_type, fingerprint_exception
+from app.db.error_groups import record_errors
 from app.db.session import get_sessionmaker
-from app.db.models import ApplicationLogger
+from app.db.writer import run_write
 from app.api.deps import get_current_user_optional  # a variant that returns None if no user
+from app.core.logging import logger
+from app.middleware.error_buffer import error_buffer
 import traceback
 
 async def error_logger_middleware(request: Request, call_next):
@@ -11,23 +16,38 @@ async def error_logger_middleware(request: Request, call_next):
         return await call_next(request)
     except Exception as e:
         tb = "".join(traceback.format_exception(type(e), e, e.__traceback__))
+        # Group by route template (/accounts/{account_id}), not by the concrete path
+        route = request.scope.get("route")
+        location = f"{request.method} {getattr(route, 'path', request.url.path)}"
         SessionLocal = get_sessionmaker()
         async with SessionLocal() as db:  # manual session since we're outside DI
             user = None
             try:
-                user = await get_current_user_optional(request)
+                # Reuses the request's auth context: the token is never decoded twice
+                user = await get_current_user_optional(request, db)
             except Exception:
                 pass
 
-            log = ApplicationLogger(
-                user_id=user.id if user else None,
-                error_code=getattr(e, "status_code", 500),
-                message=tb,
-                location=f"{request.method} {request.url.path}",
-            )
-            db.add(log)
-            await db.commit()
+            entry = {
+                "fingerprint": fingerprint_exception(e, location),
+                "exception_type": exception_type(e),
+                "user_id": user.id if user else None,
+                "error_code": getattr(e, "status_code", 500),
+                "message": str(e)[:1000],
+                "traceback": tb,
+                "location": location,
+                "created_at": datetime.utcnow(),
+            }
+            if error_buffer.running:
+                # Picked up by the next bulk upsert; the failing request doesn't wait on the DB
+                error_buffer.submit(entry)
+            else:
+                async def _record(session: AsyncSession) -> None:
+                    await record_errors(session, [entry])
 
+                await run_write(db, _record)
+
+        logger.error("unhandled_exception", location=location, user_id=user.id if user else None, error=repr(e))
         return JSONResponse(
             status_code=500,
             content={"detail": "An internal error occurred. It has been logged."},
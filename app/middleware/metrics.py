@@ -0,0 +1,69 @@
+import time
+from app.core.metrics import (
+    http_db_queries,
+    http_db_time,
+    http_request_duration,
+    http_requests,
+    http_requests_in_flight,
+    http_response_size,
+)
+from app.db.query_stats import QUERY_COUNT_HEADER, QUERY_TIME_HEADER, QueryStats, current_query_stats
+
+# Label for requests no route matched, so 404 scans can't blow up label cardinality
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording latency, status, response size and in-flight
+    requests per route template (`/api/v1/accounts/{account_id}`, not the raw URL).
+    The router stores the matched route in the scope, so the label costs nothing
+    to compute.
+
+    It also opens the request's QueryStats: the engine hooks in app.db.query_stats
+    add every statement to it, and the totals so far go out as X-DB-Query-Count /
+    X-DB-Time-Ms headers when the response starts.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        size = 0
+        queries = QueryStats()
+        token = current_query_stats.set(queries)
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (QUERY_COUNT_HEADER.lower().encode(), str(queries.count).encode()),
+                    (QUERY_TIME_HEADER.lower().encode(), f"{queries.seconds * 1000:.2f}".encode()),
+                ]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        http_requests_in_flight.inc(method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_query_stats.reset(token)
+            http_requests_in_flight.dec(method)
+            route = scope.get("route")
+            path = getattr(route, "path", None) or UNMATCHED_ROUTE
+            http_requests.inc(method, path, str(status))
+            http_request_duration.observe(elapsed, method, path)
+            http_response_size.observe(size, method, path)
+            http_db_queries.observe(queries.count, method, path)
+            http_db_time.observe(queries.seconds, method, path)
@@ -0,0 +1,58 @@
+import random
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.timing import SERVER_TIMING_HEADER, ServerTiming, current_timing
+from app.db.query_stats import current_query_stats
+from app.middleware.metrics import UNMATCHED_ROUTE
+
+
+class ServerTimingMiddleware:
+    """
+    For SERVER_TIMING_SAMPLE_RATE of requests, collects the phase spans (auth, user,
+    endpoint, serialize), adds the SQL time from the request's QueryStats as "db"
+    and reports them in a `Server-Timing` header plus a "server_timing" log event.
+    "db" overlaps the other phases; "total" runs up to the start of the response.
+
+    Sits inside MetricsMiddleware, which opens the QueryStats it reads.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or random.random() >= settings.SERVER_TIMING_SAMPLE_RATE:
+            await self.app(scope, receive, send)
+            return
+
+        timing = ServerTiming()
+        token = current_timing.set(timing)
+        status = 500
+        phases = {}
+
+        async def send_wrapper(message):
+            nonlocal status, phases
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                queries = current_query_stats.get()
+                phases = {**timing.spans}
+                if queries is not None:
+                    phases["db"] = queries.seconds
+                phases["total"] = timing.elapsed()
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (SERVER_TIMING_HEADER.lower().encode(), timing.header(**phases).encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_timing.reset(token)
+            route = scope.get("route")
+            logger.info(
+                "server_timing",
+                method=scope["method"],
+                route=getattr(route, "path", None) or UNMATCHED_ROUTE,
+                status=status,
+                **{f"{name}_ms": round(seconds * 1000, 2) for name, seconds in (phases or timing.spans).items()},
+            )
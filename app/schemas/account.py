@@ -14,3 +14,8 @@ class AccountRead(BaseModel):
 
     class Config:
         from_attributes = True
+
+class AccountBalanceRead(BaseModel):
+    account_id: int
+    balance: int  # cents
+    updated_at: datetime | None = None
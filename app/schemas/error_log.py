@@ -11,3 +11,23 @@ class ErrorLogRead(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ErrorGroupSummary(BaseModel):
+    id: int
+    fingerprint: str
+    exception_type: str
+    location: str | None
+    error_code: int | None
+    message: str | None
+    count: int
+    first_seen: datetime
+    last_seen: datetime
+    last_user_id: int | None
+
+    class Config:
+        from_attributes = True
+
+
+class ErrorGroupRead(ErrorGroupSummary):
+    traceback: str
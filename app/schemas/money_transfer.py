@@ -16,4 +16,28 @@ class MoneyTransferRead(BaseModel):
     amount: int
     description: Optional[str]
     created_at: datetime
-    transactions: list[TransactionRead]
\ No newline at end of file
+    transactions: list[TransactionRead]
+
+class MoneyTransferLeg(BaseModel):
+    recipient_account_id: int
+    amount: int = Field(..., gt=0, description="Amount in cents")
+    description: str | None = None
+    sender_account_id: int | None = Field(None, description="Defaults to the batch's sender_account_id")
+
+class MoneyTransferBatchCreate(BaseModel):
+    sender_account_id: int | None = None  # e.g. the payroll funding account
+    description: str | None = None        # used by legs without their own description
+    transfers: list[MoneyTransferLeg] = Field(..., min_length=1)
+
+class MoneyTransferLegRead(BaseModel):
+    index: int
+    transfer_id: str
+    sender_account_id: int
+    recipient_account_id: int
+    amount: int
+
+class MoneyTransferBatchRead(BaseModel):
+    status: str
+    created_at: datetime
+    total_amount: int
+    transfers: list[MoneyTransferLegRead]
@@ -9,12 +9,14 @@ class StatementRequest(BaseModel):
 class StatementTransaction(BaseModel):
     id: int
     account_id: int
-    description: str
+    description: str | None = None
     amount: int
     type: str
     created_at: datetime
 
 class StatementResponse(BaseModel):
     account_id: int
-    balance: int
+    balance: int  # net movement inside the window
+    opening_balance: int  # balance at start_date 00:00
+    closing_balance: int  # balance at the end of end_date
     transactions: List[StatementTransaction]
@@ -18,3 +18,16 @@ class TransactionRead(BaseModel):
 
     class Config:
         from_attributes = True
+
+class TransactionBatchCreate(BaseModel):
+    items: list[TransactionCreate] = Field(..., min_length=1)
+
+class TransactionBatchItemResult(BaseModel):
+    index: int                # position in the submitted `items`
+    id: int | None = None     # set when the row was inserted
+    error: str | None = None  # set when it was rejected
+
+class TransactionBatchResult(BaseModel):
+    inserted: int
+    failed: int
+    results: list[TransactionBatchItemResult]
@@ -0,0 +1,33 @@
+"""
+Maintain daily_balance_snapshots, the checkpoints statements use for opening balances.
+
+    python -m app.scripts.balance_snapshots                    # roll up yesterday (run nightly)
+    python -m app.scripts.balance_snapshots --day 2025-09-30   # roll up one day
+    python -m app.scripts.balance_snapshots --backfill         # rebuild every day before today
+"""
+import argparse
+import asyncio
+from datetime import date, datetime, timedelta
+from app.db.balances import backfill_snapshots, rollup_day
+from app.db.session import get_sessionmaker
+
+async def main(day: date | None, backfill: bool, chunk_size: int) -> None:
+    SessionLocal = get_sessionmaker()
+    async with SessionLocal() as db:
+        if backfill:
+            written = await backfill_snapshots(db, chunk_size=chunk_size)
+            print(f"[snapshots] backfilled {written} checkpoints")
+            return
+        day = day or (datetime.utcnow().date() - timedelta(days=1))
+        written = await rollup_day(db, day, chunk_size=chunk_size)
+        print(f"[snapshots] {day}: wrote {written} checkpoints")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Daily balance checkpoints")
+    parser.add_argument("--day", type=date.fromisoformat, help="UTC day to roll up (default: yesterday)")
+    parser.add_argument("--backfill", action="store_true", help="rebuild all checkpoints from the ledger")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="accounts per chunk")
+    args = parser.parse_args()
+    if args.day is not None and args.day >= datetime.utcnow().date():
+        parser.error("--day must be before today (UTC); a day can only be rolled up once it is over")
+    asyncio.run(main(args.day, args.backfill, args.chunk_size))
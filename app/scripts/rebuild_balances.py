@@ -0,0 +1,25 @@
+"""
+Recompute account_balances from the transactions ledger.
+
+    python -m app.scripts.rebuild_balances            # fix any drift
+    python -m app.scripts.rebuild_balances --verify   # report only, exit 1 on drift
+"""
+import argparse
+import asyncio
+import sys
+from app.db.balances import rebuild_balances
+from app.db.session import get_sessionmaker
+
+async def main(verify: bool, chunk_size: int) -> int:
+    SessionLocal = get_sessionmaker()
+    async with SessionLocal() as db:
+        result = await rebuild_balances(db, chunk_size=chunk_size, fix=not verify)
+    print(f"[balances] checked={result['checked']} mismatched={result['mismatched']} fixed={result['fixed']}")
+    return 1 if verify and result["mismatched"] else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild or verify materialized account balances")
+    parser.add_argument("--verify", action="store_true", help="only compare, do not write")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="accounts per chunk")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.verify, args.chunk_size)))
@@ -0,0 +1,6 @@
+"""
+Performance benchmarks for the Banksy backend.
+
+These are scripts, not tests: run them with `python -m benchmarks.<name>`
+from the backend root. Nothing here is imported by the app.
+"""
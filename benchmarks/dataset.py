@@ -0,0 +1,201 @@
+"""
+Deterministic synthetic dataset at a configurable scale.
+
+    python -m benchmarks.dataset --db /tmp/banksy-bench.db --users 10000 --accounts 50000 --transactions 50000000
+
+The same --seed and sizes always produce the same rows: ids are assigned here
+rather than by the database, and every random choice comes from one seeded RNG.
+Rows go in through bulk Core inserts (executemany), `--batch-size` per
+transaction, so memory stays flat at any scale. Each account gets a PRIMARY
+holder and one card; account_balances is filled in to match the ledger.
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+
+os.environ.setdefault("CLERK_JWKS_URL", "https://stub-clerk.invalid/.well-known/jwks.json")
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine  # noqa: E402
+
+from app.db.models import Account, AccountBalance, AccountHolder, Base, Card, Transaction, User  # noqa: E402
+from app.db.session import install_sqlite_pragmas, sqlite_pragmas  # noqa: E402
+
+# Ledger history ends here, so a dataset built today matches one built next year
+EPOCH_END = datetime(2025, 1, 1)
+DESCRIPTIONS = ("Grocery store", "Payroll", "Coffee", "Rent", "Utilities", "Transfer", "Restaurant", "Fuel")
+CARD_TYPES = ("Debit", "Credit", "Virtual")
+
+
+@dataclass
+class DatasetSpec:
+    users: int = 100
+    accounts: int = 500
+    transactions: int = 100_000
+    days: int = 365
+    seed: int = 42
+    batch_size: int = 10_000
+
+    @property
+    def start(self) -> datetime:
+        return EPOCH_END - timedelta(days=self.days)
+
+
+def clerk_user_id(user_id: int) -> str:
+    """The `sub` a benchmark token carries for user `user_id`."""
+    return f"bench_user_{user_id}"
+
+
+def account_owner(spec: DatasetSpec, account_id: int) -> int:
+    # Round-robin, so every user has accounts // users (+1) accounts
+    return (account_id - 1) % spec.users + 1
+
+
+def _chunks(rows: Iterator[dict], size: int) -> Iterator[List[dict]]:
+    chunk: List[dict] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _users(spec: DatasetSpec) -> Iterator[dict]:
+    for i in range(1, spec.users + 1):
+        yield {
+            "id": i,
+            "clerk_user_id": clerk_user_id(i),
+            "email": f"user{i}@bench.invalid",
+            "first_name": "Bench",
+            "last_name": f"User {i}",
+            "created_at": spec.start,
+            "updated_at": spec.start,
+        }
+
+
+def _accounts(spec: DatasetSpec) -> Iterator[dict]:
+    for i in range(1, spec.accounts + 1):
+        yield {
+            "id": i, "user_id": account_owner(spec, i), "name": f"Account {i}", "currency": "USD",
+            "created_at": spec.start, "updated_at": spec.start,
+        }
+
+
+def _holders(spec: DatasetSpec) -> Iterator[dict]:
+    for i in range(1, spec.accounts + 1):
+        yield {"id": i, "user_id": account_owner(spec, i), "account_id": i, "holder_type": "PRIMARY"}
+
+
+def _cards(spec: DatasetSpec, rng: random.Random) -> Iterator[dict]:
+    for i in range(1, spec.accounts + 1):
+        yield {
+            "id": i, "account_id": i, "card_number_last4": f"{rng.randrange(10_000):04d}",
+            "card_type": rng.choice(CARD_TYPES), "expiration_month": rng.randint(1, 12),
+            "expiration_year": EPOCH_END.year + rng.randint(1, 4), "status": "Active",
+        }
+
+
+def _transactions(spec: DatasetSpec, rng: random.Random, balances: Dict[int, int]) -> Iterator[dict]:
+    # Timestamps grow with the id, as they do in production; the ledger spans `days`
+    step = timedelta(days=spec.days) / max(spec.transactions, 1)
+    for i in range(1, spec.transactions + 1):
+        account_id = rng.randint(1, spec.accounts)
+        tx_type = "CREDIT" if rng.random() < 0.4 else "DEBIT"
+        amount = rng.randint(100, 50_000)
+        balances[account_id] = balances.get(account_id, 0) + (amount if tx_type == "CREDIT" else -amount)
+        yield {
+            "id": i,
+            "account_id": account_id,
+            "amount": amount,
+            "type": tx_type,
+            "description": f"{rng.choice(DESCRIPTIONS)} #{i}",
+            "created_at": spec.start + step * (i - 1),
+            "transfer_id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+        }
+
+
+async def _load(engine: AsyncEngine, table, rows: Iterator[dict], batch_size: int) -> dict:
+    n = 0
+    t0 = time.perf_counter()
+    for chunk in _chunks(rows, batch_size):
+        async with engine.begin() as conn:
+            await conn.execute(insert(table), chunk)
+        n += len(chunk)
+    elapsed = time.perf_counter() - t0
+    print(f"[dataset] {table.name:<16} {n:>12,} rows in {elapsed:8.2f}s ({n / max(elapsed, 1e-9):>12,.0f} rows/s)")
+    return {"rows": n, "seconds": elapsed}
+
+
+async def build_dataset(engine: AsyncEngine, spec: DatasetSpec) -> Dict[str, dict]:
+    """Drop and recreate the schema on `engine`, then load `spec`. Returns per-table load stats."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    rng = random.Random(spec.seed)
+    balances: Dict[int, int] = {}
+    stats = {
+        "users": await _load(engine, User.__table__, _users(spec), spec.batch_size),
+        "accounts": await _load(engine, Account.__table__, _accounts(spec), spec.batch_size),
+        "account_holders": await _load(engine, AccountHolder.__table__, _holders(spec), spec.batch_size),
+        "cards": await _load(engine, Card.__table__, _cards(spec, rng), spec.batch_size),
+        "transactions": await _load(engine, Transaction.__table__, _transactions(spec, rng, balances), spec.batch_size),
+    }
+    stats["account_balances"] = await _load(
+        engine,
+        AccountBalance.__table__,
+        ({"account_id": a, "balance": b, "updated_at": EPOCH_END} for a, b in sorted(balances.items())),
+        spec.batch_size,
+    )
+    return stats
+
+
+def open_engine(path: str) -> AsyncEngine:
+    """Engine on the SQLite file at `path` with the app's "fast" PRAGMA profile."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    install_sqlite_pragmas(engine, sqlite_pragmas("fast"))
+    return engine
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = DatasetSpec()
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--accounts", type=int, default=defaults.accounts)
+    parser.add_argument("--transactions", type=int, default=defaults.transactions)
+    parser.add_argument("--days", type=int, default=defaults.days, help="ledger history length")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--batch-size", type=int, default=defaults.batch_size, help="rows per insert transaction")
+
+
+def spec_from_args(args) -> DatasetSpec:
+    return DatasetSpec(
+        users=args.users, accounts=args.accounts, transactions=args.transactions,
+        days=args.days, seed=args.seed, batch_size=args.batch_size,
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", required=True, help="SQLite file to (re)create")
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+
+    spec = spec_from_args(args)
+    if spec.accounts < spec.users:
+        parser.error("--accounts must be at least --users so every user owns an account")
+    print(f"[dataset] {asdict(spec)} -> {args.db}")
+    engine = open_engine(args.db)
+    await build_dataset(engine, spec)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,208 @@
+"""
+Per-endpoint micro-benchmarks, in-process through httpx.ASGITransport.
+
+    python -m benchmarks.endpoints --requests 500 --concurrency 8 --json results.json
+    python -m benchmarks.endpoints --db /tmp/banksy-bench.db --compare baseline.json
+
+Without --db a small dataset (see benchmarks.dataset) is built in a throwaway
+SQLite file first; with --db an existing dataset file is reused as-is.
+
+JWT verification is stubbed so that a token's `sub` is taken on trust. Every
+other part of a request runs as in production: the user lookup and its cache,
+middleware, queries and serialization. Requests pick users and accounts from a
+seeded RNG, so two runs on the same dataset send the same requests.
+
+Results (ops/sec and p50/p95/p99 per endpoint) can be saved with --json.
+`--compare` prints the change against an earlier results file.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+os.environ.setdefault("CLERK_JWKS_URL", "https://stub-clerk.invalid/.well-known/jwks.json")
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from sqlalchemy import func, select  # noqa: E402
+
+from app.api import deps  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.db.models import Account, Transaction, User  # noqa: E402
+from app.db.session import get_engine  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks.dataset import (  # noqa: E402
+    EPOCH_END, DatasetSpec, account_owner, add_spec_arguments, build_dataset, clerk_user_id, open_engine, spec_from_args,
+)
+from benchmarks.stats import format_row, summarize  # noqa: E402
+
+# (method, url, json body) for one request, drawn for a given user/account
+Request = Tuple[str, str, Optional[dict]]
+Scenario = Callable[[random.Random, int, int, DatasetSpec], Request]
+
+
+def _statement_window(rng: random.Random, spec: DatasetSpec, days: int) -> Tuple[str, str]:
+    start = spec.start + timedelta(days=rng.randrange(max(spec.days - days, 1)))
+    return start.date().isoformat(), (start + timedelta(days=days - 1)).date().isoformat()
+
+
+def _statement(rng, user_id, account_id, spec) -> Request:
+    start, end = _statement_window(rng, spec, 7)
+    return "POST", "/api/v1/statements", {"start_date": start, "end_date": end}
+
+
+def _export(rng, user_id, account_id, spec) -> Request:
+    start, end = _statement_window(rng, spec, 1)
+    return "GET", f"/api/v1/statements/export?start_date={start}&end_date={end}&account_id={account_id}", None
+
+
+def _create_transaction(rng, user_id, account_id, spec) -> Request:
+    body = {"account_id": account_id, "amount": rng.randint(100, 5_000), "type": "CREDIT", "description": "bench"}
+    return "POST", "/api/v1/transactions", body
+
+
+# Reads first, then writes, so the writes don't change what the reads see
+SCENARIOS: Dict[str, Scenario] = {
+    "GET /users/me": lambda rng, u, a, spec: ("GET", "/api/v1/users/me", None),
+    "GET /accounts": lambda rng, u, a, spec: ("GET", "/api/v1/accounts", None),
+    "GET /accounts/{id}": lambda rng, u, a, spec: ("GET", f"/api/v1/accounts/{a}", None),
+    "GET /accounts/{id}/balance": lambda rng, u, a, spec: ("GET", f"/api/v1/accounts/{a}/balance", None),
+    "GET /transactions": lambda rng, u, a, spec: ("GET", f"/api/v1/transactions?account_id={a}&limit=50", None),
+    "GET /cards": lambda rng, u, a, spec: ("GET", "/api/v1/cards", None),
+    "GET /account-holders": lambda rng, u, a, spec: ("GET", "/api/v1/account-holders", None),
+    "POST /statements": _statement,
+    "GET /statements/export": _export,
+    "POST /transactions": _create_transaction,
+}
+
+
+async def _stub_verify_jwt(token: str) -> dict:
+    return {"sub": token}
+
+
+async def bench_scenario(client, name: str, scenario: Scenario, spec: DatasetSpec, args) -> dict:
+    rng = random.Random(f"{args.seed}:{name}")
+
+    def draw() -> Tuple[Request, str]:
+        account_id = rng.randint(1, spec.accounts)
+        user_id = account_owner(spec, account_id)
+        return scenario(rng, user_id, account_id, spec), clerk_user_id(user_id)
+
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(args.warmup + args.requests))
+
+    async def worker():
+        nonlocal errors
+        for i in remaining:
+            (method, url, body), token = draw()
+            t0 = time.perf_counter()
+            r = await client.request(method, url, json=body, headers={"Authorization": f"Bearer {token}"})
+            elapsed = time.perf_counter() - t0
+            if r.status_code >= 400:
+                errors += 1
+                if errors == 1:
+                    print(f"[bench] {name}: {r.status_code} {r.text[:200]}")
+            if i >= args.warmup:
+                latencies.append(elapsed)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    # Warmup requests are inside the wall clock, so rate them on the measured ones only
+    elapsed = (time.perf_counter() - t0) * args.requests / (args.warmup + args.requests)
+    return {**summarize(latencies, elapsed), "errors": errors}
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: dict, current: dict) -> None:
+    print(f"\n{'vs ' + str(baseline['meta'].get('git_revision')):<28} {'ops/s':>10} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for name, now in current["results"].items():
+        before = baseline["results"].get(name)
+        if not before:
+            continue
+
+        def delta(key: str) -> str:
+            return f"{(now[key] / before[key] - 1) * 100:+7.1f}%" if before.get(key) else f"{'n/a':>8}"
+
+        print(f"{name:<28} {delta('ops_per_sec'):>10} {delta('p50_ms'):>8} {delta('p95_ms'):>8} {delta('p99_ms'):>8}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", help="existing dataset file; built from the size flags below when omitted")
+    add_spec_arguments(parser)
+    parser.add_argument("--requests", type=int, default=500, help="measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--only", help="comma-separated scenario names (default: all)")
+    parser.add_argument("--json", dest="json_out", help="write results to this file")
+    parser.add_argument("--compare", help="earlier --json output to compare against")
+    args = parser.parse_args()
+
+    spec = spec_from_args(args)
+    path = args.db
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(prefix="banksy-bench-"), "endpoints.db")
+        engine = open_engine(path)
+        await build_dataset(engine, spec)
+        await engine.dispose()
+    else:
+        # Sizes come from the file itself, so requests only hit rows that exist
+        engine = open_engine(path)
+        async with engine.connect() as conn:
+            spec.users = await conn.scalar(select(func.count()).select_from(User))
+            spec.accounts = await conn.scalar(select(func.count()).select_from(Account))
+            spec.transactions = await conn.scalar(select(func.count()).select_from(Transaction))
+            first = await conn.scalar(select(func.min(Transaction.created_at)))
+            if first is not None:
+                spec.days = max((EPOCH_END - first).days, 1)
+        await engine.dispose()
+
+    # The app's engines are created on first use, so they pick this up
+    settings.DATABASE_URL = f"sqlite+aiosqlite:///{path}"
+
+    deps.verify_jwt = _stub_verify_jwt
+
+    names = args.only.split(",") if args.only else list(SCENARIOS)
+    results = {}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        for name in names:
+            results[name] = await bench_scenario(client, name, SCENARIOS[name], spec, args)
+            print(format_row(name, results[name]) + (f" errors={results[name]['errors']}" if results[name]["errors"] else ""))
+    await get_engine().dispose()
+
+    report = {
+        "meta": {
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "dataset": {**vars(spec), "path": path},
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+        },
+        "results": results,
+    }
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
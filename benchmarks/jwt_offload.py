@@ -0,0 +1,122 @@
+"""
+p99 latency of cheap requests during a JWT verification burst, with the RSA
+check inline on the event loop vs offloaded to a thread/process pool.
+
+    python -m benchmarks.jwt_offload --tokens 2000 --concurrency 64
+
+The workload runs in-process: `--concurrency` coroutines verify distinct RS256
+tokens (the verified-token cache is disabled so every call pays the RSA cost)
+while a prober keeps hitting `/api/v1/health` through httpx's ASGI transport.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+os.environ.setdefault("CLERK_JWKS_URL", "https://stub-clerk.invalid/.well-known/jwks.json")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import rsa  # noqa: E402
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from jose import jwk, jwt  # noqa: E402
+
+from app.core import security  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks.stats import format_row, summarize  # noqa: E402
+
+KID = "bench-kid"
+
+
+def make_keys():
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public_pem = private.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    public_jwk = jwk.construct(public_pem, "RS256").to_dict()
+    public_jwk.update({"kid": KID, "alg": "RS256"})
+    return private_pem, {"keys": [public_jwk]}
+
+
+async def run_mode(mode: str, tokens: list[str], concurrency: int, workers: int) -> dict:
+    security.jwt_verifier = security.JWTVerifier(mode, workers=workers)
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    for t in tokens:
+        queue.put_nowait(t)
+
+    verify_latencies: list[float] = []
+    health_latencies: list[float] = []
+    done = asyncio.Event()
+
+    async def verifier():
+        while True:
+            try:
+                token = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            t0 = time.perf_counter()
+            await security.verify_jwt(token)
+            verify_latencies.append(time.perf_counter() - t0)
+
+    async def prober(client: AsyncClient):
+        while not done.is_set():
+            t0 = time.perf_counter()
+            r = await client.get("/api/v1/health")
+            health_latencies.append(time.perf_counter() - t0)
+            assert r.status_code == 200
+            await asyncio.sleep(0.001)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        await client.get("/api/v1/health")  # warm up routing
+        probe = asyncio.create_task(prober(client))
+        t0 = time.perf_counter()
+        await asyncio.gather(*(verifier() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - t0
+        done.set()
+        await probe
+
+    security.jwt_verifier.shutdown()
+    return {
+        "verify": summarize(verify_latencies, elapsed),
+        "health": summarize(health_latencies),
+        "batches": security.jwt_verifier.batches,
+        "jobs": security.jwt_verifier.jobs,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--modes", default="inline,thread,process")
+    parser.add_argument("--json", dest="json_out", help="write results to this file")
+    args = parser.parse_args()
+
+    private_pem, jwks = make_keys()
+    security.jwks_manager._install(jwks)
+    security._TOKEN_CACHE.maxsize = 0  # every verification pays for the signature check
+
+    exp = int(time.time()) + 3600
+    tokens = [
+        jwt.encode({"sub": f"user_{i}", "exp": exp}, private_pem, algorithm="RS256", headers={"kid": KID})
+        for i in range(args.tokens)
+    ]
+
+    results = {}
+    for mode in args.modes.split(","):
+        results[mode] = await run_mode(mode, tokens, args.concurrency, args.workers)
+        print(format_row(f"{mode}: verify_jwt", results[mode]["verify"]))
+        print(format_row(f"{mode}: GET /health", results[mode]["health"]))
+
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,438 @@
+"""
+Mixed-workload load generator.
+
+    python -m benchmarks.loadgen benchmarks/scenarios/mixed.json
+    python -m benchmarks.loadgen benchmarks/scenarios/mixed.json --mode open --rate 400 --duration 60
+    python -m benchmarks.loadgen benchmarks/scenarios/mixed.json --url http://127.0.0.1:8000 --jwks-port 8765
+
+A scenario file (JSON) gives the traffic mix as weighted operations from OPERATIONS,
+plus defaults for everything the flags override.
+
+Modes:
+  closed  `concurrency` virtual users, each sending its next request once the
+          previous one finished (plus `think_time_ms`). Throughput adapts to the
+          server, so this finds the saturation point.
+  open    Requests arrive at `rate_per_s` (Poisson) whatever the server does.
+          Latency is measured from the scheduled arrival, so queueing delay is
+          counted instead of hidden. At most `max_in_flight` requests are
+          outstanding; arrivals beyond that are counted as dropped.
+
+Targets:
+  in-process (default)  The app is driven through httpx.ASGITransport with its
+          lifespan running, on a throwaway SQLite file (or --db).
+  --url   A running server. With --jwks-port the generator serves its signing key
+          at http://127.0.0.1:<port>/jwks.json; start the server with
+          CLERK_JWKS_URL pointing there.
+
+Authentication uses real RS256 tokens signed by a key generated for the run. The
+in-process app gets that key installed as its JWKS, so verification runs as in
+production. Users and their accounts are created through the API before the run,
+so both targets start from the same state.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+import uuid
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+os.environ.setdefault("CLERK_JWKS_URL", "https://stub-clerk.invalid/.well-known/jwks.json")
+
+import httpx  # noqa: E402
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import rsa  # noqa: E402
+from jose import jwk, jwt  # noqa: E402
+
+from benchmarks.stats import format_row, histogram, summarize  # noqa: E402
+
+# (method, url, json body)
+Request = Tuple[str, str, Optional[dict]]
+# Route that only exists in-process, for error bursts through the error logger
+ERROR_ROUTE = "/__loadgen/error"
+
+
+@dataclass
+class VirtualUser:
+    token: str
+    accounts: List[int]
+
+
+@dataclass
+class State:
+    users: List[VirtualUser]
+    all_accounts: List[int]
+
+
+# ---------------------------------------------------------------------------
+# Operations: (rng, user, state, params) -> requests to send together
+# ---------------------------------------------------------------------------
+
+def _window(rng: random.Random, days: int) -> Tuple[str, str]:
+    end = date.today() - timedelta(days=rng.randrange(3))
+    return (end - timedelta(days=days - 1)).isoformat(), end.isoformat()
+
+
+def op_list_transactions(rng, user, state, params) -> List[Request]:
+    return [("GET", f"/api/v1/transactions?account_id={rng.choice(user.accounts)}&limit={params.get('limit', 50)}", None)]
+
+
+def op_get_balance(rng, user, state, params) -> List[Request]:
+    return [("GET", f"/api/v1/accounts/{rng.choice(user.accounts)}/balance", None)]
+
+
+def op_list_accounts(rng, user, state, params) -> List[Request]:
+    return [("GET", "/api/v1/accounts", None)]
+
+
+def op_transfer(rng, user, state, params) -> List[Request]:
+    sender = rng.choice(user.accounts)
+    recipient = rng.choice(state.all_accounts)
+    body = {"sender_account_id": sender, "recipient_account_id": recipient, "amount": rng.randint(100, 10_000)}
+    return [("POST", "/api/v1/money-transfers", body)]
+
+
+def op_statement(rng, user, state, params) -> List[Request]:
+    start, end = _window(rng, params.get("days", 30))
+    return [("POST", "/api/v1/statements", {"start_date": start, "end_date": end})]
+
+
+def op_create_card(rng, user, state, params) -> List[Request]:
+    body = {
+        "account_id": rng.choice(user.accounts),
+        "card_number_last4": f"{rng.randrange(10_000):04d}",
+        "card_type": rng.choice(("Debit", "Credit", "Virtual")),
+        "expiration_month": rng.randint(1, 12),
+        "expiration_year": date.today().year + rng.randint(1, 4),
+    }
+    return [("POST", "/api/v1/cards", body)]
+
+
+def op_error_burst(rng, user, state, params) -> List[Request]:
+    # `burst` failing requests at once, like a bad deploy hitting one route
+    return [("GET", f"{ERROR_ROUTE}/{rng.randrange(3)}", None)] * params.get("burst", 10)
+
+
+OPERATIONS: Dict[str, Callable[..., List[Request]]] = {
+    "list_transactions": op_list_transactions,
+    "get_balance": op_get_balance,
+    "list_accounts": op_list_accounts,
+    "transfer": op_transfer,
+    "statement": op_statement,
+    "create_card": op_create_card,
+    "error_burst": op_error_burst,
+}
+# Operations whose failure status is the point of the exercise
+EXPECTED_STATUS = {"error_burst": 500}
+
+
+# ---------------------------------------------------------------------------
+# Auth
+# ---------------------------------------------------------------------------
+
+class SigningKey:
+    """An RS256 key generated for this run, plus the JWKS that publishes it."""
+
+    def __init__(self, issuer: Optional[str] = None, audience: Optional[str] = None):
+        private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.pem = private.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption(),
+        ).decode()
+        public_pem = private.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo,
+        ).decode()
+        # Fresh kid per run, so a long-running server refetches instead of using last run's key
+        self.kid = f"loadgen-{uuid.uuid4().hex[:12]}"
+        public_jwk = jwk.construct(public_pem, "RS256").to_dict()
+        public_jwk.update({"kid": self.kid, "alg": "RS256", "use": "sig"})
+        self.jwks = {"keys": [public_jwk]}
+        self.issuer = issuer
+        self.audience = audience
+
+    def token(self, sub: str, ttl_s: float) -> str:
+        claims = {"sub": sub, "exp": int(time.time() + ttl_s), "email_addresses": [f"{sub}@loadgen.invalid"]}
+        if self.issuer:
+            claims["iss"] = self.issuer
+        if self.audience:
+            claims["aud"] = self.audience
+        return jwt.encode(claims, self.pem, algorithm="RS256", headers={"kid": self.kid})
+
+
+async def serve_jwks(jwks: dict, port: int) -> asyncio.AbstractServer:
+    """Answer every HTTP request on `port` with `jwks`; just enough for the server's JWKS fetch."""
+    body = json.dumps(jwks).encode()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        await reader.readuntil(b"\r\n\r\n")
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+            + f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+            + body
+        )
+        await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", port)
+
+
+# ---------------------------------------------------------------------------
+# Targets
+# ---------------------------------------------------------------------------
+
+async def in_process_client(stack: AsyncExitStack, key: SigningKey, db_path: Optional[str]) -> httpx.AsyncClient:
+    from app.core.config import settings
+    from app.core.security import jwks_manager
+
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix="banksy-load-"), "load.db")
+    # Engines are created on first use, so set the URL before the app touches the DB
+    settings.DATABASE_URL = f"sqlite+aiosqlite:///{db_path}"
+    from app.main import app
+
+    @app.get(ERROR_ROUTE + "/{n}", include_in_schema=False)
+    async def _loadgen_error(n: int):
+        raise RuntimeError(f"loadgen error burst {n}")
+
+    jwks_manager._install(key.jwks)
+    jwks_manager._expires_at = float("inf")
+    await stack.enter_async_context(app.router.lifespan_context(app))
+    print(f"[loadgen] in-process app on {db_path}")
+    return await stack.enter_async_context(
+        httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadgen", timeout=60)
+    )
+
+
+async def setup_users(client: httpx.AsyncClient, key: SigningKey, scenario: dict, ttl_s: float) -> List[VirtualUser]:
+    """Create `users` users with `accounts_per_user` accounts each, seeded with some ledger rows."""
+    rng = random.Random(scenario["seed"])
+    run = uuid.uuid4().hex[:8]
+
+    async def create(i: int) -> VirtualUser:
+        token = key.token(f"loadgen_{run}_{i}", ttl_s)
+        headers = {"Authorization": f"Bearer {token}"}
+        accounts = []
+        for a in range(scenario["accounts_per_user"]):
+            r = await client.post("/api/v1/accounts", json={"name": f"Load {a}", "currency": "USD"}, headers=headers)
+            r.raise_for_status()
+            accounts.append(r.json()["id"])
+        seed_rows = scenario["seed_transactions"]
+        if seed_rows:
+            items = [
+                {"account_id": accounts[j % len(accounts)], "amount": rng.randint(100, 50_000),
+                 "type": "CREDIT" if j % 3 else "DEBIT", "description": f"seed {j}"}
+                for j in range(seed_rows)
+            ]
+            (await client.post("/api/v1/transactions/batch", json={"items": items}, headers=headers)).raise_for_status()
+        return VirtualUser(token, accounts)
+
+    users = []
+    for start in range(0, scenario["users"], 16):
+        users += await asyncio.gather(*(create(i) for i in range(start, min(start + 16, scenario["users"]))))
+    return users
+
+
+# ---------------------------------------------------------------------------
+# Drivers
+# ---------------------------------------------------------------------------
+
+@dataclass
+class OpStats:
+    latencies: List[float] = field(default_factory=list)
+    statuses: Dict[str, int] = field(default_factory=dict)
+    unexpected: int = 0
+
+
+class Recorder:
+    def __init__(self, measure_from: float):
+        self.measure_from = measure_from
+        self.ops: Dict[str, OpStats] = {}
+        self.dropped = 0
+
+    def record(self, op: str, scheduled: float, status: str, ok: bool) -> None:
+        if scheduled < self.measure_from:
+            return  # warmup
+        stats = self.ops.setdefault(op, OpStats())
+        stats.latencies.append(time.perf_counter() - scheduled)
+        stats.statuses[status] = stats.statuses.get(status, 0) + 1
+        if not ok:
+            stats.unexpected += 1
+
+
+def _picker(operations: List[dict]) -> Callable[[random.Random], dict]:
+    weights = [op["weight"] for op in operations]
+    return lambda rng: rng.choices(operations, weights)[0]
+
+
+async def _execute(client, recorder: Recorder, op: dict, user: VirtualUser, state: State, rng, scheduled: float):
+    name = op["op"]
+    requests = OPERATIONS[name](rng, user, state, op)
+    expected = EXPECTED_STATUS.get(name)
+    headers = {"Authorization": f"Bearer {user.token}"}
+
+    async def send(method: str, url: str, body: Optional[dict]):
+        try:
+            r = await client.request(method, url, json=body, headers=headers)
+            status = r.status_code
+            ok = status == expected if expected else status < 400
+            recorder.record(name, scheduled, str(status), ok)
+        except httpx.HTTPError as e:
+            recorder.record(name, scheduled, type(e).__name__, False)
+
+    await asyncio.gather(*(send(*req) for req in requests))
+
+
+async def run_closed(client, state: State, scenario: dict, recorder: Recorder, deadline: float) -> None:
+    pick = _picker(scenario["operations"])
+    think = scenario["think_time_ms"] / 1000
+
+    async def virtual_user(i: int):
+        rng = random.Random(f"{scenario['seed']}:vu:{i}")
+        user = state.users[i % len(state.users)]
+        while time.perf_counter() < deadline:
+            await _execute(client, recorder, pick(rng), user, state, rng, time.perf_counter())
+            if think:
+                await asyncio.sleep(rng.expovariate(1 / think))
+
+    await asyncio.gather(*(virtual_user(i) for i in range(scenario["concurrency"])))
+
+
+async def run_open(client, state: State, scenario: dict, recorder: Recorder, deadline: float) -> None:
+    pick = _picker(scenario["operations"])
+    rng = random.Random(f"{scenario['seed']}:open")
+    rate = scenario["rate_per_s"]
+    in_flight: set[asyncio.Task] = set()
+
+    next_at = time.perf_counter()
+    while next_at < deadline:
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(in_flight) >= scenario["max_in_flight"]:
+            recorder.dropped += 1
+        else:
+            user = rng.choice(state.users)
+            task = asyncio.create_task(_execute(client, recorder, pick(rng), user, state, random.Random(rng.random()), next_at))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        next_at += rng.expovariate(rate)
+    if in_flight:
+        await asyncio.gather(*in_flight)
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+SCENARIO_DEFAULTS = {
+    "mode": "closed",
+    "duration_s": 30,
+    "warmup_s": 3,
+    "concurrency": 32,
+    "think_time_ms": 0,
+    "rate_per_s": 100,
+    "max_in_flight": 1000,
+    "users": 50,
+    "accounts_per_user": 2,
+    "seed_transactions": 200,
+    "seed": 42,
+}
+
+
+def load_scenario(path: str, overrides: Dict[str, object]) -> dict:
+    with open(path) as f:
+        scenario = {**SCENARIO_DEFAULTS, **json.load(f)}
+    scenario.update({k: v for k, v in overrides.items() if v is not None})
+    if scenario["mode"] not in ("closed", "open"):
+        raise SystemExit(f"Unknown mode {scenario['mode']!r}; expected 'closed' or 'open'")
+    unknown = [op["op"] for op in scenario.get("operations", []) if op["op"] not in OPERATIONS]
+    if unknown or not scenario.get("operations"):
+        raise SystemExit(f"Unknown or missing operations {unknown}; available: {sorted(OPERATIONS)}")
+    return scenario
+
+
+def report(scenario: dict, recorder: Recorder, measured_s: float) -> dict:
+    ops = {}
+    for name, stats in sorted(recorder.ops.items()):
+        ops[name] = {
+            **summarize(stats.latencies, measured_s),
+            "statuses": stats.statuses,
+            "unexpected": stats.unexpected,
+            "histogram_ms": histogram(stats.latencies),
+        }
+        extra = f" unexpected={stats.unexpected}" if stats.unexpected else ""
+        print(format_row(name, ops[name]) + extra)
+    everything = [s for stats in recorder.ops.values() for s in stats.latencies]
+    total = summarize(everything, measured_s)
+    print(format_row("all", total))
+    if scenario["mode"] == "open":
+        print(f"[loadgen] target {scenario['rate_per_s']}/s, achieved {total.get('ops_per_sec', 0):.1f}/s, dropped {recorder.dropped}")
+    return {"scenario": scenario, "measured_s": measured_s, "dropped": recorder.dropped, "all": total, "operations": ops}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenario", help="scenario JSON file")
+    parser.add_argument("--mode", choices=("closed", "open"))
+    parser.add_argument("--concurrency", type=int, help="closed loop: virtual users")
+    parser.add_argument("--rate", dest="rate_per_s", type=float, help="open loop: arrivals per second")
+    parser.add_argument("--duration", dest="duration_s", type=float)
+    parser.add_argument("--warmup", dest="warmup_s", type=float)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--url", help="base URL of a running server (default: in-process)")
+    parser.add_argument("--db", help="in-process only: SQLite file to use instead of a throwaway one")
+    parser.add_argument("--jwks-port", type=int, help="with --url: serve the signing key's JWKS on this port")
+    parser.add_argument("--issuer", help="`iss` claim, if the server checks JWT_ISSUER")
+    parser.add_argument("--audience", help="`aud` claim, if the server checks JWT_AUDIENCE")
+    parser.add_argument("--json", dest="json_out", help="write results to this file")
+    args = parser.parse_args()
+
+    scenario = load_scenario(args.scenario, {
+        k: getattr(args, k) for k in ("mode", "concurrency", "rate_per_s", "duration_s", "warmup_s", "seed")
+    })
+    if args.url and any(op["op"] == "error_burst" for op in scenario["operations"]):
+        print("[loadgen] error_burst needs the in-process app; dropping it from the mix")
+        scenario["operations"] = [op for op in scenario["operations"] if op["op"] != "error_burst"]
+
+    ttl_s = scenario["warmup_s"] + scenario["duration_s"] + 3600
+    async with AsyncExitStack() as stack:
+        if args.url:
+            key = SigningKey(args.issuer, args.audience)
+            if args.jwks_port:
+                server = await serve_jwks(key.jwks, args.jwks_port)
+                stack.push_async_callback(server.wait_closed)
+                stack.callback(server.close)
+                print(f"[loadgen] JWKS at http://127.0.0.1:{args.jwks_port}/jwks.json")
+            limits = httpx.Limits(max_connections=max(scenario["concurrency"], 100))
+            client = await stack.enter_async_context(httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60))
+        else:
+            from app.core.config import settings
+            key = SigningKey(settings.JWT_ISSUER, settings.JWT_AUDIENCE)
+            client = await in_process_client(stack, key, args.db)
+
+        t0 = time.perf_counter()
+        users = await setup_users(client, key, scenario, ttl_s)
+        state = State(users, [a for u in users for a in u.accounts])
+        print(f"[loadgen] {len(users)} users / {len(state.all_accounts)} accounts ready in {time.perf_counter() - t0:.1f}s")
+
+        start = time.perf_counter()
+        measure_from = start + scenario["warmup_s"]
+        deadline = measure_from + scenario["duration_s"]
+        recorder = Recorder(measure_from)
+        driver: Callable[..., Awaitable[None]] = run_closed if scenario["mode"] == "closed" else run_open
+        print(f"[loadgen] {scenario['mode']} loop for {scenario['warmup_s']:g}s warmup + {scenario['duration_s']:g}s")
+        await driver(client, state, scenario, recorder, deadline)
+        # Open loop drains in-flight requests past the deadline; rate over the real window
+        results = report(scenario, recorder, max(time.perf_counter(), deadline) - measure_from)
+
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
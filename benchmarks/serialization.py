@@ -0,0 +1,150 @@
+"""
+Per-row cost of list responses: ORM objects through `response_model` (before)
+vs Core rows through app.api.serialization (after).
+
+    python -m benchmarks.serialization --rows 100,1000,10000 --repeat 20
+
+Both routes read the same transactions from a throwaway SQLite file and are
+called in-process through httpx.ASGITransport. The "encode only" lines time
+serialization alone, on rows already in memory.
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("CLERK_JWKS_URL", "https://stub-clerk.invalid/.well-known/jwks.json")
+
+from fastapi import FastAPI  # noqa: E402
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from app.api.serialization import columns, dump_rows, rows_response  # noqa: E402
+from app.db.models import Account, Base, Transaction, User  # noqa: E402
+from app.schemas.transaction import TransactionRead  # noqa: E402
+from benchmarks.stats import summarize  # noqa: E402
+
+
+async def setup(max_rows: int):
+    path = os.path.join(tempfile.mkdtemp(prefix="banksy-serialization-"), "bench.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User).values(id=1, clerk_user_id="bench"))
+        await conn.execute(insert(Account).values(id=1, user_id=1, name="Bench", currency="USD"))
+        t0 = datetime(2025, 1, 1)
+        await conn.execute(insert(Transaction), [
+            {"account_id": 1, "amount": 100 + i, "type": "CREDIT" if i % 3 else "DEBIT",
+             "description": f"Row {i}", "created_at": t0 + timedelta(seconds=i)}
+            for i in range(max_rows)
+        ])
+    return engine
+
+
+def build_app(engine) -> FastAPI:
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+    app = FastAPI()
+
+    @app.get("/orm", response_model=list[TransactionRead])
+    async def orm(limit: int):
+        async with SessionLocal() as db:
+            res = await db.execute(select(Transaction).order_by(Transaction.id.desc()).limit(limit))
+            return res.scalars().all()
+
+    @app.get("/fast", response_model=list[TransactionRead])
+    async def fast(limit: int):
+        async with SessionLocal() as db:
+            res = await db.execute(
+                select(*columns(TransactionRead, Transaction)).order_by(Transaction.id.desc()).limit(limit)
+            )
+            return rows_response(TransactionRead, res.mappings())
+
+    return app
+
+
+def _per_row_us(summary: dict, rows: int) -> float:
+    return summary["p50_ms"] * 1000 / rows
+
+
+async def bench_endpoint(client: AsyncClient, path: str, rows: int, repeat: int) -> dict:
+    latencies = []
+    body = None
+    for _ in range(repeat + 1):
+        t0 = time.perf_counter()
+        r = await client.get(path, params={"limit": rows})
+        latencies.append(time.perf_counter() - t0)
+        body = r.json()
+    assert len(body) == rows
+    summary = summarize(latencies[1:])  # first call warms caches and the adapter
+    return {**summary, "us_per_row": _per_row_us(summary, rows)}
+
+
+def bench_encode(rows: int, repeat: int) -> dict:
+    t0 = datetime(2025, 1, 1)
+    dicts = [
+        {"id": i, "account_id": 1, "amount": 100 + i, "type": "CREDIT", "description": f"Row {i}",
+         "created_at": t0 + timedelta(seconds=i)}
+        for i in range(rows)
+    ]
+    objects = [Transaction(**d) for d in dicts]
+    adapter = TypeAdapter(list[TransactionRead])
+
+    def before():
+        # FastAPI's default: validate from attributes, dump in JSON mode, stdlib json
+        validated = adapter.validate_python(objects, from_attributes=True)
+        return json.dumps(adapter.dump_python(validated, mode="json"), ensure_ascii=False, separators=(",", ":")).encode()
+
+    def after():
+        return dump_rows(TransactionRead, dicts)
+
+    assert json.loads(before()) == json.loads(after())
+    out = {}
+    for name, fn in (("before", before), ("after", after)):
+        latencies = []
+        for _ in range(repeat):
+            t = time.perf_counter()
+            fn()
+            latencies.append(time.perf_counter() - t)
+        summary = summarize(latencies)
+        out[name] = {**summary, "us_per_row": _per_row_us(summary, rows)}
+    return out
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="100,1000,10000", help="comma-separated response sizes")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", dest="json_out", help="write results to this file")
+    args = parser.parse_args()
+
+    sizes = [int(n) for n in args.rows.split(",")]
+    engine = await setup(max(sizes))
+    app = build_app(engine)
+
+    results = {}
+    print(f"{'rows':>7} {'':<12} {'before us/row':>14} {'after us/row':>13} {'speedup':>8}")
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        for rows in sizes:
+            endpoint = {
+                "before": await bench_endpoint(client, "/orm", rows, args.repeat),
+                "after": await bench_endpoint(client, "/fast", rows, args.repeat),
+            }
+            encode = bench_encode(rows, args.repeat)
+            results[rows] = {"endpoint": endpoint, "encode_only": encode}
+            for label, pair in (("endpoint", endpoint), ("encode only", encode)):
+                b, a = pair["before"]["us_per_row"], pair["after"]["us_per_row"]
+                print(f"{rows:>7} {label:<12} {b:>14.2f} {a:>13.2f} {b / a:>7.1f}x")
+    await engine.dispose()
+
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,104 @@
+"""
+Read/write throughput of a throwaway SQLite file under each PRAGMA profile
+in app.db.session.SQLITE_PROFILES.
+
+    python -m benchmarks.sqlite_profiles --writes 2000 --reads 5000 --concurrency 8
+
+Writes are single-row transaction inserts, each committed on its own (the
+create_transaction pattern); reads are the statement-style "latest rows for
+an account" query.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+os.environ.setdefault("CLERK_JWKS_URL", "https://stub-clerk.invalid/.well-known/jwks.json")
+
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+
+from app.db.models import Account, Base, Transaction, User  # noqa: E402
+from app.db.session import SQLITE_PROFILES, install_sqlite_pragmas, sqlite_pragmas  # noqa: E402
+from benchmarks.stats import format_row, summarize  # noqa: E402
+
+
+async def _run_workers(n: int, concurrency: int, op) -> dict:
+    latencies: list[float] = []
+    remaining = iter(range(n))
+
+    async def worker():
+        for i in remaining:
+            t0 = time.perf_counter()
+            await op(i)
+            latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - t0)
+
+
+async def bench_profile(profile: str, args) -> dict:
+    tmpdir = tempfile.mkdtemp(prefix=f"banksy-sqlite-{profile}-")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmpdir}/bench.db", pool_size=args.concurrency)
+    install_sqlite_pragmas(engine, sqlite_pragmas(profile))
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        user_id = (await conn.execute(insert(User).values(clerk_user_id="bench").returning(User.id))).scalar_one()
+        res = await conn.execute(
+            insert(Account).returning(Account.id),
+            [{"user_id": user_id, "name": f"Account {i}", "currency": "USD"} for i in range(args.accounts)],
+        )
+        account_ids = list(res.scalars().all())
+
+    rng = random.Random(args.seed)
+
+    async def write(i: int):
+        async with engine.begin() as conn:
+            await conn.execute(insert(Transaction).values(
+                account_id=rng.choice(account_ids), amount=100 + i, type="CREDIT", description=f"bench {i}",
+            ))
+
+    async def read(i: int):
+        async with engine.connect() as conn:
+            await conn.execute(
+                select(Transaction)
+                .where(Transaction.account_id == rng.choice(account_ids))
+                .order_by(Transaction.created_at.desc())
+                .limit(50)
+            )
+
+    writes = await _run_workers(args.writes, args.concurrency, write)
+    reads = await _run_workers(args.reads, args.concurrency, read)
+    await engine.dispose()
+    return {"pragmas": sqlite_pragmas(profile), "write": writes, "read": reads}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", default=",".join(SQLITE_PROFILES))
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--reads", type=int, default=5000)
+    parser.add_argument("--accounts", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_out", help="write results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    for profile in args.profiles.split(","):
+        results[profile] = await bench_profile(profile, args)
+        print(format_row(f"{profile}: write", results[profile]["write"]))
+        print(format_row(f"{profile}: read", results[profile]["read"]))
+
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
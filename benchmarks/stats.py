@@ -0,0 +1,48 @@
+import math
+from bisect import bisect_left
+from typing import Dict, List, Sequence
+
+# Upper bounds in milliseconds for latency histograms
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of `samples` (pct in 0..100)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples_s: Sequence[float], elapsed_s: float | None = None) -> Dict[str, float]:
+    """Latency summary in milliseconds for a list of durations in seconds."""
+    n = len(samples_s)
+    summary = {
+        "count": n,
+        "mean_ms": (sum(samples_s) / n * 1000) if n else 0.0,
+        "p50_ms": percentile(samples_s, 50) * 1000,
+        "p95_ms": percentile(samples_s, 95) * 1000,
+        "p99_ms": percentile(samples_s, 99) * 1000,
+        "max_ms": (max(samples_s) * 1000) if n else 0.0,
+    }
+    if elapsed_s:
+        summary["ops_per_sec"] = n / elapsed_s
+    return summary
+
+
+def histogram(samples_s: Sequence[float], bounds_ms: Sequence[float] = HISTOGRAM_BOUNDS_MS) -> List[Dict[str, float]]:
+    """Non-cumulative counts per `le` bucket (milliseconds); the last bucket is "+Inf"."""
+    counts = [0] * (len(bounds_ms) + 1)
+    for s in samples_s:
+        counts[bisect_left(bounds_ms, s * 1000)] += 1
+    return [{"le": le, "count": c} for le, c in zip((*bounds_ms, "+Inf"), counts)]
+
+
+def format_row(name: str, summary: Dict[str, float]) -> str:
+    ops = f"{summary['ops_per_sec']:>10.1f} ops/s" if "ops_per_sec" in summary else ""
+    return (
+        f"{name:<28} n={summary['count']:<6} "
+        f"p50={summary['p50_ms']:>8.2f}ms p95={summary['p95_ms']:>8.2f}ms "
+        f"p99={summary['p99_ms']:>8.2f}ms max={summary['max_ms']:>8.2f}ms {ops}"
+    ).rstrip()
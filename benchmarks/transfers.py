@@ -0,0 +1,110 @@
+"""
+Throughput of N transfers through POST /money-transfers (one call and one
+commit per transfer) vs a single POST /money-transfers/batch.
+
+    python -m benchmarks.transfers --transfers 2000 --concurrency 16
+
+Runs in-process against a throwaway SQLite file with auth stubbed out.
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+_tmpdir = tempfile.mkdtemp(prefix="banksy-bench-")
+os.environ.setdefault("CLERK_JWKS_URL", "https://stub-clerk.invalid/.well-known/jwks.json")
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_tmpdir}/transfers.db")
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+
+from app.api.deps import get_current_user  # noqa: E402
+from app.db.models import Account, Base, User  # noqa: E402
+from app.db.session import get_engine, get_sessionmaker  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks.stats import format_row, summarize  # noqa: E402
+
+
+async def setup(recipients: int):
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    async with get_sessionmaker()() as db:
+        user = User(clerk_user_id="bench_payroll")
+        db.add(user)
+        await db.flush()
+        sender = Account(user_id=user.id, name="Payroll", currency="USD")
+        employees = [Account(user_id=user.id, name=f"Employee {i}", currency="USD") for i in range(recipients)]
+        db.add_all([sender, *employees])
+        await db.commit()
+        return user, sender.id, [e.id for e in employees]
+
+
+async def run_single(client: AsyncClient, sender_id: int, recipients: list[int], n: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(n):
+        queue.put_nowait(recipients[i % len(recipients)])
+
+    async def worker():
+        while not queue.empty():
+            recipient = queue.get_nowait()
+            t0 = time.perf_counter()
+            r = await client.post(
+                "/api/v1/money-transfers",
+                json={"sender_account_id": sender_id, "recipient_account_id": recipient, "amount": 100},
+            )
+            latencies.append(time.perf_counter() - t0)
+            assert r.status_code == 200, r.text
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+    return {"elapsed_s": elapsed, "transfers_per_sec": n / elapsed, "latency": summarize(latencies, elapsed)}
+
+
+async def run_batch(client: AsyncClient, sender_id: int, recipients: list[int], n: int) -> dict:
+    body = {
+        "sender_account_id": sender_id,
+        "description": "Benchmark payroll",
+        "transfers": [{"recipient_account_id": recipients[i % len(recipients)], "amount": 100} for i in range(n)],
+    }
+    t0 = time.perf_counter()
+    r = await client.post("/api/v1/money-transfers/batch", json=body)
+    elapsed = time.perf_counter() - t0
+    assert r.status_code == 200, r.text
+    return {"elapsed_s": elapsed, "transfers_per_sec": n / elapsed}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transfers", type=int, default=2000)
+    parser.add_argument("--recipients", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--json", dest="json_out", help="write results to this file")
+    args = parser.parse_args()
+
+    user, sender_id, recipients = await setup(args.recipients)
+
+    async def _stub_user():
+        return user
+
+    app.dependency_overrides[get_current_user] = _stub_user
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        single = await run_single(client, sender_id, recipients, args.transfers, args.concurrency)
+        batch = await run_batch(client, sender_id, recipients, args.transfers)
+
+    print(format_row("single: POST /money-transfers", single["latency"]))
+    print(f"single: {single['transfers_per_sec']:>10.1f} transfers/s ({single['elapsed_s']:.2f}s)")
+    print(f"batch:  {batch['transfers_per_sec']:>10.1f} transfers/s ({batch['elapsed_s']:.2f}s)")
+    print(f"speedup: {batch['transfers_per_sec'] / single['transfers_per_sec']:.1f}x")
+
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump({"single": single, "batch": batch}, f, indent=2)
+    await get_engine().dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -9,7 +9,7 @@ from sqlalchemy import select
 from app.main import app
 from app.db.models import Base  # flat models.py with Base defined
 from app.db.models import User, Account
-from app.db.session import get_engine, get_sessionmaker, get_db
+from app.db.session import get_engine, get_sessionmaker, get_db, get_read_db
 
 
 # -------------------------------------------------------------------
@@ -57,6 +57,15 @@ async def clean_tables(db_session):
         await db_session.execute(table.delete())
     await db_session.commit()
 
+@pytest_asyncio.fixture(autouse=True)
+def reset_caches():
+    """In-process auth caches must not leak rows from a previous test's tables."""
+    from app.api import deps
+    from app.core import security
+    deps._USER_CACHE.clear()
+    security._TOKEN_CACHE.clear()
+    yield
+
 @pytest_asyncio.fixture(autouse=True)
 def reset_overrides():
     app.dependency_overrides = {}
@@ -74,6 +83,7 @@ async def client(db_session):
         yield db_session
 
     app.dependency_overrides[get_db] = _get_test_db
+    app.dependency_overrides[get_read_db] = _get_test_db
 
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
         yield c
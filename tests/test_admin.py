@@ -0,0 +1,93 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.core.config import settings
+from app.db import session as session_module
+from app.db.models import Base, User
+from app.db.session import install_sqlite_pragmas, sqlite_pragmas
+from app.main import app
+from app.schemas.user import UserRead
+
+
+@pytest.mark.asyncio
+async def test_dbinfo_reports_tables_and_pragmas(client):
+    resp = await client.get("/api/v1/admin/dbinfo")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert "transactions" in data["tables"]
+    assert data["sqlite_profile"] == settings.SQLITE_PROFILE
+    assert set(data["pragmas"]) >= {"journal_mode", "synchronous", "busy_timeout", "foreign_keys"}
+
+
+@pytest.mark.asyncio
+async def test_dbinfo_reads_through_the_read_pool(tmp_path, monkeypatch):
+    # A file database, so the read and write pools are separate engines
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path}/dbinfo.db")
+    for name in ("_engine", "_SessionLocal", "_read_engine", "_ReadSessionLocal"):
+        monkeypatch.setattr(session_module, name, None)
+    write_engine = session_module.get_engine()
+    async with write_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    checkouts = []
+    event.listen(write_engine.sync_engine, "checkout", lambda *args: checkouts.append(1))
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+            resp = await c.get("/api/v1/admin/dbinfo")
+    finally:
+        await write_engine.dispose()
+        await session_module.get_read_engine().dispose()
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert "transactions" in data["tables"]
+    assert data["pragmas"]["query_only"] == 1
+    assert checkouts == []
+
+
+@pytest.mark.asyncio
+async def test_admin_users_match_response_model(client, db_session):
+    db_session.add_all([User(clerk_user_id="admin_a", email="a@example.com"), User(clerk_user_id="admin_b")])
+    await db_session.commit()
+
+    resp = await client.get("/api/v1/admin/users")
+    assert resp.status_code == 200
+    users = (await db_session.execute(select(User).order_by(User.id.asc()))).scalars().all()
+    assert resp.json() == [UserRead.model_validate(u).model_dump(mode="json") for u in users]
+
+
+def test_settings_override_profile(monkeypatch):
+    monkeypatch.setattr(settings, "SQLITE_SYNCHRONOUS", "FULL")
+    monkeypatch.setattr(settings, "SQLITE_FOREIGN_KEYS", False)
+    pragmas = sqlite_pragmas("fast")
+    assert pragmas["journal_mode"] == "WAL"
+    assert pragmas["synchronous"] == "FULL"
+    assert pragmas["foreign_keys"] == "OFF"
+    assert sqlite_pragmas("driver") == {"synchronous": "FULL", "foreign_keys": "OFF"}
+
+    with pytest.raises(ValueError):
+        sqlite_pragmas("turbo")
+
+
+@pytest.mark.asyncio
+async def test_pragmas_applied_on_connect(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/pragmas.db")
+    install_sqlite_pragmas(engine, sqlite_pragmas("fast"))
+    try:
+        async with engine.connect() as conn:
+            values = {
+                name: (await conn.exec_driver_sql(f"PRAGMA {name}")).scalar()
+                for name in ("journal_mode", "synchronous", "temp_store", "busy_timeout", "foreign_keys")
+            }
+    finally:
+        await engine.dispose()
+
+    # synchronous: 1 = NORMAL, temp_store: 2 = MEMORY
+    assert values == {"journal_mode": "wal", "synchronous": 1, "temp_store": 2, "busy_timeout": 5000, "foreign_keys": 1}
+
+
+def test_rejects_unsafe_pragma_values():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    with pytest.raises(ValueError):
+        install_sqlite_pragmas(engine, {"journal_mode": "WAL; DROP TABLE users"})
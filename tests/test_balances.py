@@ -0,0 +1,205 @@
+from datetime import date, datetime, time, timedelta
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from app.db.balances import (
+    apply_balance_deltas, backfill_snapshots, opening_balances, rebuild_balances, rollup_day, seed_missing_balances,
+)
+from app.db.models import Account, AccountBalance, DailyBalanceSnapshot, Transaction, User
+
+
+@pytest.mark.asyncio
+async def test_balance_follows_transactions_and_transfers(authorized_client: AsyncClient, db_session):
+    user = (await db_session.execute(select(User).limit(1))).scalar_one()
+    checking = Account(user_id=user.id, name="Checking", currency="USD")
+    savings = Account(user_id=user.id, name="Savings", currency="USD")
+    db_session.add_all([checking, savings])
+    await db_session.commit()
+
+    resp = await authorized_client.get(f"/api/v1/accounts/{checking.id}/balance")
+    assert resp.status_code == 200
+    assert resp.json()["balance"] == 0
+
+    for amount, tx_type in [(10_000, "CREDIT"), (2_500, "DEBIT")]:
+        resp = await authorized_client.post(
+            "/api/v1/transactions",
+            json={"account_id": checking.id, "amount": amount, "type": tx_type},
+        )
+        assert resp.status_code == 201
+
+    resp = await authorized_client.post(
+        "/api/v1/money-transfers",
+        json={"sender_account_id": checking.id, "recipient_account_id": savings.id, "amount": 1_000},
+    )
+    assert resp.status_code == 200
+
+    checking_balance = (await authorized_client.get(f"/api/v1/accounts/{checking.id}/balance")).json()
+    savings_balance = (await authorized_client.get(f"/api/v1/accounts/{savings.id}/balance")).json()
+    assert checking_balance["balance"] == 6_500
+    assert savings_balance["balance"] == 1_000
+
+
+@pytest.mark.asyncio
+async def test_balance_wrong_user(authorized_client: AsyncClient, db_session):
+    other = User(clerk_user_id="clerk_balance_other")
+    db_session.add(other)
+    await db_session.commit()
+    acc = Account(user_id=other.id, name="Foreign", currency="USD")
+    db_session.add(acc)
+    await db_session.commit()
+
+    resp = await authorized_client.get(f"/api/v1/accounts/{acc.id}/balance")
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_seed_missing_balances_starts_from_ledger(db_session, test_user):
+    seeded, kept = Account(user_id=test_user.id, name="Seeded", currency="USD"), Account(
+        user_id=test_user.id, name="Kept", currency="USD",
+    )
+    db_session.add_all([seeded, kept])
+    await db_session.commit()
+    db_session.add_all([
+        Transaction(account_id=seeded.id, amount=900, type="CREDIT"),
+        Transaction(account_id=seeded.id, amount=200, type="DEBIT"),
+        Transaction(account_id=kept.id, amount=50, type="CREDIT"),
+    ])
+    await apply_balance_deltas(db_session, [(kept.id, 75)])
+    await db_session.commit()
+
+    conn = await db_session.connection()
+    assert await seed_missing_balances(conn) >= 1
+    await db_session.commit()
+
+    res = await db_session.execute(
+        select(AccountBalance.account_id, AccountBalance.balance)
+        .where(AccountBalance.account_id.in_([seeded.id, kept.id]))
+    )
+    # Only the account without a row is seeded; an existing row is not overwritten
+    assert dict(res.all()) == {seeded.id: 700, kept.id: 75}
+    assert await seed_missing_balances(await db_session.connection()) == 0
+
+
+@pytest.mark.asyncio
+async def test_rebuild_balances_verifies_and_fixes_drift(db_session, test_user):
+    accounts = [Account(user_id=test_user.id, name=f"Acc {i}", currency="USD") for i in range(5)]
+    db_session.add_all(accounts)
+    await db_session.commit()
+
+    # Ledger rows written behind the materialized balance's back
+    db_session.add_all([
+        Transaction(account_id=accounts[0].id, amount=500, type="CREDIT"),
+        Transaction(account_id=accounts[0].id, amount=200, type="DEBIT"),
+        Transaction(account_id=accounts[3].id, amount=50, type="DEBIT"),
+    ])
+    await apply_balance_deltas(db_session, [(accounts[1].id, 999)])
+    await db_session.commit()
+
+    report = await rebuild_balances(db_session, chunk_size=2, fix=False)
+    assert report == {"checked": 5, "mismatched": 3, "fixed": 0}
+
+    report = await rebuild_balances(db_session, chunk_size=2)
+    assert report["fixed"] == 3
+
+    res = await db_session.execute(select(AccountBalance.account_id, AccountBalance.balance))
+    stored = dict(res.all())
+    assert stored[accounts[0].id] == 300
+    assert stored[accounts[1].id] == 0
+    assert stored[accounts[3].id] == -50
+
+    assert (await rebuild_balances(db_session, fix=False))["mismatched"] == 0
+
+
+async def _seed_history(db_session, user):
+    acc = Account(user_id=user.id, name="History", currency="USD")
+    db_session.add(acc)
+    await db_session.commit()
+    db_session.add_all([
+        Transaction(account_id=acc.id, amount=1_000, type="CREDIT", created_at=datetime(2025, 1, 1, 9)),
+        Transaction(account_id=acc.id, amount=300, type="DEBIT", created_at=datetime(2025, 1, 1, 18)),
+        Transaction(account_id=acc.id, amount=500, type="CREDIT", created_at=datetime(2025, 1, 3, 12)),
+        Transaction(account_id=acc.id, amount=50, type="DEBIT", created_at=datetime(2025, 1, 5, 8)),
+        Transaction(account_id=acc.id, amount=20, type="DEBIT", created_at=datetime(2025, 1, 6, 8)),
+    ])
+    await db_session.commit()
+    return acc
+
+
+@pytest.mark.asyncio
+async def test_backfill_and_rollup_agree(db_session, test_user):
+    acc = await _seed_history(db_session, test_user)
+
+    assert await backfill_snapshots(db_session, until=date(2025, 1, 6)) == 3
+    res = await db_session.execute(
+        select(DailyBalanceSnapshot.day, DailyBalanceSnapshot.closing_balance)
+        .where(DailyBalanceSnapshot.account_id == acc.id)
+        .order_by(DailyBalanceSnapshot.day)
+    )
+    backfilled = res.all()
+    assert backfilled == [(date(2025, 1, 1), 700), (date(2025, 1, 3), 1_200), (date(2025, 1, 5), 1_150)]
+
+    # Nightly rollups from scratch produce the same checkpoints (and are idempotent)
+    await db_session.execute(DailyBalanceSnapshot.__table__.delete())
+    await db_session.commit()
+    for day in range(1, 6):
+        await rollup_day(db_session, date(2025, 1, day))
+    await rollup_day(db_session, date(2025, 1, 3))
+    res = await db_session.execute(
+        select(DailyBalanceSnapshot.day, DailyBalanceSnapshot.closing_balance)
+        .where(DailyBalanceSnapshot.account_id == acc.id)
+        .order_by(DailyBalanceSnapshot.day)
+    )
+    assert res.all() == backfilled
+
+
+@pytest.mark.asyncio
+async def test_rollup_refuses_a_day_that_is_not_over(db_session, test_user):
+    acc = Account(user_id=test_user.id, name="Today", currency="USD")
+    db_session.add(acc)
+    await db_session.commit()
+    today = datetime.utcnow().date()
+    morning = datetime.combine(today, time.min)
+    db_session.add(Transaction(account_id=acc.id, amount=1_000, type="CREDIT", created_at=morning))
+    await db_session.commit()
+
+    for day in (today, today + timedelta(days=1)):
+        with pytest.raises(ValueError):
+            await rollup_day(db_session, day)
+    with pytest.raises(ValueError):
+        await backfill_snapshots(db_session, until=today + timedelta(days=1))
+
+    # A row posted later the same day still counts towards tomorrow's opening balance
+    db_session.add(Transaction(account_id=acc.id, amount=250, type="DEBIT", created_at=morning + timedelta(seconds=1)))
+    await db_session.commit()
+    tomorrow = datetime.combine(today + timedelta(days=1), time.min)
+    assert await opening_balances(db_session, [acc.id], tomorrow) == {acc.id: 750}
+    res = await db_session.execute(select(DailyBalanceSnapshot).where(DailyBalanceSnapshot.account_id == acc.id))
+    assert res.scalars().all() == []
+
+
+@pytest.mark.asyncio
+async def test_opening_balances_with_and_without_checkpoints(db_session, test_user):
+    acc = await _seed_history(db_session, test_user)
+    at = datetime(2025, 1, 5, 12)
+    assert await opening_balances(db_session, [acc.id], at) == {acc.id: 1_150}
+
+    await backfill_snapshots(db_session, until=date(2025, 1, 4))
+    assert await opening_balances(db_session, [acc.id], at) == {acc.id: 1_150}
+    assert await opening_balances(db_session, [acc.id], datetime(2025, 1, 1)) == {acc.id: 0}
+
+
+@pytest.mark.asyncio
+async def test_statement_opening_and_closing_balances(authorized_client: AsyncClient, db_session):
+    user = (await db_session.execute(select(User).limit(1))).scalar_one()
+    acc = await _seed_history(db_session, user)
+    await backfill_snapshots(db_session, until=date(2025, 1, 4))
+
+    resp = await authorized_client.post(
+        "/api/v1/statements",
+        json={"start_date": "2025-01-03", "end_date": "2025-01-05"},
+    )
+    assert resp.status_code == 200
+    statement = next(s for s in resp.json() if s["account_id"] == acc.id)
+    assert statement["opening_balance"] == 700
+    assert statement["balance"] == 450
+    assert statement["closing_balance"] == 1_150
@@ -0,0 +1,34 @@
+import time
+from app.core.cache import TTLCache
+
+
+def test_ttl_cache_lru_eviction():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" is now most recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_per_entry_expiry_and_stats():
+    cache = TTLCache(maxsize=10)
+    cache.set("fresh", 1, expires_at=time.time() + 60)
+    cache.set("stale", 2, expires_at=time.time() - 1)
+
+    assert cache.get("fresh") == 1
+    assert cache.get("stale") is None
+    assert cache.get("missing") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["size"] == 1
+
+
+def test_ttl_cache_disabled():
+    cache = TTLCache(maxsize=0, ttl=60)
+    cache.set("a", 1)
+    assert cache.get("a") is None
@@ -1,9 +1,15 @@
 import pytest
-from fastapi import Depends, FastAPI
-from httpx import AsyncClient
+from fastapi import Depends, FastAPI, HTTPException
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, select
 
 from app.api import deps
-from app.db.models import User
+from app.core.config import settings
+from app.db import session as session_module
+from app.db.models import Base, ErrorGroup, User
+from app.db.session import get_engine
+from app.main import app as main_app
+from app.middleware.error_logger import error_logger_middleware
 
 @pytest.mark.asyncio
 async def test_get_current_user_unauthorized(client: AsyncClient):
@@ -36,3 +42,169 @@ async def test_get_current_user_upserts(db_session, authorized_client: AsyncClie
     user = await db_session.get(User, data["id"])
     assert user is not None
     assert user.email == data["email"]
+
+
+@pytest.fixture
+def user_queries():
+    """Collect SQL statements that touch the users table."""
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if "users" in statement:
+            statements.append(statement)
+
+    engine = get_engine().sync_engine
+    event.listen(engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", _record)
+
+
+@pytest.fixture
+def fake_claims(monkeypatch):
+    claims = {"sub": "clerk_cached", "primary_email": "cached@example.com", "first_name": "Cache"}
+
+    async def _verify(token):
+        return dict(claims)
+
+    monkeypatch.setattr(deps, "verify_jwt", _verify)
+    return claims
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_cache_skips_db(db_session, fake_claims, user_queries):
+    first = await deps.get_current_user(db=db_session, auth=deps.AuthContext("t"))
+    assert first.email == "cached@example.com"
+    queries_after_first = len(user_queries)
+    assert queries_after_first > 0
+
+    second = await deps.get_current_user(db=db_session, auth=deps.AuthContext("t"))
+    assert second.id == first.id
+    assert second.email == "cached@example.com"
+    assert len(user_queries) == queries_after_first
+
+    stats = deps.user_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_cache_refreshes_on_claim_change(db_session, fake_claims, user_queries):
+    first = await deps.get_current_user(db=db_session, auth=deps.AuthContext("t"))
+    queries_after_first = len(user_queries)
+
+    fake_claims["primary_email"] = "changed@example.com"
+    updated = await deps.get_current_user(db=db_session, auth=deps.AuthContext("t"))
+    assert updated.id == first.id
+    assert updated.email == "changed@example.com"
+    assert len(user_queries) > queries_after_first
+
+    stored = await db_session.get(User, first.id)
+    assert stored.email == "changed@example.com"
+
+
+@pytest.mark.asyncio
+async def test_auth_context_shared_with_error_middleware(db_session, fake_claims, monkeypatch):
+    calls = []
+
+    async def _verify(token):
+        calls.append(token)
+        return dict(fake_claims)
+
+    monkeypatch.setattr(deps, "verify_jwt", _verify)
+
+    app = FastAPI()
+    app.middleware("http")(error_logger_middleware)
+
+    @app.get("/boom")
+    async def boom(user=Depends(deps.get_current_user), maybe=Depends(deps.get_current_user_optional)):
+        assert maybe is user
+        raise RuntimeError("boom")
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        resp = await c.get("/boom", headers={"Authorization": "Bearer shared-token"})
+    assert resp.status_code == 500
+
+    # One decode for the dependencies and the middleware together
+    assert calls == ["shared-token"]
+
+    res = await db_session.execute(select(ErrorGroup))
+    group = res.scalars().one()
+    user = (await db_session.execute(select(User).where(User.clerk_user_id == "clerk_cached"))).scalar_one()
+    assert group.last_user_id == user.id
+    assert group.location == "GET /boom"
+
+
+@pytest.mark.asyncio
+async def test_failed_user_lookup_is_not_retried_by_error_middleware(db_session, fake_claims, monkeypatch):
+    calls = []
+
+    async def _failing_upsert(db, claims):
+        calls.append(claims["sub"])
+        raise RuntimeError("users table unavailable")
+
+    monkeypatch.setattr(deps, "_upsert_user", _failing_upsert)
+
+    app = FastAPI()
+    app.middleware("http")(error_logger_middleware)
+
+    @app.get("/needs-user")
+    async def needs_user(user=Depends(deps.get_current_user)):
+        return {"id": user.id}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        resp = await c.get("/needs-user", headers={"Authorization": "Bearer t"})
+    assert resp.status_code == 500
+
+    # The middleware's optional lookup reuses the recorded failure instead of running it again
+    assert calls == ["clerk_cached"]
+    group = (await db_session.execute(select(ErrorGroup))).scalars().one()
+    assert group.last_user_id is None
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_invalid_token(db_session, monkeypatch):
+    async def _verify(token):
+        raise ValueError("bad signature")
+
+    monkeypatch.setattr(deps, "verify_jwt", _verify)
+    auth = deps.AuthContext("bad")
+    with pytest.raises(HTTPException) as exc:
+        await deps.get_current_user(db=db_session, auth=auth)
+    assert exc.value.status_code == 401
+    with pytest.raises(HTTPException):
+        await deps.get_current_user(db=db_session, auth=auth)
+
+
+@pytest.mark.asyncio
+async def test_cold_user_cache_get_stays_off_the_write_pool(tmp_path, monkeypatch, fake_claims):
+    # A file database, so the read and write pools are separate engines
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path}/auth.db")
+    for name in ("_engine", "_SessionLocal", "_read_engine", "_ReadSessionLocal"):
+        monkeypatch.setattr(session_module, name, None)
+    write_engine = session_module.get_engine()
+    async with write_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with session_module.get_sessionmaker()() as db:
+        db.add(User(clerk_user_id="clerk_cached", email="cached@example.com", first_name="Cache"))
+        await db.commit()
+    deps._USER_CACHE.clear()
+
+    checkouts = []
+    event.listen(write_engine.sync_engine, "checkout", lambda *args: checkouts.append(1))
+    try:
+        async with AsyncClient(transport=ASGITransport(app=main_app), base_url="http://test") as c:
+            for path in ("/api/v1/users/me", "/api/v1/accounts"):
+                resp = await c.get(path, headers={"Authorization": "Bearer t"})
+                assert resp.status_code == 200
+            assert checkouts == []
+            assert session_module.pool_status()["write"]["checkedout"] == 0
+
+            # Only a user seen for the first time reaches for a write connection
+            fake_claims["sub"] = "clerk_new"
+            resp = await c.get("/api/v1/users/me", headers={"Authorization": "Bearer t"})
+            assert resp.status_code == 200
+            assert checkouts
+            assert session_module.pool_status()["write"]["checkedout"] == 0
+    finally:
+        await write_engine.dispose()
+        await session_module.get_read_engine().dispose()
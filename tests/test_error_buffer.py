@@ -0,0 +1,123 @@
+from datetime import datetime
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select
+from app.db.models import ErrorGroup
+from app.middleware import error_buffer as error_buffer_module
+from app.middleware.error_buffer import ErrorLogBuffer
+from app.middleware.error_logger import error_logger_middleware
+
+
+def _entry(i: int) -> dict:
+    return {
+        "fingerprint": f"fp-{i}",
+        "exception_type": "RuntimeError",
+        "user_id": None,
+        "error_code": 500,
+        "message": f"error {i}",
+        "traceback": "Traceback ...",
+        "location": "test",
+        "created_at": datetime.utcnow(),
+    }
+
+
+async def _messages(db_session) -> list:
+    return list((await db_session.execute(select(ErrorGroup.message).order_by(ErrorGroup.id))).scalars())
+
+
+def test_drop_newest_keeps_the_first_entries():
+    buf = ErrorLogBuffer(maxsize=3, overflow="drop_newest")
+    results = [buf.submit(_entry(i)) for i in range(5)]
+    assert results == [True, True, True, False, False]
+    assert [e["message"] for e in buf._buf] == ["error 0", "error 1", "error 2"]
+    assert buf.stats()["dropped"] == 2
+
+
+def test_drop_oldest_keeps_the_latest_entries():
+    buf = ErrorLogBuffer(maxsize=3, overflow="drop_oldest")
+    for i in range(5):
+        assert buf.submit(_entry(i))
+    assert [e["message"] for e in buf._buf] == ["error 2", "error 3", "error 4"]
+    assert buf.stats()["dropped"] == 2
+
+
+def test_sample_sheds_load_past_half_full(monkeypatch):
+    buf = ErrorLogBuffer(maxsize=10, overflow="sample", sample_rate=0.25)
+    rolls = iter([0.1, 0.9, 0.9, 0.2] * 10)
+    monkeypatch.setattr(error_buffer_module.random, "random", lambda: next(rolls))
+    for i in range(13):
+        buf.submit(_entry(i))
+    # The first 5 always go in; after that only rolls below 0.25 are kept
+    assert len(buf._buf) == 9
+    assert buf.stats()["dropped"] == 4
+
+
+def test_unknown_policy_rejected():
+    with pytest.raises(ValueError):
+        ErrorLogBuffer(overflow="block")
+
+
+@pytest.mark.asyncio
+async def test_stop_flushes_in_batches(db_session):
+    buf = ErrorLogBuffer(maxsize=100, batch_size=4, flush_interval_ms=60_000)
+    await buf.start()
+    for i in range(10):
+        buf.submit(_entry(i))
+    await buf.stop()
+
+    assert await _messages(db_session) == [f"error {i}" for i in range(10)]
+    assert buf.stats()["written"] == 10
+    assert buf.stats()["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_write_is_counted_not_retried(db_session):
+    buf = ErrorLogBuffer(batch_size=10)
+    buf.submit({"message": None})  # no fingerprint
+    buf.submit(_entry(1))
+    await buf.flush()
+
+    assert buf.stats()["failed"] == 2
+    assert buf.stats()["written"] == 0
+    assert await _messages(db_session) == []
+
+
+@pytest.mark.asyncio
+async def test_middleware_queues_instead_of_writing(db_session, monkeypatch):
+    buf = ErrorLogBuffer(batch_size=100, flush_interval_ms=60_000)
+    monkeypatch.setattr("app.middleware.error_logger.error_buffer", buf)
+    await buf.start()
+
+    app = FastAPI()
+    app.middleware("http")(error_logger_middleware)
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+            for _ in range(3):
+                assert (await c.get("/boom")).status_code == 500
+        # Nothing written while the requests were failing
+        assert await db_session.scalar(select(func.count()).select_from(ErrorGroup)) == 0
+        assert buf.stats()["queued"] == 3
+    finally:
+        await buf.stop()
+
+    group = (await db_session.execute(select(ErrorGroup))).scalars().one()
+    assert group.count == 3
+    assert "RuntimeError: boom" in group.traceback
+
+
+@pytest.mark.asyncio
+async def test_lifespan_shutdown_flushes_queue(db_session):
+    from app.main import app
+    from app.middleware.error_buffer import error_buffer
+
+    async with app.router.lifespan_context(app):
+        assert error_buffer.running
+        error_buffer.submit(_entry(42))
+    assert not error_buffer.running
+    assert await _messages(db_session) == ["error 42"]
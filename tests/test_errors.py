@@ -1,18 +1,33 @@
 import pytest
+from datetime import datetime, timedelta
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
 from sqlalchemy import select
-from app.db.models import ApplicationLogger
-from httpx import AsyncClient
+from app.core.fingerprint import fingerprint_exception
+from app.db.error_groups import record_errors
+from app.db.models import ErrorGroup, ErrorGroupBucket
+from app.middleware.error_logger import error_logger_middleware
+
+
+def _occurrence(fingerprint: str, at: datetime, **overrides) -> dict:
+    entry = {
+        "fingerprint": fingerprint,
+        "exception_type": "RuntimeError",
+        "location": "GET /api/v1/things/{thing_id}",
+        "error_code": 500,
+        "message": "Unit test error",
+        "traceback": "Traceback (most recent call last): ...",
+        "user_id": None,
+        "created_at": at,
+    }
+    entry.update(overrides)
+    return entry
+
 
 @pytest.mark.asyncio
 async def test_errors_authenticated(authorized_client, db_session):
     # Insert a fake error
-    log = ApplicationLogger(
-        user_id=None,
-        error_code="500",
-        message="Unit test error",
-        location="test"
-    )
-    db_session.add(log)
+    await record_errors(db_session, [_occurrence("fp-unit", datetime.utcnow())])
     await db_session.commit()
 
     resp = await authorized_client.get("/api/v1/errors")
@@ -25,4 +40,156 @@ async def test_errors_authenticated(authorized_client, db_session):
 async def test_error_logger_pass_through(client: AsyncClient):
     resp = await client.get("/api/v1/health")
     assert resp.status_code == 200
-    # Should not create any ApplicationLogger entries
\ No newline at end of file
+    # Should not create any ApplicationLogger entries
+
+
+@pytest.mark.asyncio
+async def test_occurrences_fold_into_one_group(db_session):
+    t0 = datetime(2026, 1, 1, 12, 0, 5)
+    await record_errors(db_session, [
+        _occurrence("fp-a", t0, traceback="first traceback"),
+        _occurrence("fp-a", t0 + timedelta(seconds=30), message="second"),
+        _occurrence("fp-b", t0),
+    ])
+    await record_errors(db_session, [
+        _occurrence("fp-a", t0 + timedelta(minutes=1, seconds=10), message="latest", traceback="later traceback"),
+    ])
+    await db_session.commit()
+
+    groups = {g.fingerprint: g for g in (await db_session.execute(select(ErrorGroup))).scalars()}
+    assert len(groups) == 2
+    a = groups["fp-a"]
+    assert a.count == 3
+    assert a.first_seen == t0
+    assert a.last_seen == t0 + timedelta(minutes=1, seconds=10)
+    assert a.message == "latest"
+    assert a.traceback == "first traceback"  # stored once, from the first occurrence
+
+    buckets = (await db_session.execute(
+        select(ErrorGroupBucket.minute, ErrorGroupBucket.count)
+        .where(ErrorGroupBucket.group_id == a.id)
+        .order_by(ErrorGroupBucket.minute)
+    )).all()
+    assert buckets == [(datetime(2026, 1, 1, 12, 0), 2), (datetime(2026, 1, 1, 12, 1), 1)]
+
+
+def _raise(exc):
+    raise exc
+
+
+def test_fingerprint_ignores_message_but_not_type_or_route():
+    def capture(exc):
+        try:
+            _raise(exc)
+        except Exception as e:
+            return e
+
+    a = fingerprint_exception(capture(ValueError("account 1")), "GET /a")
+    b = fingerprint_exception(capture(ValueError("account 2")), "GET /a")
+    assert a == b
+    assert fingerprint_exception(capture(KeyError("x")), "GET /a") != a
+    assert fingerprint_exception(capture(ValueError("x")), "GET /b") != a
+
+
+@pytest.mark.asyncio
+async def test_middleware_groups_by_route_template(db_session):
+    app = FastAPI()
+    app.middleware("http")(error_logger_middleware)
+
+    @app.get("/things/{thing_id}")
+    async def boom(thing_id: int):
+        raise RuntimeError(f"thing {thing_id} exploded")
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        for thing_id in (1, 2, 3):
+            assert (await c.get(f"/things/{thing_id}")).status_code == 500
+
+    group = (await db_session.execute(select(ErrorGroup))).scalars().one()
+    assert group.count == 3
+    assert group.location == "GET /things/{thing_id}"
+    assert group.exception_type == "RuntimeError"
+    assert group.message == "thing 3 exploded"
+    assert "thing 1 exploded" in group.traceback
+
+
+async def _seed_groups(db_session, n: int) -> datetime:
+    t0 = datetime(2026, 1, 1, 12, 0)
+    await record_errors(db_session, [
+        _occurrence(
+            f"fp-{i}",
+            t0 + timedelta(minutes=i),
+            location=f"GET /api/v1/route{i % 2}",
+            error_code=500 if i % 3 else 503,
+            message=f"error {i}",
+        )
+        for i in range(n)
+    ])
+    await db_session.commit()
+    return t0
+
+
+@pytest.mark.asyncio
+async def test_errors_keyset_pagination(authorized_client, db_session):
+    await _seed_groups(db_session, 7)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        resp = await authorized_client.get("/api/v1/errors", params=params)
+        assert resp.status_code == 200
+        seen += [g["message"] for g in resp.json()]
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == [f"error {i}" for i in reversed(range(7))]
+
+    resp = await authorized_client.get("/api/v1/errors", params={"cursor": "bm90LWpzb24"})
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_errors_filters(authorized_client, db_session):
+    t0 = await _seed_groups(db_session, 7)
+
+    resp = await authorized_client.get("/api/v1/errors", params={"error_code": 503})
+    assert [g["message"] for g in resp.json()] == ["error 6", "error 3", "error 0"]
+
+    resp = await authorized_client.get("/api/v1/errors", params={"location": "GET /api/v1/route1"})
+    assert [g["message"] for g in resp.json()] == ["error 5", "error 3", "error 1"]
+
+    resp = await authorized_client.get("/api/v1/errors", params={
+        "since": (t0 + timedelta(minutes=2)).isoformat(),
+        "until": (t0 + timedelta(minutes=4)).isoformat(),
+    })
+    assert [g["message"] for g in resp.json()] == ["error 4", "error 3", "error 2"]
+
+
+@pytest.mark.asyncio
+async def test_errors_summary_skips_traceback(authorized_client, db_session):
+    from sqlalchemy import event
+    from app.db.session import get_engine
+
+    await _seed_groups(db_session, 2)
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if "error_groups" in statement:
+            statements.append(statement)
+
+    engine = get_engine().sync_engine
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        resp = await authorized_client.get("/api/v1/errors", params={"summary": True})
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert len(data) == 2
+    assert all("traceback" not in g for g in data)
+    assert statements and all("traceback" not in s for s in statements)
+
+    full = await authorized_client.get(f"/api/v1/errors/{data[0]['id']}")
+    assert full.status_code == 200
+    assert full.json()["traceback"].startswith("Traceback")
+    assert (await authorized_client.get("/api/v1/errors/999999")).status_code == 404
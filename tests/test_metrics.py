@@ -0,0 +1,89 @@
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from app.core.metrics import Registry, http_request_duration, http_requests, http_requests_in_flight
+from app.middleware.error_logger import error_logger_middleware
+from app.middleware.metrics import UNMATCHED_ROUTE, MetricsMiddleware
+
+
+def test_registry_renders_prometheus_text():
+    registry = Registry()
+    hits = registry.counter("hits", "Hits.", ("route",))
+    latency = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    hits.inc("/a")
+    hits.inc("/a", amount=2)
+    latency.observe(0.05, "/a")
+    latency.observe(0.1, "/a")
+    latency.observe(3, "/a")
+
+    @registry.collector
+    def _sizes():
+        yield "queue_depth", "gauge", "Depth.", [({"queue": 'we"ird'}, 4)]
+
+    text = registry.render()
+    assert "# HELP hits_total Hits." in text
+    assert "# TYPE hits_total counter" in text
+    assert "# TYPE hits counter" not in text
+    assert 'hits_total{route="/a"} 3' in text
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/a"} 3' in text
+    assert 'latency_seconds_sum{route="/a"} 3.15' in text
+    assert 'queue_depth{queue="we\\"ird"} 4' in text
+
+    with pytest.raises(ValueError):
+        registry.counter("hits", "Again.")
+
+
+@pytest.mark.asyncio
+async def test_middleware_labels_by_route_template(authorized_client: AsyncClient, test_account):
+    route = "/api/v1/accounts/{account_id}"
+    before = http_requests.value("GET", route, "200")
+    observed = http_request_duration.count("GET", route)
+
+    for _ in range(2):
+        resp = await authorized_client.get(f"/api/v1/accounts/{test_account.id}")
+        assert resp.status_code == 200
+    resp = await authorized_client.get("/api/v1/accounts/999999")
+    assert resp.status_code == 404
+
+    assert http_requests.value("GET", route, "200") == before + 2
+    assert http_requests.value("GET", route, "404") >= 1
+    assert http_request_duration.count("GET", route) == observed + 3
+    assert http_requests_in_flight.value("GET") == 0
+
+    unmatched = http_requests.value("GET", UNMATCHED_ROUTE, "404")
+    await authorized_client.get("/no/such/path")
+    assert http_requests.value("GET", UNMATCHED_ROUTE, "404") == unmatched + 1
+
+
+@pytest.mark.asyncio
+async def test_middleware_counts_logged_500s():
+    app = FastAPI()
+    app.middleware("http")(error_logger_middleware)
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics-boom/{n}")
+    async def boom(n: int):
+        raise RuntimeError("boom")
+
+    before = http_requests.value("GET", "/metrics-boom/{n}", "500")
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        assert (await c.get("/metrics-boom/1")).status_code == 500
+    assert http_requests.value("GET", "/metrics-boom/{n}", "500") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(client: AsyncClient):
+    await client.get("/api/v1/health")
+    resp = await client.get("/api/v1/admin/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = resp.text
+    assert "# TYPE http_requests_total counter" in text
+    assert 'http_requests_total{method="GET",route="/api/v1/health",status="200"}' in text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/v1/health",le="+Inf"}' in text
+    assert 'cache_entries{cache="jwt"}' in text
+    assert "db_group_commit_batches_total" in text
+    assert 'error_log_entries_total{outcome="dropped"}' in text
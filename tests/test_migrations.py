@@ -0,0 +1,80 @@
+from pathlib import Path
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+from app.core.config import settings
+from app.db.models import Base
+
+ALEMBIC_DIR = Path(__file__).resolve().parents[1] / "app" / "db" / "alembic"
+
+
+@pytest.fixture
+def alembic_db(tmp_path, monkeypatch):
+    # env.py reads the URL from settings; a bare Config skips alembic.ini's logging setup
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path}/migrations.db")
+    cfg = Config()
+    cfg.set_main_option("script_location", str(ALEMBIC_DIR))
+    engine = create_engine(f"sqlite:///{tmp_path}/migrations.db")
+    yield cfg, engine
+    engine.dispose()
+
+
+def test_migrations_match_models(alembic_db):
+    cfg, engine = alembic_db
+    command.upgrade(cfg, "head")
+
+    with engine.connect() as conn:
+        diff = compare_metadata(MigrationContext.configure(conn, opts={"compare_type": True}), Base.metadata)
+        indexes = {ix["name"] for ix in inspect(conn).get_indexes("transactions")}
+    assert diff == []
+    assert {"ix_transactions_account_id_created_at", "ix_transactions_account_id_id_desc"} <= indexes
+
+
+def test_migrations_downgrade_to_base(alembic_db):
+    cfg, engine = alembic_db
+    command.upgrade(cfg, "head")
+    command.downgrade(cfg, "base")
+
+    with engine.connect() as conn:
+        assert inspect(conn).get_table_names() == ["alembic_version"]
+
+
+def test_upgrade_over_create_all_database(alembic_db):
+    # Dev databases are created by the app's create_all(); upgrading them must not fail
+    cfg, engine = alembic_db
+    Base.metadata.create_all(engine)
+    command.upgrade(cfg, "head")
+
+    with engine.connect() as conn:
+        assert "daily_balance_snapshots" in inspect(conn).get_table_names()
+
+
+def test_upgrade_backfills_account_balances_from_ledger(alembic_db):
+    # Databases that had transactions before account_balances existed
+    cfg, engine = alembic_db
+    command.upgrade(cfg, "d64c687b843d")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO users (id, clerk_user_id, created_at, updated_at) "
+            "VALUES (1, 'clerk_migrated', '2025-01-01 00:00:00', '2025-01-01 00:00:00')"
+        ))
+        conn.execute(text(
+            "INSERT INTO accounts (id, user_id, name, currency, created_at, updated_at) VALUES "
+            "(1, 1, 'Checking', 'USD', '2025-01-01 00:00:00', '2025-01-01 00:00:00'), "
+            "(2, 1, 'Empty', 'USD', '2025-01-01 00:00:00', '2025-01-01 00:00:00')"
+        ))
+        conn.execute(text(
+            "INSERT INTO transactions (account_id, amount, type, created_at) VALUES "
+            "(1, 10000, 'CREDIT', '2025-01-01 00:00:00'), (1, 2500, 'DEBIT', '2025-01-02 00:00:00'), "
+            "(1, 300, 'debit', '2025-01-03 00:00:00')"
+        ))
+
+    command.upgrade(cfg, "head")
+
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT account_id, balance, updated_at FROM account_balances ORDER BY account_id")).all()
+    assert [(r.account_id, r.balance) for r in rows] == [(1, 7_200), (2, 0)]
+    assert all(r.updated_at is not None for r in rows)
@@ -87,4 +87,86 @@ async def test_money_transfer_invalid_sender(authorized_client: AsyncClient):
         },
     )
     assert resp.status_code == 404
-    assert "Sender account not found" in resp.text
\ No newline at end of file
+    assert "Sender account not found" in resp.text
+
+@pytest.mark.asyncio
+async def test_money_transfer_batch_payroll(authorized_client: AsyncClient, db_session):
+    from app.db.models import AccountBalance
+
+    user = (await db_session.execute(select(User).limit(1))).scalar_one()
+    employer = Account(user_id=user.id, name="Payroll", currency="USD")
+    other = User(clerk_user_id="clerk_employee")
+    db_session.add_all([employer, other])
+    await db_session.commit()
+    employees = [Account(user_id=other.id, name=f"Employee {i}", currency="USD") for i in range(20)]
+    db_session.add_all(employees)
+    await db_session.commit()
+
+    resp = await authorized_client.post(
+        "/api/v1/money-transfers/batch",
+        json={
+            "sender_account_id": employer.id,
+            "description": "Payroll 2025-01",
+            "transfers": [
+                {"recipient_account_id": e.id, "amount": 1_000 + i} for i, e in enumerate(employees)
+            ],
+        },
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["total_amount"] == sum(1_000 + i for i in range(20))
+    assert len(data["transfers"]) == 20
+    assert len({t["transfer_id"] for t in data["transfers"]}) == 20
+
+    txs = (await db_session.execute(
+        select(Transaction).where(Transaction.transfer_id == data["transfers"][5]["transfer_id"])
+    )).scalars().all()
+    assert {(t.account_id, t.type, t.amount) for t in txs} == {
+        (employer.id, "DEBIT", 1_005), (employees[5].id, "CREDIT", 1_005),
+    }
+    assert all(t.description == "Payroll 2025-01" for t in txs)
+
+    employer_balance = await db_session.get(AccountBalance, employer.id)
+    assert employer_balance.balance == -data["total_amount"]
+
+
+@pytest.mark.asyncio
+async def test_money_transfer_batch_is_atomic(authorized_client: AsyncClient, db_session):
+    user = (await db_session.execute(select(User).limit(1))).scalar_one()
+    sender = Account(user_id=user.id, name="Checking", currency="USD")
+    recipient = Account(user_id=user.id, name="Savings", currency="USD")
+    db_session.add_all([sender, recipient])
+    await db_session.commit()
+
+    resp = await authorized_client.post(
+        "/api/v1/money-transfers/batch",
+        json={
+            "sender_account_id": sender.id,
+            "transfers": [
+                {"recipient_account_id": recipient.id, "amount": 100},
+                {"recipient_account_id": 999999, "amount": 100},
+            ],
+        },
+    )
+    assert resp.status_code == 404
+    assert "Transfer 1" in resp.json()["detail"]
+
+    txs = (await db_session.execute(select(Transaction))).scalars().all()
+    assert txs == []
+
+
+@pytest.mark.asyncio
+async def test_money_transfer_batch_foreign_sender(authorized_client: AsyncClient, db_session):
+    other = User(clerk_user_id="clerk_batch_other")
+    db_session.add(other)
+    await db_session.commit()
+    foreign = Account(user_id=other.id, name="Not yours", currency="USD")
+    db_session.add(foreign)
+    await db_session.commit()
+
+    resp = await authorized_client.post(
+        "/api/v1/money-transfers/batch",
+        json={"transfers": [{"sender_account_id": foreign.id, "recipient_account_id": foreign.id, "amount": 1}]},
+    )
+    assert resp.status_code == 404
+    assert "Sender account not found" in resp.json()["detail"]
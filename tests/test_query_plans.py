@@ -0,0 +1,83 @@
+import re
+from datetime import date, datetime, timedelta
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import event, select
+from app.db.models import AccountHolder, Base, Card, ErrorGroup, Transaction, User
+from app.db.session import get_engine
+
+# "SCAN <table>" with no index is a full table scan; "SCAN <table> USING INDEX" walks an index
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+TABLES = set(Base.metadata.tables)
+
+
+@pytest_asyncio.fixture
+async def seeded(authorized_client: AsyncClient, db_session, test_account):
+    user = (await db_session.execute(select(User).limit(1))).scalar_one()
+    now = datetime.utcnow()
+    db_session.add_all([
+        Transaction(account_id=test_account.id, amount=1_000, type="CREDIT", description="Deposit", created_at=now),
+        Transaction(account_id=test_account.id, amount=200, type="DEBIT", description="Coffee", created_at=now),
+        Card(account_id=test_account.id, card_number_last4="4242", card_type="Debit",
+             expiration_month=1, expiration_year=2030),
+        AccountHolder(user_id=user.id, account_id=test_account.id, holder_type="Primary"),
+        ErrorGroup(fingerprint="fp", exception_type="RuntimeError", location="GET /x", traceback="boom",
+                   count=1, first_seen=now, last_seen=now),
+    ])
+    await db_session.commit()
+    return test_account
+
+
+def _requests(account_id: int):
+    today = date.today()
+    window = {"start_date": str(today - timedelta(days=1)), "end_date": str(today + timedelta(days=1))}
+    return {
+        "accounts.list": ("GET", "/api/v1/accounts", None),
+        "accounts.get": ("GET", f"/api/v1/accounts/{account_id}", None),
+        "accounts.balance": ("GET", f"/api/v1/accounts/{account_id}/balance", None),
+        "transactions.list": ("GET", f"/api/v1/transactions?account_id={account_id}&limit=1", None),
+        "transactions.filtered": (
+            "GET", f"/api/v1/transactions?account_id={account_id}&type=CREDIT&start=2000-01-01T00:00:00", None,
+        ),
+        "cards.list": ("GET", "/api/v1/cards", None),
+        "account_holders.list": ("GET", "/api/v1/account-holders", None),
+        "account_holders.for_account": ("GET", f"/api/v1/account-holders/{account_id}/holders", None),
+        "statements.generate": ("POST", "/api/v1/statements", window),
+        "statements.export": ("GET", f"/api/v1/statements/export?start_date={window['start_date']}"
+                                     f"&end_date={window['end_date']}", None),
+        "errors.list": ("GET", "/api/v1/errors", None),
+        "errors.by_location": ("GET", "/api/v1/errors?location=GET%20/x&summary=true", None),
+        "errors.time_range": ("GET", "/api/v1/errors?since=2000-01-01T00:00:00&error_code=500", None),
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", list(_requests(0)))
+async def test_router_queries_use_indexes(name, seeded, authorized_client: AsyncClient, db_session):
+    method, url, body = _requests(seeded.id)[name]
+
+    captured = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            captured.append((statement, parameters))
+
+    sync_engine = get_engine().sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _capture)
+    try:
+        resp = await authorized_client.request(method, url, json=body)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", _capture)
+    assert resp.status_code == 200, resp.text
+    assert captured, f"{name} ran no queries"
+
+    conn = await db_session.connection()
+    scans = []
+    for statement, parameters in captured:
+        plan = (await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", tuple(parameters or ()))).all()
+        for row in plan:
+            m = FULL_SCAN.match(row[-1])
+            if m and m.group(1) in TABLES:
+                scans.append(f"{row[-1]}\n    in: {' '.join(statement.split())}")
+    assert not scans, f"{name} does full table scans:\n" + "\n".join(scans)
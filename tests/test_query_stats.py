@@ -0,0 +1,59 @@
+import pytest
+from httpx import AsyncClient
+from app.core.metrics import http_db_queries
+from app.db import query_stats
+from app.db.query_stats import QUERY_COUNT_HEADER, QUERY_TIME_HEADER, db_queries, normalize_sql
+
+
+def test_normalize_sql_strips_literals_and_folds_in_lists():
+    sql = """SELECT id FROM accounts
+             WHERE user_id = 42 AND name = 'O''Brien' AND id IN (?, ?, ?) LIMIT 10 OFFSET 0"""
+    assert normalize_sql(sql) == (
+        "SELECT id FROM accounts WHERE user_id = ? AND name = ? AND id IN (?, ...) LIMIT ? OFFSET ?"
+    )
+    # Identifiers containing digits are left alone
+    assert normalize_sql("SELECT anon_1.id FROM t AS anon_1") == "SELECT anon_1.id FROM t AS anon_1"
+
+
+@pytest.mark.asyncio
+async def test_query_headers_and_metrics(authorized_client: AsyncClient, test_account):
+    route = "/api/v1/accounts/{account_id}"
+    observed = http_db_queries.count("GET", route)
+    selects = db_queries.value("SELECT")
+
+    resp = await authorized_client.get(f"/api/v1/accounts/{test_account.id}")
+    assert resp.status_code == 200
+    count = int(resp.headers[QUERY_COUNT_HEADER])
+    assert count >= 1
+    assert float(resp.headers[QUERY_TIME_HEADER]) >= 0
+    assert http_db_queries.count("GET", route) == observed + 1
+    assert db_queries.value("SELECT") >= selects + count
+
+    resp = await authorized_client.get("/api/v1/health")
+    assert resp.headers[QUERY_COUNT_HEADER] == "0"
+
+    # The counter is exposed as one typed family, samples included
+    text = (await authorized_client.get("/api/v1/admin/metrics")).text
+    assert "# TYPE db_queries_total counter" in text
+    assert "# TYPE db_queries counter" not in text
+    assert 'db_queries_total{operation="SELECT"}' in text
+
+
+@pytest.mark.asyncio
+async def test_slow_query_log(monkeypatch, authorized_client: AsyncClient, test_account):
+    logged = []
+
+    class _Logger:
+        def warning(self, event, **kw):
+            logged.append((event, kw))
+
+    monkeypatch.setattr(query_stats, "logger", _Logger())
+    monkeypatch.setattr(query_stats.settings, "DB_SLOW_QUERY_MS", 0)
+
+    await authorized_client.get(f"/api/v1/accounts/{test_account.id}")
+
+    assert logged
+    event, fields = logged[0]
+    assert event == "slow_query"
+    assert fields["duration_ms"] >= 0
+    assert fields["sql"].startswith("SELECT") and "\n" not in fields["sql"]
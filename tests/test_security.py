@@ -1,5 +1,9 @@
+import asyncio
+import time
 import pytest
-from jose import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
 from app.core import security
 
 SECRET = "testsecret"
@@ -25,3 +29,293 @@ def test_verify_jwt_invalid_signature():
     token = make_token({"sub": "123"})
     with pytest.raises(Exception):
         jwt.decode(token, "wrongsecret", algorithms=[ALGO])
+
+
+# ---------------------------------------------------------------------------
+# verify_jwt against a local RSA key set
+# ---------------------------------------------------------------------------
+
+KID = "test-kid"
+
+
+def _rsa_keypair():
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = private.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode()
+    public_jwk = jwk.construct(public_pem, "RS256").to_dict()
+    public_jwk.update({"kid": KID, "alg": "RS256", "use": "sig"})
+    return private_pem, {"keys": [public_jwk]}
+
+
+PRIVATE_PEM, JWKS = _rsa_keypair()
+
+
+def make_rs256_token(claims, kid=KID):
+    return jwt.encode(claims, PRIVATE_PEM, algorithm="RS256", headers={"kid": kid})
+
+
+@pytest.fixture
+def jwks_fetches(monkeypatch):
+    calls = []
+    manager = security.JWKSManager("https://fake-clerk/.well-known/jwks.json")
+
+    async def fake_fetch():
+        calls.append(1)
+        return JWKS
+
+    monkeypatch.setattr(manager, "_fetch", fake_fetch)
+    monkeypatch.setattr(security, "jwks_manager", manager)
+    security._TOKEN_CACHE.clear()
+    yield calls
+    security._TOKEN_CACHE.clear()
+
+
+@pytest.mark.asyncio
+async def test_verify_jwt_caches_verified_claims(jwks_fetches, monkeypatch):
+    token = make_rs256_token({"sub": "user_1", "exp": int(time.time()) + 60})
+    claims = await security.verify_jwt(token)
+    assert claims["sub"] == "user_1"
+
+    # Second call must not touch the signature check at all
+    def fail_decode(*args, **kwargs):
+        raise AssertionError("jwt.decode should not run for a cached token")
+
+    monkeypatch.setattr(security.jwt, "decode", fail_decode)
+    hits_before = security.token_cache_stats()["hits"]
+    assert (await security.verify_jwt(token))["sub"] == "user_1"
+    assert security.token_cache_stats()["hits"] == hits_before + 1
+
+
+@pytest.mark.asyncio
+async def test_cached_claims_cannot_be_changed_by_a_caller(jwks_fetches):
+    token = make_rs256_token({
+        "sub": "user_1", "exp": int(time.time()) + 60, "roles": ["member"], "org": {"id": "org_1"},
+    })
+    first = await security.verify_jwt(token)
+    first["sub"] = "attacker"
+    first["roles"].append("admin")
+
+    second = await security.verify_jwt(token)
+    assert second["sub"] == "user_1"
+    assert second["roles"] == ["member"]
+    second["role"] = "admin"
+    second["roles"].append("admin")
+    second["org"]["id"] = "org_2"
+
+    third = await security.verify_jwt(token)
+    assert "role" not in third
+    assert third["roles"] == ["member"]
+    assert third["org"] == {"id": "org_1"}
+
+
+@pytest.mark.asyncio
+async def test_verify_jwt_cache_entry_expires_with_token(jwks_fetches, monkeypatch):
+    exp = int(time.time()) + 60
+    token = make_rs256_token({"sub": "user_1", "exp": exp})
+    await security.verify_jwt(token)
+
+    # Jump past the token's own expiry: the cache must not serve it anymore
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + 120)
+    misses_before = security.token_cache_stats()["misses"]
+    await security.verify_jwt(token)
+    assert security.token_cache_stats()["misses"] == misses_before + 1
+
+
+@pytest.mark.asyncio
+async def test_verify_jwt_without_exp_is_not_cached(jwks_fetches):
+    token = make_rs256_token({"sub": "user_1"})
+    await security.verify_jwt(token)
+    assert security.token_cache_stats()["size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_jwks_rotation_flushes_token_cache(jwks_fetches, monkeypatch):
+    token = make_rs256_token({"sub": "user_1", "exp": int(time.time()) + 60})
+    await security.verify_jwt(token)
+    assert security.token_cache_stats()["size"] == 1
+
+    _, rotated = _rsa_keypair()
+
+    async def rotated_fetch():
+        return rotated
+
+    monkeypatch.setattr(security.jwks_manager, "_fetch", rotated_fetch)
+    await security.jwks_manager.refresh()
+    assert security.token_cache_stats()["size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_verify_jwt_unknown_kid(jwks_fetches):
+    token = make_rs256_token({"sub": "user_1"}, kid="other")
+    with pytest.raises(ValueError):
+        await security.verify_jwt(token)
+
+
+@pytest.mark.asyncio
+async def test_jwks_concurrent_cold_start_fetches_once(jwks_fetches):
+    results = await asyncio.gather(*(security.get_jwks() for _ in range(20)))
+    assert all(r == JWKS for r in results)
+    assert len(jwks_fetches) == 1
+
+
+@pytest.mark.asyncio
+async def test_jwks_serves_stale_keys_while_refreshing(jwks_fetches, monkeypatch):
+    manager = security.jwks_manager
+    await manager.get_jwks()
+
+    gate = asyncio.Event()
+
+    async def slow_fetch():
+        jwks_fetches.append(1)
+        await gate.wait()
+        return JWKS
+
+    monkeypatch.setattr(manager, "_fetch", slow_fetch)
+    manager._expires_at = time.time() - 1  # expired, but not past max_stale
+
+    # Callers are not blocked by the slow refetch and all share it
+    for _ in range(5):
+        assert await manager.get_jwks() == JWKS
+        await asyncio.sleep(0)
+    assert len(jwks_fetches) == 2
+
+    gate.set()
+    await manager.refresh()
+    assert manager._expires_at > time.time()
+
+
+@pytest.mark.asyncio
+async def test_jwks_unknown_kid_forced_refresh_is_rate_limited(jwks_fetches):
+    manager = security.jwks_manager
+    assert await manager.get_key(KID) is not None
+    assert len(jwks_fetches) == 1
+
+    assert await manager.get_key("unknown-1") is None
+    assert await manager.get_key("unknown-2") is None
+    # Only the first unknown kid was allowed to force a refetch
+    assert len(jwks_fetches) == 2
+
+
+@pytest.mark.asyncio
+async def test_jwks_failed_refetch_backs_off(jwks_fetches, monkeypatch):
+    manager = security.jwks_manager
+    await manager.get_jwks()
+
+    async def failing_fetch():
+        jwks_fetches.append(1)
+        raise RuntimeError("jwks host down")
+
+    monkeypatch.setattr(manager, "_fetch", failing_fetch)
+    manager._expires_at = time.time() - 1
+
+    # The first stale read starts a refetch; it fails and the old keys keep being served
+    assert await manager.get_jwks() == JWKS
+    with pytest.raises(RuntimeError):
+        await manager._inflight
+    assert len(jwks_fetches) == 2
+    first_retry = manager._retry_at
+    assert first_retry > time.time()
+
+    # Inside the backoff window nothing is refetched, not even for an unknown kid
+    for _ in range(5):
+        assert await manager.get_jwks() == JWKS
+    assert await manager.get_key("unknown") is None
+    assert len(jwks_fetches) == 2
+
+    # Once it elapses the next attempt goes out, and a second failure doubles the wait
+    manager._retry_at = 0
+    await manager.get_jwks()
+    with pytest.raises(RuntimeError):
+        await manager._inflight
+    assert len(jwks_fetches) == 3
+    assert manager._retry_at - time.time() > first_retry - time.time()
+
+
+@pytest.mark.asyncio
+async def test_jwks_past_max_stale_fails_closed(jwks_fetches, monkeypatch):
+    manager = security.jwks_manager
+    await manager.get_jwks()
+    manager._expires_at = time.time() - manager.max_stale - 1
+
+    async def failing_fetch():
+        jwks_fetches.append(1)
+        raise RuntimeError("jwks host down")
+
+    monkeypatch.setattr(manager, "_fetch", failing_fetch)
+
+    # Keys this old are not served: the caller waits for the refetch and gets its failure
+    with pytest.raises(RuntimeError, match="jwks host down"):
+        await manager.get_jwks()
+    # ...and during the backoff it fails straight away, without another fetch
+    with pytest.raises(RuntimeError, match="JWKS unavailable"):
+        await manager.get_jwks()
+    assert len(jwks_fetches) == 2
+    token = make_rs256_token({"sub": "user_1", "exp": int(time.time()) + 60})
+    with pytest.raises(RuntimeError):
+        await security.verify_jwt(token)
+
+    # A successful refetch puts the keys back in service
+    monkeypatch.setattr(manager, "_fetch", lambda: asyncio.sleep(0, JWKS))
+    manager._retry_at = 0
+    assert await manager.get_jwks() == JWKS
+    assert manager._failures == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["inline", "thread", "process"])
+async def test_jwt_verifier_modes(mode):
+    verifier = security.JWTVerifier(mode, workers=1)
+    manager = security.JWKSManager("https://fake-clerk/.well-known/jwks.json")
+    manager._install(JWKS)
+    alg, key = await manager.get_key(KID)
+    try:
+        token = make_rs256_token({"sub": "user_1"})
+        claims = await verifier.verify(token, key, alg)
+        assert claims["sub"] == "user_1"
+    finally:
+        verifier.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_jwt_verifier_batches_concurrent_verifications(monkeypatch):
+    chunk_sizes = []
+    decode_batch = security._decode_batch
+
+    def recording_decode_batch(items):
+        chunk_sizes.append(len(items))
+        return decode_batch(items)
+
+    monkeypatch.setattr(security, "_decode_batch", recording_decode_batch)
+    verifier = security.JWTVerifier("thread", workers=2)
+    manager = security.JWKSManager("https://fake-clerk/.well-known/jwks.json")
+    manager._install(JWKS)
+    alg, key = await manager.get_key(KID)
+    good = [make_rs256_token({"sub": f"user_{i}"}) for i in range(10)]
+    bad = make_rs256_token({"sub": "user_bad"}) + "tampered"
+    try:
+        results = await asyncio.gather(
+            *(verifier.verify(t, key, alg) for t in good + [bad]),
+            return_exceptions=True,
+        )
+    finally:
+        verifier.shutdown()
+
+    # Everything that arrived in the same loop iteration was flushed once, half to each worker
+    assert verifier.batches == 1
+    assert verifier.jobs == 2
+    assert sorted(chunk_sizes) == [5, 6]
+    assert [r["sub"] for r in results[:-1]] == [f"user_{i}" for i in range(10)]
+    assert isinstance(results[-1], Exception)
+
+
+def test_jwt_verifier_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        security.JWTVerifier("gpu")
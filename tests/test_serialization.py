@@ -0,0 +1,92 @@
+import inspect
+import json
+from datetime import datetime
+import pytest
+from fastapi.routing import APIRoute
+from httpx import AsyncClient
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.orm import ColumnProperty
+from app.api.serialization import columns, dump_rows, rows_response
+from app.db.models import AccountHolder, Card, ErrorGroup, Transaction, User
+from app.main import app
+from app.schemas.account_holder import AccountHolderRead
+from app.schemas.card import CardRead
+from app.schemas.error_log import ErrorGroupRead, ErrorGroupSummary
+from app.schemas.transaction import TransactionRead
+from app.schemas.user import UserRead
+
+# Every route that serializes through the fast path, with the (response model, entity) pairs it selects
+FAST_PATH_ROUTES = {
+    "GET /api/v1/transactions": [(TransactionRead, Transaction)],
+    "GET /api/v1/cards": [(CardRead, Card)],
+    "GET /api/v1/account-holders": [(AccountHolderRead, AccountHolder)],
+    "GET /api/v1/users": [(UserRead, User)],
+    "GET /api/v1/admin/users": [(UserRead, User)],
+    "GET /api/v1/errors": [(ErrorGroupSummary, ErrorGroup), (ErrorGroupRead, ErrorGroup)],
+}
+FAST_PATH_PAIRS = sorted(
+    {pair for pairs in FAST_PATH_ROUTES.values() for pair in pairs}, key=lambda p: (p[0].__name__, p[1].__name__),
+)
+
+
+def _response_model_bytes(model, rows) -> bytes:
+    # What FastAPI's default path sends: validate, dump in JSON mode, compact stdlib encode
+    data = [model.model_validate(row).model_dump(mode="json") for row in rows]
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+@pytest.mark.parametrize("model, row", [
+    (TransactionRead, {"id": 1, "account_id": 2, "amount": 500, "type": "CREDIT",
+                       "description": "Café ☕", "created_at": datetime(2025, 3, 1, 12, 30, 5, 123456)}),
+    (TransactionRead, {"id": 2, "account_id": 2, "amount": 1, "type": "DEBIT",
+                       "description": None, "created_at": datetime(2025, 3, 1)}),
+    (CardRead, {"id": 1, "account_id": 2, "card_number_last4": "0042", "card_type": "Debit",
+                "expiration_month": 1, "expiration_year": 2030, "status": None}),
+    (UserRead, {"id": 1, "clerk_user_id": "c", "email": None, "first_name": "A", "last_name": None,
+                "created_at": datetime(2025, 1, 1), "updated_at": datetime(2025, 1, 2)}),
+    (ErrorGroupSummary, {"id": 1, "fingerprint": "f", "exception_type": "E", "location": None, "error_code": 500,
+                         "message": "m", "count": 3, "first_seen": datetime(2025, 1, 1),
+                         "last_seen": datetime(2025, 1, 2), "last_user_id": None}),
+])
+def test_fast_path_matches_response_model(model, row):
+    # Extra keys in the row are left out, as response_model would
+    assert dump_rows(model, [{**row, "unrelated": object()}]) == _response_model_bytes(model, [row])
+
+
+@pytest.mark.parametrize("model, entity", FAST_PATH_PAIRS, ids=lambda v: getattr(v, "__name__", None))
+def test_columns_cover_exactly_the_response_model(model, entity):
+    # rows_response skips response_model validation, so schema drift has to fail here instead
+    selected = columns(model, entity)
+    assert [c.key for c in selected] == list(model.model_fields)
+    for c in selected:
+        assert isinstance(c.property, ColumnProperty), f"{entity.__name__}.{c.key} is not a column"
+        if c.property.columns[0].nullable:
+            field = model.model_fields[c.key]
+            try:
+                TypeAdapter(field.annotation).validate_python(None)
+            except ValidationError:
+                pytest.fail(f"{model.__name__}.{c.key} rejects None but {entity.__name__}.{c.key} is nullable")
+
+
+def test_every_fast_path_route_is_checked_for_drift():
+    routed = {
+        f"{method} {route.path}"
+        for route in app.routes
+        if isinstance(route, APIRoute) and "rows_response(" in inspect.getsource(route.endpoint)
+        for method in route.methods
+    }
+    assert routed == set(FAST_PATH_ROUTES)
+
+
+def test_rows_response_headers():
+    resp = rows_response(TransactionRead, [], {"X-Next-Cursor": "abc"})
+    assert resp.body == b"[]"
+    assert resp.media_type == "application/json"
+    assert resp.headers["x-next-cursor"] == "abc"
+
+
+@pytest.mark.asyncio
+async def test_list_routes_keep_openapi_schema(client: AsyncClient):
+    schema = (await client.get("/openapi.json")).json()
+    ok = schema["paths"]["/api/v1/transactions"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert ok["items"]["$ref"].endswith("/TransactionRead")
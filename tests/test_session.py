@@ -0,0 +1,74 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import OperationalError
+from app.core.config import settings
+from app.db import session as db_session
+from app.db.models import Base, User
+from app.db.writer import GroupCommitWriter
+from app.db import writer as writer_module
+
+
+@pytest_asyncio.fixture
+async def file_db(tmp_path, monkeypatch):
+    """Point app.db.session at a fresh SQLite file so both pools are real."""
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path}/pools.db")
+    monkeypatch.setattr(settings, "DB_READ_POOL_SIZE", 3)
+    for name in ("_engine", "_SessionLocal", "_read_engine", "_ReadSessionLocal"):
+        monkeypatch.setattr(db_session, name, None)
+    async with db_session.get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    await db_session.get_engine().dispose()
+    await db_session.get_read_engine().dispose()
+
+
+def test_write_db_is_default_dependency():
+    assert db_session.get_write_db is db_session.get_db
+
+
+@pytest.mark.asyncio
+async def test_in_memory_database_shares_one_engine():
+    assert db_session.get_read_engine() is db_session.get_engine()
+    assert db_session.get_read_sessionmaker() is db_session.get_sessionmaker()
+    assert db_session.pool_status()["read"] == {"shared_with": "write"}
+
+
+@pytest.mark.asyncio
+async def test_read_pool_is_separate_and_read_only(file_db):
+    assert db_session.get_read_engine() is not db_session.get_engine()
+
+    async with db_session.get_sessionmaker()() as db:
+        db.add(User(clerk_user_id="pool_user"))
+        await db.commit()
+
+    async with db_session.get_read_sessionmaker()() as db:
+        assert await db.scalar(select(func.count()).select_from(User)) == 1
+        assert await db.scalar(text("PRAGMA query_only")) == 1
+        with pytest.raises(OperationalError):
+            await db.execute(text("DELETE FROM users"))
+
+    status = db_session.pool_status()
+    assert status["write"]["size"] == settings.DB_WRITE_POOL_SIZE
+    assert status["read"]["size"] == 3
+
+
+@pytest.mark.asyncio
+async def test_group_commit_with_single_writer_connection(file_db, monkeypatch):
+    writer = GroupCommitWriter(max_batch=10, max_delay_ms=5)
+    monkeypatch.setattr(writer_module, "writer", writer)
+    await writer.start()
+    try:
+        async with db_session.get_sessionmaker()() as db:
+            # The request session holds the only write connection until run_write releases it
+            await db.execute(select(User.id))
+
+            async def unit(session):
+                session.add(User(clerk_user_id="queued_user"))
+
+            await writer_module.run_write(db, unit)
+    finally:
+        await writer.stop()
+
+    async with db_session.get_read_sessionmaker()() as db:
+        assert await db.scalar(select(User.clerk_user_id)) == "queued_user"
@@ -2,6 +2,7 @@ import pytest
 from httpx import AsyncClient
 from sqlalchemy import select, text
 from datetime import date, timedelta, datetime
+from app.api.v1 import statements
 from app.db.models import User, Account, Transaction
 
 
@@ -71,3 +72,150 @@ async def test_generate_statements_no_accounts(authorized_client: AsyncClient, d
         json={"start_date": str(today - timedelta(days=1)), "end_date": str(today + timedelta(days=1))}
     )
     assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_generate_statements_many_accounts_single_query(authorized_client: AsyncClient, db_session):
+    from sqlalchemy import event
+    from app.db.session import get_engine
+
+    user = (await db_session.execute(select(User).limit(1))).scalar_one()
+    accounts = [Account(user_id=user.id, name=f"Acc {i}", currency="USD") for i in range(12)]
+    db_session.add_all(accounts)
+    await db_session.commit()
+
+    now = datetime.utcnow()
+    for i, acc in enumerate(accounts):
+        db_session.add_all([
+            Transaction(account_id=acc.id, amount=100 * (i + 1), type="CREDIT", description=None, created_at=now),
+            Transaction(account_id=acc.id, amount=10, type="DEBIT", description="Fee", created_at=now),
+        ])
+    # Outside the window: must not count
+    db_session.add(Transaction(account_id=accounts[0].id, amount=5, type="CREDIT",
+                               created_at=now - timedelta(days=30)))
+    await db_session.commit()
+
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM transactions" in statement:
+            statements.append(statement)
+
+    engine = get_engine().sync_engine
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        today = date.today()
+        resp = await authorized_client.post(
+            "/api/v1/statements",
+            json={"start_date": str(today - timedelta(days=1)), "end_date": str(today + timedelta(days=1))},
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [s["account_id"] for s in data] == [a.id for a in accounts]
+    assert [s["balance"] for s in data] == [100 * (i + 1) - 10 for i in range(12)]
+    assert all(len(s["transactions"]) == 2 for s in data)
+    # Window rows for all accounts in one query, plus one for the opening balances,
+    # regardless of account count
+    assert len(statements) == 2
+
+
+async def _seed_export(db_session, user, count):
+    account = Account(user_id=user.id, name="Export", currency="USD")
+    db_session.add(account)
+    await db_session.commit()
+    now = datetime.utcnow()
+    db_session.add_all([
+        Transaction(account_id=account.id, amount=100 + i, type="CREDIT" if i % 2 else "DEBIT",
+                    description=f"Row, {i}", created_at=now)
+        for i in range(count)
+    ])
+    await db_session.commit()
+    return account
+
+
+@pytest.mark.asyncio
+async def test_export_csv_streams_all_rows(authorized_client: AsyncClient, db_session, monkeypatch):
+    import csv
+    import io
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "EXPORT_CHUNK_SIZE", 2)
+    user = (await db_session.execute(select(User).limit(1))).scalar_one()
+    account = await _seed_export(db_session, user, 5)
+
+    today = date.today()
+    resp = await authorized_client.get(
+        "/api/v1/statements/export",
+        params={"start_date": str(today - timedelta(days=1)), "end_date": str(today + timedelta(days=1))},
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert len(rows) == 5
+    assert {r["description"] for r in rows} == {f"Row, {i}" for i in range(5)}
+    assert all(int(r["account_id"]) == account.id for r in rows)
+
+
+@pytest.mark.asyncio
+async def test_export_ndjson_single_account(authorized_client: AsyncClient, db_session):
+    import json
+
+    user = (await db_session.execute(select(User).limit(1))).scalar_one()
+    account = await _seed_export(db_session, user, 3)
+    await _seed_export(db_session, user, 2)  # another account, filtered out
+
+    today = date.today()
+    resp = await authorized_client.get(
+        "/api/v1/statements/export",
+        params={
+            "start_date": str(today - timedelta(days=1)),
+            "end_date": str(today + timedelta(days=1)),
+            "account_id": account.id,
+            "format": "ndjson",
+        },
+    )
+    assert resp.status_code == 200
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert len(lines) == 3
+    assert all(line["account_id"] == account.id for line in lines)
+
+
+@pytest.mark.asyncio
+async def test_export_first_body_bytes(monkeypatch):
+    opened = []
+
+    def _sessionmaker():
+        opened.append(1)
+        raise RuntimeError("query started")
+
+    monkeypatch.setattr(statements, "get_read_sessionmaker", _sessionmaker)
+    window = (datetime(2025, 1, 1), datetime(2025, 1, 2))
+
+    # CSV's header row is sent before the query runs
+    csv_stream = statements._stream_export([1], *window, "csv")
+    assert (await csv_stream.__anext__()).startswith("id,account_id,")
+    assert opened == []
+    await csv_stream.aclose()
+
+    # NDJSON has no header: its first bytes are the first rows, after the query
+    with pytest.raises(RuntimeError, match="query started"):
+        await statements._stream_export([1], *window, "ndjson").__anext__()
+    assert opened == [1]
+
+
+@pytest.mark.asyncio
+async def test_export_foreign_account(authorized_client: AsyncClient, db_session):
+    other = User(clerk_user_id="clerk_export_other")
+    db_session.add(other)
+    await db_session.commit()
+    account = await _seed_export(db_session, other, 1)
+
+    today = date.today()
+    resp = await authorized_client.get(
+        "/api/v1/statements/export",
+        params={"start_date": str(today), "end_date": str(today), "account_id": account.id},
+    )
+    assert resp.status_code == 404
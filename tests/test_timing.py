@@ -0,0 +1,75 @@
+import pytest
+from fastapi import APIRouter, FastAPI
+from httpx import ASGITransport, AsyncClient
+from app.core.config import settings
+from app.core.timing import ServerTiming, TimedRoute, span
+from app.middleware import timing as timing_middleware
+from app.middleware.timing import ServerTimingMiddleware
+
+
+def _phases(header: str) -> dict:
+    phases = {}
+    for part in header.split(","):
+        name, dur = part.strip().split(";dur=")
+        phases[name] = float(dur)
+    return phases
+
+
+def test_span_is_noop_outside_sampled_request():
+    with span("auth"):
+        pass
+    timing = ServerTiming()
+    timing.add("db", 0.0015)
+    timing.add("db", 0.0005)
+    assert timing.header() == "db;dur=2.00"
+
+
+@pytest.mark.asyncio
+async def test_server_timing_header(monkeypatch, authorized_client: AsyncClient, test_account):
+    monkeypatch.setattr(settings, "SERVER_TIMING_SAMPLE_RATE", 1.0)
+    logged = []
+
+    class _Logger:
+        def info(self, event, **kw):
+            logged.append((event, kw))
+
+    monkeypatch.setattr(timing_middleware, "logger", _Logger())
+
+    resp = await authorized_client.get(f"/api/v1/accounts/{test_account.id}")
+    assert resp.status_code == 200
+    phases = _phases(resp.headers["Server-Timing"])
+    assert {"endpoint", "serialize", "db", "total"} <= set(phases)
+    assert phases["total"] >= phases["endpoint"]
+
+    event, fields = logged[-1]
+    assert event == "server_timing"
+    assert fields["route"] == "/api/v1/accounts/{account_id}"
+    assert fields["status"] == 200
+    assert "total_ms" in fields and "serialize_ms" in fields
+
+
+@pytest.mark.asyncio
+async def test_unsampled_requests_have_no_header(monkeypatch, client: AsyncClient):
+    monkeypatch.setattr(settings, "SERVER_TIMING_SAMPLE_RATE", 0.0)
+    resp = await client.get("/api/v1/health")
+    assert "Server-Timing" not in resp.headers
+
+
+@pytest.mark.asyncio
+async def test_timed_route_sync_endpoint(monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_TIMING_SAMPLE_RATE", 1.0)
+    app = FastAPI()
+    router = APIRouter(route_class=TimedRoute)
+
+    @router.get("/sync/{n}")
+    def sync_endpoint(n: int):
+        with span("work"):
+            return {"n": n}
+
+    app.include_router(router)
+    app.add_middleware(ServerTimingMiddleware)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        resp = await c.get("/sync/3")
+    assert resp.json() == {"n": 3}
+    assert {"work", "endpoint", "serialize", "total"} <= set(_phases(resp.headers["Server-Timing"]))
@@ -66,4 +66,121 @@ async def test_list_transactions_empty(authorized_client: AsyncClient, db_sessio
     # Pass account_id param if required
     resp = await authorized_client.get(f"/api/v1/transactions?account_id={acc.id}")
     assert resp.status_code == 200
-    assert resp.json() == []
\ No newline at end of file
+    assert resp.json() == []
+
+async def _seed_transactions(db_session, account, count):
+    from datetime import datetime, timedelta
+    base = datetime(2025, 1, 1)
+    txs = [
+        Transaction(
+            account_id=account.id,
+            amount=(i + 1) * 100,
+            type="CREDIT" if i % 2 == 0 else "DEBIT",
+            description=f"{'Coffee' if i % 3 == 0 else 'Rent'} #{i}",
+            created_at=base + timedelta(days=i),
+        )
+        for i in range(count)
+    ]
+    db_session.add_all(txs)
+    await db_session.commit()
+    return txs
+
+
+@pytest.mark.asyncio
+async def test_list_transactions_keyset_pages(authorized_client: AsyncClient, test_account, db_session):
+    txs = await _seed_transactions(db_session, test_account, 7)
+    expected = sorted((t.id for t in txs), reverse=True)
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"account_id": test_account.id, "limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        resp = await authorized_client.get("/api/v1/transactions", params=params)
+        assert resp.status_code == 200
+        seen += [t["id"] for t in resp.json()]
+        pages += 1
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert seen == expected
+    assert pages == 3
+
+
+@pytest.mark.asyncio
+async def test_list_transactions_filters(authorized_client: AsyncClient, test_account, db_session):
+    await _seed_transactions(db_session, test_account, 9)
+
+    resp = await authorized_client.get(
+        "/api/v1/transactions",
+        params={
+            "account_id": test_account.id,
+            "type": "CREDIT",
+            "min_amount": 200,
+            "max_amount": 800,
+            "start": "2025-01-02T00:00:00",
+            "end": "2025-01-09T00:00:00",
+        },
+    )
+    assert resp.status_code == 200
+    # CREDITs are the even indexes -> amounts 100, 300, 500, 700, 900; days 0..8
+    assert sorted(t["amount"] for t in resp.json()) == [300, 500, 700]
+
+    resp = await authorized_client.get(
+        "/api/v1/transactions",
+        params={"account_id": test_account.id, "description_prefix": "Coffee"},
+    )
+    assert {t["description"] for t in resp.json()} == {"Coffee #0", "Coffee #3", "Coffee #6"}
+
+
+@pytest.mark.asyncio
+async def test_list_transactions_bad_cursor(authorized_client: AsyncClient, test_account):
+    resp = await authorized_client.get(
+        "/api/v1/transactions",
+        params={"account_id": test_account.id, "cursor": "not-a-cursor"},
+    )
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_create_transactions_batch(authorized_client: AsyncClient, test_account, db_session):
+    items = [
+        {"account_id": test_account.id, "amount": 100 * (i + 1), "type": "CREDIT" if i % 2 else "DEBIT",
+         "description": f"feed {i}"}
+        for i in range(250)
+    ]
+    items.insert(3, {"account_id": 99999, "amount": 1, "type": "CREDIT"})
+
+    resp = await authorized_client.post("/api/v1/transactions/batch", json={"items": items})
+    assert resp.status_code == 201
+    data = resp.json()
+    assert data["inserted"] == 250
+    assert data["failed"] == 1
+    assert data["results"][3] == {"index": 3, "id": None, "error": "Account not found"}
+
+    inserted = [r for r in data["results"] if r["id"] is not None]
+    res = await db_session.execute(
+        select(Transaction.id, Transaction.description).where(Transaction.account_id == test_account.id)
+    )
+    by_id = dict(res.all())
+    assert len(by_id) == 250
+    # ids line up with the submitted items
+    for r in inserted:
+        assert by_id[r["id"]] == items[r["index"]]["description"]
+
+    balance = (await authorized_client.get(f"/api/v1/accounts/{test_account.id}/balance")).json()
+    expected = sum(it["amount"] if it["type"] == "CREDIT" else -it["amount"]
+                   for it in items if it["account_id"] == test_account.id)
+    assert balance["balance"] == expected
+
+
+@pytest.mark.asyncio
+async def test_create_transactions_batch_too_large(authorized_client: AsyncClient, test_account, monkeypatch):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "TRANSACTION_BATCH_MAX_SIZE", 2)
+    items = [{"account_id": test_account.id, "amount": 1, "type": "CREDIT"}] * 3
+    resp = await authorized_client.post("/api/v1/transactions/batch", json={"items": items})
+    assert resp.status_code == 413
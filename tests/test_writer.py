@@ -0,0 +1,111 @@
+import asyncio
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from app.db import writer as writer_module
+from app.db.models import Account, Transaction, User
+from app.db.writer import GroupCommitWriter
+
+
+async def _make_account(db_session) -> Account:
+    user = User(clerk_user_id="writer_user")
+    db_session.add(user)
+    await db_session.flush()
+    account = Account(user_id=user.id, name="Writer", currency="USD")
+    db_session.add(account)
+    await db_session.commit()
+    return account
+
+
+def _insert_tx(account_id: int, amount: int):
+    async def unit(session):
+        tx = Transaction(account_id=account_id, amount=amount, type="CREDIT")
+        session.add(tx)
+        await session.flush()
+        return tx.id
+    return unit
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_one_commit(db_session):
+    account = await _make_account(db_session)
+    writer = GroupCommitWriter(max_batch=100, max_delay_ms=50)
+    await writer.start()
+    try:
+        ids = await asyncio.gather(*(writer.submit(_insert_tx(account.id, i + 1)) for i in range(20)))
+    finally:
+        await writer.stop()
+
+    assert len(set(ids)) == 20
+    assert writer.units == 20
+    assert writer.batches < 20
+    count = await db_session.scalar(select(func.count()).select_from(Transaction))
+    assert count == 20
+
+
+@pytest.mark.asyncio
+async def test_failing_unit_only_fails_its_caller(db_session):
+    account = await _make_account(db_session)
+
+    async def broken(session):
+        session.add(Transaction(account_id=account.id, amount=1, type="CREDIT"))
+        raise ValueError("boom")
+
+    writer = GroupCommitWriter(max_batch=100, max_delay_ms=50)
+    await writer.start()
+    try:
+        results = await asyncio.gather(
+            writer.submit(_insert_tx(account.id, 100)),
+            writer.submit(broken),
+            writer.submit(_insert_tx(account.id, 200)),
+            return_exceptions=True,
+        )
+    finally:
+        await writer.stop()
+
+    assert isinstance(results[1], ValueError)
+    assert all(isinstance(r, int) for r in (results[0], results[2]))
+    amounts = (await db_session.execute(select(Transaction.amount).order_by(Transaction.amount))).scalars().all()
+    assert amounts == [100, 200]
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_queued_units(db_session):
+    account = await _make_account(db_session)
+    writer = GroupCommitWriter(max_batch=5, max_delay_ms=1000)
+    await writer.start()
+    pending = [asyncio.ensure_future(writer.submit(_insert_tx(account.id, i + 1))) for i in range(12)]
+    await asyncio.sleep(0)
+    await writer.stop()
+
+    assert len(await asyncio.gather(*pending)) == 12
+    assert not writer.running
+
+
+@pytest.mark.asyncio
+async def test_endpoints_write_through_group_commit(authorized_client: AsyncClient, test_account):
+    await writer_module.writer.start()
+    try:
+        resps = await asyncio.gather(*(
+            authorized_client.post(
+                "/api/v1/transactions",
+                json={"account_id": test_account.id, "amount": 500, "type": "CREDIT"},
+            )
+            for _ in range(5)
+        ))
+        card = await authorized_client.post("/api/v1/cards", json={
+            "account_id": test_account.id,
+            "card_number_last4": "4242",
+            "card_type": "Debit",
+            "expiration_month": 1,
+            "expiration_year": 2030,
+        })
+    finally:
+        await writer_module.writer.stop()
+
+    assert [r.status_code for r in resps] == [201] * 5
+    assert len({r.json()["id"] for r in resps}) == 5
+    assert card.status_code == 201 and card.json()["id"]
+
+    balance = await authorized_client.get(f"/api/v1/accounts/{test_account.id}/balance")
+    assert balance.json()["balance"] == 2_500